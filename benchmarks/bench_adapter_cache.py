@@ -0,0 +1,48 @@
+"""Benchmark the per-call validation cost with and without the `TypeAdapter` cache.
+
+The YAML documents are parsed once up front, so only adapter construction and validation
+are timed (this is the part of `parse_yaml_raw_as` that the cache affects).
+
+Run with: `python benchmarks/bench_adapter_cache.py`
+"""
+
+import timeit
+from typing import Any
+
+from pydantic import TypeAdapter
+from ruamel.yaml import YAML
+
+from pydantic_yaml._internals.adapters import get_type_adapter
+from pydantic_yaml.examples.base_models import A, B, UsesRefs
+
+DOC = "bill-to:\n  given: Chris\n  family: Dumars\nship-to:\n  given: Chris\n  family: Dumars\n"
+CASES: list[tuple[str, Any, str]] = [
+    ("model", UsesRefs, DOC),
+    ("list[model]", list[UsesRefs], "- " + DOC.replace("\n", "\n  ").rstrip() + "\n"),
+    ("union", A | B, "b: bbb\n"),
+]
+N = 2000
+
+
+def main() -> None:
+    """Run the benchmark and print per-call timings."""
+    reader = YAML(typ="safe", pure=True)
+    for name, model_type, raw in CASES:
+        objects = reader.load(raw)
+
+        def _uncached() -> Any:
+            return TypeAdapter(model_type).validate_python(objects)
+
+        def _cached() -> Any:
+            return get_type_adapter(model_type).validate_python(objects)
+
+        t_old = min(timeit.repeat(_uncached, number=N, repeat=3)) / N
+        t_new = min(timeit.repeat(_cached, number=N, repeat=3)) / N
+        print(
+            f"{name:12s} uncached: {t_old * 1e6:8.1f} us/call, cached: {t_new * 1e6:8.1f} us/call, "
+            f"speedup: {t_old / t_new:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Benchmark the time to import `pydantic_yaml`, and to import it and use its main API.
+
+Each measurement runs in a fresh interpreter, so nothing is cached in `sys.modules`.
+The time of starting a bare interpreter is subtracted. Exits with an error if importing
+the package alone takes longer than `--max-ms` (e.g. because a heavy dependency is
+imported eagerly again).
+
+Run with: `python benchmarks/bench_import.py [--repeat N] [--max-ms MS]`
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+
+CASES: list[tuple[str, str]] = [
+    ("baseline", "pass"),
+    ("import", "import pydantic_yaml"),
+    ("__version__", "import pydantic_yaml; pydantic_yaml.__version__"),
+    ("parse_yaml_raw_as", "from pydantic_yaml import parse_yaml_raw_as"),
+    ("first load", "from pydantic_yaml import parse_yaml_raw_as; parse_yaml_raw_as(dict, 'a: 1')"),
+    ("import *", "from pydantic_yaml import *"),
+]
+
+
+def _time_code(code: str, repeat: int) -> float:
+    """Get the best wall time (in seconds) of running the code in a fresh interpreter."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Run the benchmark and print the import times."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per case (the best is kept).")
+    parser.add_argument("--max-ms", type=float, default=None, help="Fail if `import` takes longer.")
+    args = parser.parse_args()
+
+    baseline = _time_code(CASES[0][1], args.repeat)
+    print(f"{'interpreter':18s} {baseline * 1e3:8.1f} ms")
+    results = {}
+    for name, code in CASES[1:]:
+        results[name] = _time_code(code, args.repeat) - baseline
+        print(f"{name:18s} {results[name] * 1e3:+8.1f} ms")
+    if args.max_ms is not None and results["import"] * 1e3 > args.max_ms:
+        sys.exit(f"Importing pydantic_yaml took {results['import'] * 1e3:.1f} ms (> {args.max_ms} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Benchmark the peak memory (RSS) of parsing a large YAML file from different kinds of input.
+
+The document is a single large block scalar, so that the parsed result is about as large
+as the input, and extra copies of the input (e.g. `Path.read_text()` followed by the
+copy made by the YAML reader) stand out. Each case runs in a fresh subprocess,
+and the increase of the peak RSS over the RSS after imports is reported.
+
+Note that memory-mapped pages count towards the RSS once they are read, but they're backed by
+the file (page cache), so the OS can drop them under memory pressure.
+
+Run with: `python benchmarks/bench_input_memory.py --size-mb 100` (Unix only)
+"""
+
+import argparse
+import mmap
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel
+
+from pydantic_yaml import parse_yaml_file_as, parse_yaml_raw_as
+
+
+class Blob(BaseModel):
+    """Model with a single large field."""
+
+    data: str
+
+
+def _parse_text_file(path: Path, engine: Any) -> Blob:
+    with path.open("r") as f:  # how `parse_yaml_file_as` used to read files
+        return parse_yaml_raw_as(Blob, f, engine=engine)
+
+
+def _parse_mmap(path: Path, engine: Any) -> Blob:
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return parse_yaml_raw_as(Blob, mm, engine=engine)
+
+
+CASES: dict[str, Callable[[Path, Any], Blob]] = {
+    "raw: Path.read_text()": lambda p, e: parse_yaml_raw_as(Blob, p.read_text(), engine=e),
+    "raw: Path.read_bytes()": lambda p, e: parse_yaml_raw_as(Blob, p.read_bytes(), engine=e),
+    "raw: bytearray": lambda p, e: parse_yaml_raw_as(Blob, bytearray(p.read_bytes()), engine=e),
+    "raw: mmap": _parse_mmap,
+    "stream: text mode": _parse_text_file,
+    "file": lambda p, e: parse_yaml_file_as(Blob, p, engine=e),
+    "file: memory_map=True": lambda p, e: parse_yaml_file_as(Blob, p, engine=e, memory_map=True),
+}
+
+
+def _max_rss_mb() -> float:
+    """Peak RSS of this process, in MB (`ru_maxrss` is in kB on Linux, bytes on macOS)."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024**2 if sys.platform == "darwin" else rss / 1024
+
+
+def _run_case(name: str, path: Path, engine: Any) -> None:
+    """Run a single case (in the subprocess), printing the RSS increase and time."""
+    before = _max_rss_mb()
+    t0 = time.perf_counter()
+    res = CASES[name](path, engine)
+    elapsed = time.perf_counter() - t0
+    assert len(res.data) > 0
+    print(f"{_max_rss_mb() - before:.1f} {elapsed:.2f}")
+
+
+def _write_input(path: Path, size_mb: float) -> None:
+    """Write a document with a block scalar of about `size_mb` MB."""
+    line = "  " + "lorem ipsum dolor sit amet " * 3 + "\n"
+    n_lines = int(size_mb * 1024**2 / len(line))
+    with path.open("w") as f:
+        f.write("data: |\n")
+        for _ in range(n_lines):
+            f.write(line)
+
+
+def main() -> None:
+    """Run all cases, each in a subprocess."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=float, default=100)
+    parser.add_argument("--engine", default="auto", choices=["auto", "c", "pure"])
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    parser.add_argument("--path", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.case is not None:
+        _run_case(args.case, args.path, args.engine)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "input.yaml"
+        _write_input(path, args.size_mb)
+        size_mb = path.stat().st_size / 1024**2
+        print(f"Input: {size_mb:.1f} MB, engine: {args.engine}")
+        print(f"{'case':<24} {'peak RSS increase':>18} {'time':>8}")
+        for name in CASES:
+            cmd = [sys.executable, __file__, "--case", name, "--path", str(path)]
+            cmd += ["--engine", args.engine]
+            out = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+            rss, elapsed = map(float, out.split())
+            print(f"{name:<24} {rss:>15.1f} MB {elapsed:>7.2f}s")
+
+
+if __name__ == "__main__":
+    main()
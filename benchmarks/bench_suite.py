@@ -0,0 +1,247 @@
+"""Benchmark suite for loading and dumping, across payload shapes, sizes and options.
+
+Cases cover deep (nested) and wide models, long lists, all comment modes, indent settings and
+multi-document streams. For each case, the best time of several runs is reported along with the
+throughput (of YAML text), and the peak memory allocated by Python (measured with `tracemalloc`
+in a separate run, which is slower but deterministic).
+
+Results can be saved as a baseline, and compared against one later; cases that got slower (or use
+more memory) by more than a threshold are flagged, and the exit code is 1.
+All data is generated deterministically, so runs on the same machine are comparable.
+
+Examples
+--------
+```sh
+python benchmarks/bench_suite.py --save baseline.json   # on the main branch
+python benchmarks/bench_suite.py --compare baseline.json  # on your branch
+python benchmarks/bench_suite.py -k dump/items --quick  # a subset, with smaller payloads
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from io import StringIO
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import pydantic
+import ruamel.yaml
+from pydantic import BaseModel, Field, create_model
+
+from pydantic_yaml import parse_yaml_raw_as, parse_yaml_stream_as, to_yaml_str, to_yaml_stream
+from pydantic_yaml._internals.v2 import CommentsOptions
+
+COMMENT_MODES: list[CommentsOptions] = [False, True, "fields-only", "models-only"]
+INDENTS: dict[str, dict[str, Any]] = {
+    "indent=4": dict(indent=4),
+    "map=2,seq=4,offset=2": dict(map_indent=2, sequence_indent=4, sequence_dash_offset=2),
+}
+
+
+class Leaf(BaseModel):
+    """A leaf with some scalar values."""
+
+    name: str = Field(description="The name")
+    value: float = Field(description="Some value")
+    count: int = 0
+    tags: list[str] = Field(default_factory=list, description="Some tags")
+
+
+class Node(BaseModel):
+    """A node of a deep tree."""
+
+    leaf: Leaf = Field(description="The leaf at this level")
+    child: Node | None = Field(None, description="The next level")
+
+
+class Items(BaseModel):
+    """A long list of leaves."""
+
+    items: list[Leaf] = Field(description="The items")
+
+
+Wide = create_model(
+    "Wide",
+    __doc__="A model with many fields.",
+    **{f"field_{i}": (int | str, Field(description=f"Field number {i}")) for i in range(200)},  # type: ignore
+)
+
+
+def _leaf(i: int) -> Leaf:
+    return Leaf(name=f"leaf-{i}", value=i * 1.25, count=i, tags=[f"t{i % 7}", "shared"])
+
+
+def _deep(depth: int) -> Node:
+    node = Node(leaf=_leaf(depth))
+    for i in reversed(range(depth)):
+        node = Node(leaf=_leaf(i), child=node)
+    return node
+
+
+class Case(NamedTuple):
+    """A benchmark case."""
+
+    name: str
+    func: Callable[[], Any]
+    text: Callable[[], str]
+    """Get the YAML text that is read or written, for the throughput."""
+
+
+def _load_case(name: str, model_type: Any, model: BaseModel) -> Case:
+    text = to_yaml_str(model)
+    return Case(name, lambda: parse_yaml_raw_as(model_type, text), lambda: text)
+
+
+def _dump_case(name: str, model: BaseModel, **kwargs: Any) -> Case:
+    return Case(name, lambda: to_yaml_str(model, **kwargs), lambda: to_yaml_str(model, **kwargs))
+
+
+def _stream_text(leaves: list[Leaf]) -> str:
+    out = StringIO()
+    to_yaml_stream(out, leaves)
+    return out.getvalue()
+
+
+def make_cases(quick: bool) -> list[Case]:
+    """Create all benchmark cases."""
+    scale = 10 if quick else 1
+    payloads: dict[str, BaseModel] = {
+        "deep": _deep(50),
+        "wide": Wide(**{f"field_{i}": i if i % 2 else f"value {i}" for i in range(200)}),
+        "items-100": Items(items=[_leaf(i) for i in range(100)]),
+        "items": Items(items=[_leaf(i) for i in range(2000 // scale)]),
+    }
+    cases = []
+    for shape, model in payloads.items():
+        cases.append(_load_case(f"load/{shape}", type(model), model))
+        for mode in COMMENT_MODES:
+            cases.append(_dump_case(f"dump/{shape}/comments={mode}", model, add_comments=mode))
+    for name, kwargs in INDENTS.items():
+        cases.append(_dump_case(f"dump/items/{name}", payloads["items"], **kwargs))
+        cases.append(
+            _dump_case(
+                f"dump/items/{name}/comments=True", payloads["items"], add_comments=True, **kwargs
+            )
+        )
+
+    for n_docs in (10, 1000 // scale):
+        leaves = [_leaf(i) for i in range(n_docs)]
+        text = _stream_text(leaves)
+        cases.append(
+            Case(
+                f"stream/load/docs={n_docs}",
+                lambda text=text: list(parse_yaml_stream_as(Leaf, text)),
+                lambda text=text: text,
+            )
+        )
+        cases.append(
+            Case(
+                f"stream/dump/docs={n_docs}",
+                lambda leaves=leaves: to_yaml_stream(StringIO(), leaves),
+                lambda text=text: text,
+            )
+        )
+    return cases
+
+
+def measure(case: Case, *, repeat: int, min_time: float) -> dict[str, float]:
+    """Measure the best time per call, and the peak memory allocated during a call."""
+    case.func()  # warm up caches
+    timer = timeit.Timer(case.func)
+    number = 1
+    while timer.timeit(number) < min_time:  # find the number of calls per run
+        number *= 2
+    seconds = min(timer.repeat(repeat=repeat, number=number)) / number
+
+    gc.collect()
+    tracemalloc.start()
+    case.func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": seconds, "peak_bytes": peak, "nbytes": len(case.text().encode())}
+
+
+def _meta(engine: str) -> dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "pydantic": pydantic.VERSION,
+        "ruamel.yaml": ruamel.yaml.__version__,
+        "engine": engine,
+        "machine": platform.machine(),
+    }
+
+
+def main() -> int:
+    """Run the suite, returning the exit code."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", "--filter", default="", help="Only run cases containing this string.")
+    parser.add_argument("--quick", action="store_true", help="Use smaller payloads and shorter runs.")
+    parser.add_argument("--engine", default="pure", choices=["auto", "c", "pure"])
+    parser.add_argument("--save", type=Path, help="Save the results as a baseline (JSON).")
+    parser.add_argument("--compare", type=Path, help="Compare against a saved baseline.")
+    parser.add_argument(
+        "--threshold", type=float, default=0.15, help="Relative slowdown flagged as a regression."
+    )
+    parser.add_argument(
+        "--mem-threshold", type=float, default=0.10, help="Relative increase of peak memory flagged."
+    )
+    args = parser.parse_args()
+
+    from pydantic_yaml import set_default_engine
+
+    set_default_engine(args.engine)
+    baseline: dict[str, Any] = {}
+    if args.compare is not None:
+        saved = json.loads(args.compare.read_text())
+        baseline = saved["results"]
+        if saved["meta"] != _meta(args.engine):
+            print(f"NOTE: Baseline was recorded with {saved['meta']}", file=sys.stderr)
+
+    results: dict[str, dict[str, float]] = {}
+    regressions: list[str] = []
+    header = f"{'case':<44} {'time':>10} {'MB/s':>8} {'peak mem':>10}"
+    print(header + ("  vs. baseline" if baseline else ""))
+    for case in make_cases(args.quick):
+        if args.filter not in case.name:
+            continue
+        if args.quick:
+            res = measure(case, repeat=3, min_time=0.02)
+        else:
+            res = measure(case, repeat=5, min_time=0.2)
+        results[case.name] = res
+        line = (
+            f"{case.name:<44} {res['seconds'] * 1e3:8.2f}ms {res['nbytes'] / res['seconds'] / 1e6:8.2f} "
+            f"{res['peak_bytes'] / 1e6:8.2f}MB"
+        )
+        old = baseline.get(case.name)
+        if old is not None:
+            time_ratio = res["seconds"] / old["seconds"]
+            mem_ratio = res["peak_bytes"] / max(old["peak_bytes"], 1)
+            line += f"  {time_ratio:5.2f}x time, {mem_ratio:5.2f}x mem"
+            # Small absolute changes of memory are just noise (e.g. from caches being filled)
+            mem_increase = res["peak_bytes"] - old["peak_bytes"]
+            mem_regressed = mem_ratio > 1 + args.mem_threshold and mem_increase > 100_000
+            if time_ratio > 1 + args.threshold or mem_regressed:
+                line += "  REGRESSION"
+                regressions.append(case.name)
+        print(line, flush=True)
+
+    if args.save is not None:
+        args.save.write_text(json.dumps({"meta": _meta(args.engine), "results": results}, indent=2))
+        print(f"Saved baseline to {args.save}")
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,13 +3,122 @@
 __all__ = [
     # New API
     "__version__",
+    "DocumentError",
+    "FileCacheInfo",
+    "FileResult",
+    "ParsedFileCache",
+    "PhaseEvent",
+    "YamlCodec",
+    "adapter_cache_info",
+    "add_phase_hook",
+    "aparse_yaml_file_as",
+    "aparse_yaml_raw_as",
+    "aparse_yaml_stream_as",
+    "ato_yaml_file",
+    "ato_yaml_str",
+    "clear_adapter_cache",
+    "get_default_engine",
     "parse_yaml_file_as",
+    "parse_yaml_files_as",
+    "parse_yaml_items_as",
     "parse_yaml_raw_as",
+    "parse_yaml_stream_as",
+    "parse_yaml_stream_parallel_as",
+    "record_phases",
+    "remove_phase_hook",
+    "set_default_engine",
+    "to_yaml_bytes",
     "to_yaml_file",
     "to_yaml_str",
+    "to_yaml_stream",
 ]
 
 
-from pydantic_yaml._internals.v2 import parse_yaml_file_as, parse_yaml_raw_as, to_yaml_file, to_yaml_str
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
 
-from .version import __version__
+if TYPE_CHECKING:
+    from pydantic_yaml._internals.adapters import adapter_cache_info, clear_adapter_cache
+    from pydantic_yaml._internals.aio import (
+        aparse_yaml_file_as,
+        aparse_yaml_raw_as,
+        aparse_yaml_stream_as,
+        ato_yaml_file,
+        ato_yaml_str,
+    )
+    from pydantic_yaml._internals.batch import FileResult, parse_yaml_files_as
+    from pydantic_yaml._internals.codec import YamlCodec
+    from pydantic_yaml._internals.engines import get_default_engine, set_default_engine
+    from pydantic_yaml._internals.file_cache import FileCacheInfo, ParsedFileCache
+    from pydantic_yaml._internals.instrumentation import (
+        PhaseEvent,
+        add_phase_hook,
+        record_phases,
+        remove_phase_hook,
+    )
+    from pydantic_yaml._internals.parallel import parse_yaml_stream_parallel_as
+    from pydantic_yaml._internals.streaming import (
+        DocumentError,
+        parse_yaml_items_as,
+        parse_yaml_stream_as,
+        to_yaml_stream,
+    )
+    from pydantic_yaml._internals.v2 import (
+        parse_yaml_file_as,
+        parse_yaml_raw_as,
+        to_yaml_bytes,
+        to_yaml_file,
+        to_yaml_str,
+    )
+
+    from pydantic_yaml.version import __version__
+
+
+# NOTE: Submodules are only imported when one of their names is first accessed (PEP 562),
+# so that importing `pydantic_yaml` doesn't import `pydantic`, `ruamel.yaml` or `asyncio`.
+_LAZY_NAMES: dict[str, str] = {
+    "__version__": "pydantic_yaml.version",
+    "adapter_cache_info": "pydantic_yaml._internals.adapters",
+    "clear_adapter_cache": "pydantic_yaml._internals.adapters",
+    "aparse_yaml_file_as": "pydantic_yaml._internals.aio",
+    "aparse_yaml_raw_as": "pydantic_yaml._internals.aio",
+    "aparse_yaml_stream_as": "pydantic_yaml._internals.aio",
+    "ato_yaml_file": "pydantic_yaml._internals.aio",
+    "ato_yaml_str": "pydantic_yaml._internals.aio",
+    "FileResult": "pydantic_yaml._internals.batch",
+    "parse_yaml_files_as": "pydantic_yaml._internals.batch",
+    "YamlCodec": "pydantic_yaml._internals.codec",
+    "FileCacheInfo": "pydantic_yaml._internals.file_cache",
+    "ParsedFileCache": "pydantic_yaml._internals.file_cache",
+    "get_default_engine": "pydantic_yaml._internals.engines",
+    "set_default_engine": "pydantic_yaml._internals.engines",
+    "PhaseEvent": "pydantic_yaml._internals.instrumentation",
+    "add_phase_hook": "pydantic_yaml._internals.instrumentation",
+    "record_phases": "pydantic_yaml._internals.instrumentation",
+    "remove_phase_hook": "pydantic_yaml._internals.instrumentation",
+    "parse_yaml_stream_parallel_as": "pydantic_yaml._internals.parallel",
+    "DocumentError": "pydantic_yaml._internals.streaming",
+    "parse_yaml_items_as": "pydantic_yaml._internals.streaming",
+    "parse_yaml_stream_as": "pydantic_yaml._internals.streaming",
+    "to_yaml_stream": "pydantic_yaml._internals.streaming",
+    "parse_yaml_file_as": "pydantic_yaml._internals.v2",
+    "parse_yaml_raw_as": "pydantic_yaml._internals.v2",
+    "to_yaml_bytes": "pydantic_yaml._internals.v2",
+    "to_yaml_file": "pydantic_yaml._internals.v2",
+    "to_yaml_str": "pydantic_yaml._internals.v2",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import the public name from its submodule on first access."""
+    module_name = _LAZY_NAMES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List the public names, including those that aren't imported yet."""
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,111 @@
+"""Cache of Pydantic `TypeAdapter` instances.
+
+Building a `TypeAdapter` constructs the core schema, validator and serializer for a type,
+which is often more expensive than parsing a small YAML document. Adapters are immutable
+once built, so we keep a bounded, thread-safe LRU cache of them, keyed by type.
+"""
+
+__all__ = [
+    "AdapterCacheInfo",
+    "adapter_cache_info",
+    "clear_adapter_cache",
+    "get_type_adapter",
+]
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, NamedTuple
+
+from pydantic import TypeAdapter
+
+ADAPTER_CACHE_MAXSIZE = 256
+"""Maximum number of adapters kept in the cache; least recently used ones are evicted."""
+
+
+class AdapterCacheInfo(NamedTuple):
+    """Statistics of the `TypeAdapter` cache, similar to `functools.lru_cache`."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class _AdapterCache:
+    """Bounded, thread-safe LRU cache of `TypeAdapter` objects."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[tuple[Any, str], TypeAdapter] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, model_type: Any) -> TypeAdapter:
+        """Get the adapter for `model_type`, creating (and caching) it if required."""
+        # NOTE: Some typing constructs compare equal regardless of argument order,
+        # e.g. `Union[A, B] == Union[B, A]`, but validate differently. The repr keeps them apart.
+        try:
+            key = (model_type, repr(model_type))
+            hash(key)
+        except TypeError:
+            # Unhashable types (e.g. some `Annotated` metadata) can't be cached
+            with self._lock:
+                self.misses += 1
+            return TypeAdapter(model_type)
+
+        with self._lock:
+            ta = self._data.get(key)
+            if ta is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return ta
+            self.misses += 1
+
+        # Build outside of the lock; a concurrent build of the same type is harmless.
+        ta = TypeAdapter(model_type)
+        with self._lock:
+            self._data[key] = ta
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return ta
+
+    def info(self) -> AdapterCacheInfo:
+        """Get cache statistics."""
+        with self._lock:
+            return AdapterCacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+    def clear(self) -> None:
+        """Remove all cached adapters and reset statistics."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_cache = _AdapterCache(maxsize=ADAPTER_CACHE_MAXSIZE)
+
+
+def get_type_adapter(model_type: Any) -> TypeAdapter:
+    """Get a (cached) `TypeAdapter` for the given type.
+
+    Parameters
+    ----------
+    model_type : Any
+        Any type supported by `pydantic.TypeAdapter`.
+    """
+    return _cache.get(model_type)
+
+
+def adapter_cache_info() -> AdapterCacheInfo:
+    """Get statistics of the `TypeAdapter` cache used for parsing."""
+    return _cache.info()
+
+
+def clear_adapter_cache() -> None:
+    """Clear the `TypeAdapter` cache used for parsing.
+
+    This is useful if you create many models dynamically and want to release them early.
+    """
+    _cache.clear()
@@ -0,0 +1,202 @@
+"""Asyncio versions of the parsing and dumping functions.
+
+Reading, parsing, validating and writing are blocking (and mostly CPU-bound), so they are
+offloaded to an executor, keeping the event loop responsive.
+"""
+
+__all__ = [
+    "aparse_yaml_file_as",
+    "aparse_yaml_raw_as",
+    "aparse_yaml_stream_as",
+    "ato_yaml_file",
+    "ato_yaml_str",
+]
+
+import asyncio
+import threading
+from collections.abc import AsyncGenerator, Callable
+from concurrent.futures import Executor
+from functools import partial
+from io import IOBase
+from pathlib import Path
+from typing import Any, TypeVar
+
+from pydantic import BaseModel
+
+from .buffers import BytesLike
+from .engines import YamlEngine, get_default_engine
+from .streaming import DocumentError, OnErrorOptions, parse_yaml_stream_as
+from .v2 import parse_yaml_file_as, parse_yaml_raw_as, to_yaml_file, to_yaml_str
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+async def _run(
+    func: Callable[[], R],
+    *,
+    executor: Executor | None,
+    semaphore: asyncio.Semaphore | None,
+) -> R:
+    """Run the function in the executor, optionally limiting concurrency with the semaphore."""
+    loop = asyncio.get_running_loop()
+    if semaphore is None:
+        return await loop.run_in_executor(executor, func)
+    async with semaphore:
+        return await loop.run_in_executor(executor, func)
+
+
+async def aparse_yaml_raw_as(
+    model_type: type[T],
+    raw: str | BytesLike | IOBase,
+    *,
+    engine: YamlEngine | None = None,
+    executor: Executor | None = None,
+    semaphore: asyncio.Semaphore | None = None,
+    **kwargs: Any,
+) -> T:
+    """Parse raw YAML string as the passed model type, without blocking the event loop.
+
+    See `parse_yaml_raw_as()` and `aparse_yaml_file_as()` for the parameters.
+    Other keyword arguments are passed to `parse_yaml_raw_as()`, e.g. `key_path`.
+    """
+    # NOTE: Resolve the default engine now, as a process pool wouldn't share it
+    engine = get_default_engine() if engine is None else engine
+    func = partial(parse_yaml_raw_as, model_type, raw, engine=engine, **kwargs)
+    return await _run(func, executor=executor, semaphore=semaphore)
+
+
+async def aparse_yaml_file_as(
+    model_type: type[T],
+    file: Path | str | IOBase,
+    *,
+    engine: YamlEngine | None = None,
+    executor: Executor | None = None,
+    semaphore: asyncio.Semaphore | None = None,
+    **kwargs: Any,
+) -> T:
+    """Parse YAML file as the passed model type, without blocking the event loop.
+
+    Parameters
+    ----------
+    model_type : Type[BaseModel]
+        The resulting model type.
+    file : Path or str or IOBase
+        The file path or stream to read from.
+    engine : None or "auto" or "c" or "pure"
+        The YAML engine to use, see `parse_yaml_file_as()`.
+    executor : None or Executor
+        The executor to run in. None uses the event loop's default executor (a thread pool).
+        A process pool requires picklable arguments, so streams can't be passed.
+    semaphore : None or asyncio.Semaphore
+        If given, it is held while running, to limit the number of concurrent calls
+        (e.g. to avoid queueing thousands of files on the executor at once).
+    kwargs : Any
+        Other keyword arguments are passed to `parse_yaml_file_as()`, e.g. `key_path`
+        or `schema_aware`.
+
+    Notes
+    -----
+    If the calling task is cancelled, it stops waiting immediately. However, work that
+    has already started in the executor can't be interrupted; its result is discarded.
+    """
+    engine = get_default_engine() if engine is None else engine
+    func = partial(parse_yaml_file_as, model_type, file, engine=engine, **kwargs)
+    return await _run(func, executor=executor, semaphore=semaphore)
+
+
+async def ato_yaml_str(
+    model: BaseModel | Any,
+    *,
+    executor: Executor | None = None,
+    semaphore: asyncio.Semaphore | None = None,
+    **kwargs: Any,
+) -> str:
+    """Generate a YAML string representation of the model, without blocking the event loop.
+
+    See `ato_yaml_file()` for the parameters.
+    """
+    func = partial(to_yaml_str, model, **kwargs)
+    return await _run(func, executor=executor, semaphore=semaphore)
+
+
+async def ato_yaml_file(
+    file: Path | str | IOBase,
+    model: BaseModel | Any,
+    *,
+    executor: Executor | None = None,
+    semaphore: asyncio.Semaphore | None = None,
+    **kwargs: Any,
+) -> None:
+    """Write a YAML file representation of the model, without blocking the event loop.
+
+    Parameters
+    ----------
+    file : Path or str or IOBase
+        The file path or stream to write to.
+    model : BaseModel
+        The model to write.
+    executor : None or Executor
+        The executor to run in. None uses the event loop's default executor (a thread pool).
+    semaphore : None or asyncio.Semaphore
+        If given, it is held while running, to limit the number of concurrent calls.
+    kwargs : Any
+        Other keyword arguments are passed to `to_yaml_file()`, e.g. `add_comments`.
+
+    Notes
+    -----
+    If the calling task is cancelled once writing has started, the write is still completed
+    in the background, so the file isn't left half-written by the cancellation.
+    """
+    func = partial(to_yaml_file, file, model, **kwargs)
+    await _run(func, executor=executor, semaphore=semaphore)
+
+
+async def aparse_yaml_stream_as(
+    model_type: type[T],
+    source: str | BytesLike | Path | IOBase,
+    *,
+    on_error: OnErrorOptions = "raise",
+    errors: list[DocumentError] | None = None,
+    engine: YamlEngine | None = None,
+    executor: Executor | None = None,
+) -> AsyncGenerator[T, None]:
+    """Lazily parse a multi-document YAML stream as an async iterator of models.
+
+    Each document is parsed and validated in the executor (which must be a thread pool,
+    as the parser state is kept between documents). See `parse_yaml_stream_as()`
+    for the other parameters.
+
+    Examples
+    --------
+    ```python
+    async for event in aparse_yaml_stream_as(Event, Path("events.yaml")):
+        ...
+    ```
+    """
+    loop = asyncio.get_running_loop()
+    docs = parse_yaml_stream_as(model_type, source, on_error=on_error, errors=errors, engine=engine)
+    # The generator can't be closed while a document is being parsed, so steps are serialized
+    lock = threading.Lock()
+    done = object()
+
+    def _next() -> Any:
+        with lock:
+            return next(docs, done)
+
+    def _close() -> None:
+        with lock:
+            docs.close()  # type: ignore[attr-defined]
+
+    try:
+        while True:
+            res = await loop.run_in_executor(executor, _next)
+            if res is done:
+                break
+            yield res
+    finally:
+        # Release the file and the parser, without waiting for (or blocking on) a pending step
+        try:
+            loop.run_in_executor(executor, _close)
+        except RuntimeError:  # the loop or executor is shutting down
+            _close()
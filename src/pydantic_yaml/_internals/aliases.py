@@ -0,0 +1,207 @@
+"""Support for YAML anchors and aliases when loading and dumping.
+
+When loading, all aliases of an anchored node are constructed as the same Python object.
+Normally, Pydantic validates each occurrence separately; with memoization, shared objects
+in fields of model types are validated once, and the same model instance is reused.
+
+When dumping, identical repeated subtrees can be replaced by a single shared object,
+which the YAML representer writes once with an anchor (`&id001`) and then as aliases (`*id001`).
+"""
+
+__all__ = ["share_repeated_subtrees", "validate_memoized"]
+
+from types import NoneType, UnionType
+from typing import Any, Union, get_args, get_origin
+
+from pydantic import BaseModel, RootModel, TypeAdapter, ValidationError
+from pydantic.fields import FieldInfo
+
+from .adapters import get_type_adapter
+
+MIN_SHARED_NODES = 4
+"""Minimum number of nodes of a subtree to replace its repetitions by aliases.
+
+Smaller subtrees (e.g. `[a, b]`) would hardly get shorter, and are harder to read as aliases.
+"""
+
+
+def _shared_ids(obj: Any) -> set[int]:
+    """Get the ids of dicts and lists that occur more than once in the loaded structure."""
+    seen: set[int] = set()
+    shared: set[int] = set()
+    stack = [obj]
+    while stack:
+        val = stack.pop()
+        if isinstance(val, dict | list):
+            if id(val) in seen:
+                shared.add(id(val))
+                continue
+            seen.add(id(val))
+            stack.extend(val.values() if isinstance(val, dict) else val)
+    return shared
+
+
+def _model_class(tp: Any) -> type[BaseModel] | None:
+    """Get the model class of a (possibly optional) model type, if it's a plain one."""
+    if get_origin(tp) in (Union, UnionType):
+        args = [arg for arg in get_args(tp) if arg is not NoneType]
+        if len(args) != 1:
+            return None
+        tp = args[0]
+    if isinstance(tp, type) and issubclass(tp, BaseModel) and tp is not BaseModel:
+        if issubclass(tp, RootModel):
+            return None
+        return tp
+    return None
+
+
+def _has_before_validators(cls: type[BaseModel]) -> bool:
+    """Check whether the model has validators that see the raw input of its fields."""
+    decorators = cls.__pydantic_decorators__
+    return any(dec.info.mode in ("before", "wrap") for dec in decorators.model_validators.values())
+
+
+def _validated_fields(cls: type[BaseModel]) -> set[str]:
+    """Get the names of fields that have field validators (or all fields, for "*")."""
+    names: set[str] = set()
+    for dec in cls.__pydantic_decorators__.field_validators.values():
+        names.update(dec.info.fields)
+    if "*" in names:
+        names.update(cls.model_fields)
+    return names
+
+
+def _input_keys(cls: type[BaseModel], name: str, info: FieldInfo) -> list[str] | None:
+    """Get the input keys of a model field, or None if they aren't plain keys (e.g. `AliasPath`)."""
+    if info.validation_alias is not None:
+        if not isinstance(info.validation_alias, str):
+            return None  # `AliasPath` or `AliasChoices`
+        keys = [info.validation_alias]
+    elif info.alias is not None:
+        keys = [info.alias]
+    else:
+        keys = [name]
+    by_name = cls.model_config.get("populate_by_name") or cls.model_config.get("validate_by_name")
+    if by_name and name not in keys:
+        keys.append(name)
+    return keys
+
+
+class _Memoizer:
+    """Replaces shared objects at positions of model types by (once) validated models."""
+
+    def __init__(self, shared: set[int]) -> None:
+        self.shared = shared
+        self.memo: dict[tuple[int, type], BaseModel] = {}
+
+    def walk(self, tp: Any, val: Any) -> Any:
+        """Get the value with shared objects replaced, copying containers that change."""
+        cls = _model_class(tp)
+        if cls is not None:
+            if not isinstance(val, dict):
+                return val
+            if id(val) in self.shared:
+                key = (id(val), cls)
+                res = self.memo.get(key)
+                if res is None:
+                    res = self.memo[key] = get_type_adapter(cls).validate_python(val)
+                return res
+            return self._walk_model(cls, val)
+
+        origin = get_origin(tp)
+        args = get_args(tp)
+        if origin is list and isinstance(val, list) and len(args) == 1:
+            new_items = [self.walk(args[0], item) for item in val]
+            if any(a is not b for a, b in zip(new_items, val, strict=True)):
+                return new_items
+        elif origin is dict and isinstance(val, dict) and len(args) == 2:
+            new_values = {k: self.walk(args[1], v) for k, v in val.items()}
+            if any(new_values[k] is not v for k, v in val.items()):
+                return new_values
+        return val
+
+    def _walk_model(self, cls: type[BaseModel], val: dict) -> dict:
+        """Walk into the fields of a model that isn't shared itself."""
+        if _has_before_validators(cls):
+            return val
+        skipped = _validated_fields(cls)
+        new: dict | None = None
+        for name, info in cls.model_fields.items():
+            keys = _input_keys(cls, name, info)
+            if name in skipped or keys is None:
+                continue
+            for key in keys:
+                if key in val:
+                    sub = self.walk(info.annotation, val[key])
+                    if sub is not val[key]:
+                        if new is None:
+                            new = dict(val)
+                        new[key] = sub
+                    break
+        return val if new is None else new
+
+
+def validate_memoized(model_type: Any, ta: TypeAdapter, obj: Any) -> Any:
+    """Validate loaded objects, validating aliased (shared) nodes of model types only once.
+
+    Only fields annotated with a model type (possibly optional, or in a `list` or `dict`)
+    that don't have "before" validators are memoized. If validating a shared node fails,
+    the whole structure is validated normally, so errors are the same as without memoization.
+    """
+    shared = _shared_ids(obj)
+    if shared:
+        try:
+            obj = _Memoizer(shared).walk(model_type, obj)
+        except ValidationError:
+            pass  # report errors at their full location
+    return ta.validate_python(obj)
+
+
+def _scalar_key(v: Any) -> tuple[type, Any]:
+    """Get a key for the scalar, which only matches scalars that are written the same way."""
+    if isinstance(v, float):
+        return float, repr(v)  # 0.0 == -0.0, but they're different values
+    return type(v), v
+
+
+def share_repeated_subtrees(val: Any) -> Any:
+    """Replace identical repeated dicts and lists of the dumped value by a single shared object.
+
+    The value is modified in place (and returned). Only subtrees with at least
+    `MIN_SHARED_NODES` nodes are shared.
+    """
+    # Each distinct subtree gets a number; a subtree's key consists of its children's numbers,
+    # so keys are small and cheap to hash, however deep the structure is.
+    numbers: dict[Any, int] = {}
+    first: dict[int, Any] = {}
+
+    def _visit(v: Any) -> tuple[Any, int]:
+        """Get the canonical key (or number) and node count of the subtree, sharing repetitions."""
+        if isinstance(v, dict):
+            size = 1
+            parts = []
+            for k, sub in v.items():
+                sub_key, sub_size = _visit(sub)
+                size += 1 + sub_size
+                parts.append((*_scalar_key(k), sub_key))
+                if sub_size >= MIN_SHARED_NODES:
+                    v[k] = first[sub_key]
+            key: Any = ("map", tuple(parts))
+        elif isinstance(v, list):
+            size = 1
+            parts = []
+            for i, sub in enumerate(v):
+                sub_key, sub_size = _visit(sub)
+                size += sub_size
+                parts.append(sub_key)
+                if sub_size >= MIN_SHARED_NODES:
+                    v[i] = first[sub_key]
+            key = ("seq", tuple(parts))
+        else:
+            return _scalar_key(v), 1
+        num = numbers.setdefault(key, len(numbers))
+        first.setdefault(num, v)
+        return num, size
+
+    _visit(val)
+    return val
@@ -0,0 +1,160 @@
+"""Parsing many YAML files concurrently."""
+
+__all__ = ["FileResult", "parse_yaml_files_as"]
+
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Generic, Literal, TypeVar
+
+from .engines import YamlEngine, get_default_engine
+from .v2 import parse_yaml_file_as
+
+T = TypeVar("T")
+
+ExecutorOptions = Literal["thread", "process"]
+
+
+@dataclass(frozen=True)
+class FileResult(Generic[T]):
+    """Result of parsing a single file in a batch: either the parsed value, or the error."""
+
+    path: Path
+    """The (resolved) path of the file."""
+    value: T | None = None
+    """The parsed value, or None if parsing failed."""
+    error: Exception | None = None
+    """The error raised while reading, parsing or validating the file, if any."""
+
+    @property
+    def ok(self) -> bool:
+        """Whether the file was parsed successfully."""
+        return self.error is None
+
+
+def _expand_paths(files: Path | str | Iterable[Path | str], pattern: str) -> list[Path]:
+    """Get the list of files, expanding directories with the glob pattern."""
+    if isinstance(files, str | Path):
+        files = [files]
+    res: list[Path] = []
+    for file in files:
+        if not isinstance(file, str | Path):
+            raise TypeError(f"Expected Path or str, but got {file!r}")
+        path = Path(file).resolve()
+        if path.is_dir():
+            res.extend(sorted(p for p in path.glob(pattern) if p.is_file()))
+        else:
+            res.append(path)
+    return res
+
+
+def _parse_file(model_type: type[T], path: Path, engine: YamlEngine) -> FileResult[T]:
+    """Parse a single file, catching errors (runs in the worker)."""
+    try:
+        return FileResult(path, value=parse_yaml_file_as(model_type, path, engine=engine))
+    except Exception as e:
+        return FileResult(path, error=e)
+
+
+def _get_executor(
+    executor: ExecutorOptions | Executor, max_workers: int | None
+) -> tuple[Executor, bool]:
+    """Get the executor, and whether we own it (and should shut it down)."""
+    if isinstance(executor, Executor):
+        return executor, False
+    elif executor == "thread":
+        return ThreadPoolExecutor(max_workers=max_workers), True
+    elif executor == "process":
+        return ProcessPoolExecutor(max_workers=max_workers), True
+    raise ValueError(f"Expected executor to be 'thread', 'process' or an Executor, got {executor!r}")
+
+
+def _iter_results(
+    model_type: type[T],
+    paths: list[Path],
+    *,
+    executor: ExecutorOptions | Executor,
+    max_workers: int | None,
+    ordered: bool,
+    engine: YamlEngine,
+) -> Iterator[FileResult[T]]:
+    """Submit all files to the executor, yielding the results."""
+    pool, owned = _get_executor(executor, max_workers)
+    futures: list[Future[FileResult[T]]] = []
+    try:
+        futures = [pool.submit(_parse_file, model_type, path, engine) for path in paths]
+        done = iter(futures) if ordered else as_completed(futures)
+        for fut in done:
+            yield fut.result()
+    finally:
+        # Don't do any more work if the caller stopped iterating early
+        for fut in futures:
+            fut.cancel()
+        if owned:
+            pool.shutdown(wait=True)
+
+
+def parse_yaml_files_as(
+    model_type: type[T],
+    files: Path | str | Iterable[Path | str],
+    *,
+    pattern: str = "*.yaml",
+    executor: ExecutorOptions | Executor = "thread",
+    max_workers: int | None = None,
+    ordered: bool = True,
+    engine: YamlEngine | None = None,
+) -> Iterator[FileResult[T]]:
+    """Parse many YAML files as the passed model type, concurrently.
+
+    Errors of individual files (missing files, YAML syntax errors, validation errors)
+    don't abort the batch; they are returned as the `error` of the file's result.
+
+    Parameters
+    ----------
+    model_type : Type[BaseModel]
+        The resulting model type of each file.
+    files : Path or str or iterable of Path or str
+        The files to parse. Directories are expanded to the files matching `pattern`, sorted.
+    pattern : str
+        Glob pattern for files in directories, e.g. "*.yml" or "**/*.yaml" (recursive).
+    executor : "thread" or "process" or Executor
+        Run on a new thread pool, a new process pool, or the given executor (which isn't shut down).
+        Process pools sidestep the GIL for large batches, but `model_type` and the results must
+        be picklable, i.e. the model must be importable from a module.
+    max_workers : None or int
+        Maximum number of workers for a new pool. None uses the `concurrent.futures` default.
+    ordered : bool
+        If True, results are yielded in the order of `files`. Otherwise, they are yielded
+        as soon as they are completed.
+    engine : None or "auto" or "c" or "pure"
+        The YAML engine to use: "c" for the libyaml-based parser, "pure" for the pure-Python
+        one, or "auto" to use the C one if available. None uses the global default,
+        see `set_default_engine()`.
+
+    Returns
+    -------
+    results : Iterator[FileResult]
+        The result of each file. Files are submitted to the executor on the first iteration;
+        pending work is cancelled if the iterator is closed early.
+
+    Examples
+    --------
+    ```python
+    results = list(parse_yaml_files_as(Config, Path("configs/"), pattern="**/*.yaml"))
+    failed = [res for res in results if not res.ok]
+    ```
+    """
+    if not isinstance(executor, Executor) and executor not in ("thread", "process"):
+        raise ValueError(f"Expected executor to be 'thread', 'process' or an Executor, got {executor!r}")
+    paths = _expand_paths(files, pattern)
+    # Pass the engine explicitly, as worker processes don't share our default
+    engine = get_default_engine() if engine is None else engine
+    return _iter_results(
+        model_type,
+        paths,
+        executor=executor,
+        max_workers=max_workers,
+        ordered=ordered,
+        engine=engine,
+    )
@@ -0,0 +1,74 @@
+"""Reading YAML from bytes-like objects and memory-mapped files, and writing it to binary streams.
+
+Inputs are read in chunks without copying them, and outputs are encoded in chunks.
+"""
+
+__all__ = ["BytesLike", "BufferStream", "open_memory_map", "text_writer"]
+
+import mmap
+from collections.abc import Iterator
+from contextlib import contextmanager
+from io import BufferedIOBase, IOBase, RawIOBase, TextIOWrapper
+from pathlib import Path
+
+BytesLike = bytes | bytearray | memoryview | mmap.mmap
+"""Objects supporting the buffer protocol that can be parsed as (encoded) YAML."""
+
+
+class BufferStream(RawIOBase):
+    """Read-only binary stream over a bytes-like object, without copying it.
+
+    The YAML reader consumes its input in small chunks, so only one chunk at a time is copied
+    (unlike `io.BytesIO`, which copies anything but `bytes` up front).
+    Closing the stream releases the underlying buffer, e.g. so an `mmap` can be closed.
+    """
+
+    def __init__(self, buffer: BytesLike) -> None:
+        super().__init__()
+        self._view = memoryview(buffer).cast("B")
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:  # type: ignore[no-untyped-def]
+        n = min(len(b), len(self._view) - self._pos)
+        b[:n] = self._view[self._pos : self._pos + n]
+        self._pos += n
+        return n
+
+    def close(self) -> None:
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+@contextmanager
+def open_memory_map(file: Path) -> Iterator[IOBase]:
+    """Open the file as a memory-mapped stream (or a regular binary file, if it's empty)."""
+    with file.open(mode="rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty files can't be mapped
+            yield f
+            return
+        # NOTE: The stream must be closed (releasing its view) before the map
+        with mm, BufferStream(mm) as stream:
+            yield stream
+
+
+@contextmanager
+def text_writer(stream: IOBase, encoding: str) -> Iterator[IOBase]:
+    """Get a text stream writing to the stream, encoding the text if it's a binary stream.
+
+    The text is encoded in chunks as it's written, without building the whole output first.
+    The binary stream is left open (and flushed) afterwards.
+    """
+    if not isinstance(stream, RawIOBase | BufferedIOBase):
+        yield stream  # already a text stream
+        return
+    wrapper = TextIOWrapper(stream, encoding=encoding, newline="")  # type: ignore[type-var]
+    try:
+        yield wrapper
+    finally:
+        wrapper.detach()  # flushes, without closing the binary stream
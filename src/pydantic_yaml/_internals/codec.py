@@ -0,0 +1,217 @@
+"""Reusable codec, bound to a model type and a fixed set of loading and dumping options."""
+
+__all__ = ["YamlCodec"]
+
+from io import BytesIO, IOBase, StringIO
+from pathlib import Path
+from typing import Annotated, Any, Generic, TypeVar, get_args, get_origin
+
+from pydantic import BaseModel
+
+from .adapters import get_type_adapter
+from .buffers import BytesLike, text_writer
+from .engines import YamlEngine, _use_pure, get_default_engine
+from .events import KeyPath, split_key_path
+from .resolver import scalar_schema
+from .v2 import (
+    CommentsOptions,
+    _check_dump_options,
+    _dump_model,
+    _get_comment_plan,
+    _parse_file,
+    _parse_raw,
+    _write_file,
+)
+
+T = TypeVar("T")
+
+
+def _model_classes(tp: Any, seen: set[type[BaseModel]]) -> None:
+    """Collect the model classes used in the type, including those in their fields."""
+    origin = get_origin(tp)
+    if origin is Annotated:
+        _model_classes(get_args(tp)[0], seen)
+    elif origin is not None:
+        for arg in get_args(tp):
+            _model_classes(arg, seen)
+    elif isinstance(tp, type) and issubclass(tp, BaseModel) and tp is not BaseModel:
+        if tp not in seen:
+            seen.add(tp)
+            for fld_info in tp.model_fields.values():
+                _model_classes(fld_info.annotation, seen)
+
+
+class YamlCodec(Generic[T]):
+    """Loads and dumps a model type as YAML, with options that are set (and checked) once.
+
+    The `TypeAdapter` of the model type, the YAML engine, the comment plans of the model
+    (and the models used in its fields) and its scalar schema are resolved when the codec is created,
+    so each call only does the actual work. A codec is immutable, and can be shared
+    across threads; each thread uses its own pooled YAML readers and writers.
+
+    Parameters
+    ----------
+    model_type : Type[BaseModel] or Any
+        The model type to load and dump. Other types (e.g. `list[MyModel]`) are dumped
+        with their `TypeAdapter`, in a single serializer call.
+    add_comments : False or True or "fields-only" or "models-only"
+        Whether to add comments to the output YAML using fields and/or model descriptions.
+    default_flow_style : bool
+        Whether to use "flow style" when dumping.
+    indent : None or int
+        General indent value. Leave as None for the default.
+    map_indent, sequence_indent, sequence_dash_offset : None or int
+        More specific indent values.
+    engine : None or "auto" or "c" or "pure"
+        The YAML engine to use. None uses the global default at the time the codec is created,
+        see `set_default_engine()`.
+    emit_json : bool
+        If True, dump models as JSON (which is valid flow-style YAML), see `to_yaml_str()`.
+    use_anchors : bool
+        If True, identical repeated subtrees are dumped only once, see `to_yaml_str()`.
+    encoding : str
+        The encoding of files and bytes that are written.
+    key_path : None or str or sequence of keys
+        If given, only the subtree at this path is loaded, see `parse_yaml_raw_as()`.
+    memoize_aliases : bool
+        If True, aliased nodes are validated only once, see `parse_yaml_raw_as()`.
+    schema_aware : bool
+        If True, plain scalars are read as strings where the type expects them,
+        see `parse_yaml_raw_as()`.
+    json_fast_path : bool
+        If True, plain JSON inputs are loaded with the `json` module, see `parse_yaml_raw_as()`.
+    memory_map : bool
+        If True, memory-map files that are loaded, see `parse_yaml_file_as()`.
+    json_kwargs : Any
+        Keyword arguments to pass `model.model_dump()` (or `model.model_dump_json()`).
+
+    Examples
+    --------
+    ```python
+    codec = YamlCodec(Config, indent=2, add_comments="fields-only")
+
+    cfg = codec.load_file("config.yaml")
+    text = codec.dump(cfg)
+    ```
+    """
+
+    def __init__(
+        self,
+        model_type: type[T],
+        *,
+        add_comments: CommentsOptions = False,
+        default_flow_style: bool | None = False,
+        indent: int | None = None,
+        map_indent: int | None = None,
+        sequence_indent: int | None = None,
+        sequence_dash_offset: int | None = None,
+        engine: YamlEngine | None = None,
+        emit_json: bool = False,
+        use_anchors: bool = False,
+        encoding: str = "utf-8",
+        key_path: KeyPath | None = None,
+        memoize_aliases: bool = False,
+        schema_aware: bool = False,
+        json_fast_path: bool = True,
+        memory_map: bool = False,
+        **json_kwargs: Any,
+    ) -> None:
+        if add_comments not in (False, True, "fields-only", "models-only"):
+            raise ValueError(f"Unknown comment option {add_comments!r}")
+        _check_dump_options(
+            add_comments=add_comments,
+            map_indent=map_indent,
+            sequence_indent=sequence_indent,
+            sequence_dash_offset=sequence_dash_offset,
+            custom_yaml_writer=None,
+            emit_json=emit_json,
+            use_anchors=use_anchors,
+        )
+        if engine is None:
+            engine = get_default_engine()
+        _use_pure(engine)  # fails early for unknown or unavailable engines
+        "".encode(encoding)  # fails early for unknown encodings
+
+        self._model_type = model_type
+        self._adapter = get_type_adapter(model_type)
+        self._engine: YamlEngine = engine
+        self._keys = None if key_path is None else split_key_path(key_path)
+        self._memoize_aliases = memoize_aliases
+        self._schema_aware = schema_aware
+        self._json_fast_path = json_fast_path
+        self._memory_map = memory_map
+        self._encoding = encoding
+        # Model instances are dumped with `model_dump()`, like with `to_yaml_str()`
+        self._is_model = isinstance(model_type, type) and issubclass(model_type, BaseModel)
+        self._dump_kwargs: dict[str, Any] = dict(
+            model_type=None if self._is_model else model_type,
+            adapter=None if self._is_model else self._adapter,
+            add_comments=add_comments,
+            default_flow_style=default_flow_style,
+            indent=indent,
+            map_indent=map_indent,
+            sequence_indent=sequence_indent,
+            sequence_dash_offset=sequence_dash_offset,
+            custom_yaml_writer=None,
+            engine=engine,
+            json_roundtrip=False,
+            emit_json=emit_json,
+            use_anchors=use_anchors,
+            **json_kwargs,
+        )
+        if schema_aware:
+            scalar_schema(model_type)
+        if add_comments is not False:
+            classes: set[type[BaseModel]] = set()
+            _model_classes(model_type, classes)
+            for cls in classes:
+                _get_comment_plan(cls, add_comments)
+
+    @property
+    def model_type(self) -> type[T]:
+        """The model type that is loaded."""
+        return self._model_type
+
+    def __repr__(self) -> str:
+        name = getattr(self._model_type, "__name__", repr(self._model_type))
+        return f"{type(self).__name__}({name}, engine={self._engine!r})"
+
+    def load(self, raw: str | BytesLike | IOBase) -> T:
+        """Parse a raw YAML string, bytes or stream, see `parse_yaml_raw_as()`."""
+        return _parse_raw(
+            self._model_type,
+            raw,
+            engine=self._engine,
+            keys=self._keys,
+            memoize_aliases=self._memoize_aliases,
+            schema_aware=self._schema_aware,
+            json_fast_path=self._json_fast_path,
+            adapter=self._adapter,
+        )
+
+    def load_file(self, file: Path | str | IOBase) -> T:
+        """Parse a YAML file, see `parse_yaml_file_as()`."""
+        return _parse_file(self.load, file, memory_map=self._memory_map)
+
+    def _write(self, stream: IOBase, model: T) -> None:
+        """Write the model (or value of the type) to a text stream."""
+        if self._is_model and not isinstance(model, BaseModel):
+            raise TypeError(f"Expected a Pydantic BaseModel, but got {type(model)}")
+        _dump_model(stream, model, **self._dump_kwargs)
+
+    def dump(self, model: T) -> str:
+        """Generate a YAML string representation of the model, see `to_yaml_str()`."""
+        stream = StringIO()
+        self._write(stream, model)
+        return stream.getvalue()
+
+    def dump_bytes(self, model: T) -> bytes:
+        """Generate an encoded YAML representation of the model, see `to_yaml_bytes()`."""
+        stream = BytesIO()
+        with text_writer(stream, self._encoding) as f:
+            self._write(f, model)
+        return stream.getvalue()
+
+    def dump_file(self, file: Path | str | IOBase, model: T) -> None:
+        """Write a YAML file representation of the model, see `to_yaml_file()`."""
+        _write_file(lambda f: self._write(f, model), file, encoding=self._encoding)
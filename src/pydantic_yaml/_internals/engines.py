@@ -0,0 +1,262 @@
+"""Pool of configured `ruamel.yaml.YAML` reader and writer instances.
+
+Creating a `YAML` object (and its resolver, constructor and representer tables) is costly
+compared to loading or dumping a small document. Instead, we keep configured instances
+in a per-thread pool keyed by their options, and reuse them across calls.
+
+`YAML` instances are not thread-safe and not reentrant, so an instance is checked out
+of the pool for the duration of a single load/dump, and a new one is created if the pool
+is empty (e.g. for nested or interleaved calls on the same thread).
+
+This module also selects the "engine": either the pure-Python scanner/emitter of `ruamel.yaml`,
+or the libyaml-based C extension (`ruamel.yaml.clib`), if it is installed.
+"""
+
+__all__ = [
+    "HAS_LIBYAML",
+    "YamlEngine",
+    "clear_engine_pool",
+    "configured_writer",
+    "get_default_engine",
+    "pooled_reader",
+    "pooled_writer",
+    "set_default_engine",
+]
+
+import threading
+from collections.abc import Hashable, Iterator
+from contextlib import contextmanager
+from typing import Any, Literal, get_args
+
+import ruamel.yaml
+from ruamel.yaml import YAML
+
+YamlEngine = Literal["auto", "c", "pure"]
+
+HAS_LIBYAML: bool = bool(getattr(ruamel.yaml, "__with_libyaml__", False))
+"""Whether the libyaml-based C extension for `ruamel.yaml` is available."""
+
+_default_engine: YamlEngine = "pure"
+
+
+def set_default_engine(engine: YamlEngine) -> None:
+    """Set the default YAML engine, used when `engine=None` is passed.
+
+    Parameters
+    ----------
+    engine : "auto" or "c" or "pure"
+        "pure" always uses the pure-Python implementation (the default).
+        "c" uses the libyaml-based C extension, and fails if it isn't installed.
+        "auto" uses the C extension if it's installed, falling back to "pure" otherwise.
+    """
+    global _default_engine
+    if engine not in get_args(YamlEngine):
+        raise ValueError(f"Unknown YAML engine {engine!r}, expected one of {get_args(YamlEngine)}")
+    _default_engine = engine
+
+
+def get_default_engine() -> YamlEngine:
+    """Get the default YAML engine."""
+    return _default_engine
+
+
+def _use_pure(engine: YamlEngine | None) -> bool:
+    """Check whether to use the pure-Python implementation for the engine."""
+    if engine is None:
+        engine = _default_engine
+    if engine == "pure":
+        return True
+    elif engine == "auto":
+        return not HAS_LIBYAML
+    elif engine == "c":
+        if not HAS_LIBYAML:
+            raise RuntimeError("The 'c' YAML engine requires `ruamel.yaml.clib` to be installed.")
+        return False
+    raise ValueError(f"Unknown YAML engine {engine!r}, expected one of {get_args(YamlEngine)}")
+
+
+MAX_IDLE_PER_KEY = 4
+"""Maximum number of idle instances kept per thread for each option set."""
+
+_local = threading.local()
+
+
+def _get_pool(key: Hashable) -> list[YAML]:
+    """Get the current thread's pool of idle instances for the key."""
+    try:
+        pools: dict[Hashable, list[YAML]] = _local.pools
+    except AttributeError:
+        pools = _local.pools = {}
+    return pools.setdefault(key, [])
+
+
+@contextmanager
+def _checkout(key: Hashable, factory: Any) -> Iterator[YAML]:
+    """Check out an instance from the pool, returning it afterwards if it is still usable."""
+    pool = _get_pool(key)
+    yaml = pool.pop() if pool else factory()
+    version = yaml.version
+    yield yaml
+    # NOTE: We only get here on success. On errors, the instance is dropped, as its internal
+    # state (anchors, partially-constructed objects) may be left dirty.
+    doc_infos = getattr(yaml, "doc_infos", None)  # ruamel.yaml >= 0.18.4
+    if doc_infos is not None:
+        doc_infos.clear()  # `YAML.load()` keeps appending to this list
+    if yaml.version != version:
+        # A `%YAML 1.1` directive sets the version of the instance (and of its resolver),
+        # which would otherwise apply to all later documents loaded with it
+        yaml.version = version
+        yaml.__dict__.pop("_resolver", None)  # rebuilt on first use
+        scanner = yaml.__dict__.get("_scanner")
+        if scanner is not None and hasattr(scanner, "yaml_version"):
+            scanner.yaml_version = None  # older ruamel.yaml versions don't reset it
+    if len(pool) < MAX_IDLE_PER_KEY:
+        pool.append(yaml)
+
+
+def clear_engine_pool() -> None:
+    """Drop all pooled `YAML` instances of the current thread."""
+    _local.pools = {}
+
+
+def _new_reader(typ: str, pure: bool, resolver: type | None) -> YAML:
+    reader = YAML(typ=typ, pure=pure)
+    if resolver is not None:
+        reader.Resolver = resolver
+    return reader
+
+
+@contextmanager
+def pooled_reader(
+    typ: str = "safe",
+    *,
+    engine: YamlEngine | None = None,
+    resolver: type | None = None,
+) -> Iterator[YAML]:
+    """Get a pooled YAML reader.
+
+    Parameters
+    ----------
+    typ : str
+        The `ruamel.yaml` type, e.g. "safe" (YAML 1.2 support) or "rt" (round-trip).
+    engine : None or "auto" or "c" or "pure"
+        The YAML engine to use. None uses the default, see `set_default_engine()`.
+        The round-trip loader is always pure-Python.
+    resolver : None or type
+        A custom resolver class, used instead of the default one of the `typ`.
+    """
+    pure = typ == "rt" or _use_pure(engine)
+    with _checkout(("reader", typ, pure, resolver), lambda: _new_reader(typ, pure, resolver)) as reader:
+        yield reader
+
+
+def _resolve_indents(
+    indent: int | None,
+    map_indent: int | None,
+    sequence_indent: int | None,
+    sequence_dash_offset: int | None,
+) -> tuple[int | None, int | None, int | None]:
+    """Resolve specific indents, falling back to the general `indent` value."""
+    return (
+        indent if map_indent is None else map_indent,
+        indent if sequence_indent is None else sequence_indent,
+        indent if sequence_dash_offset is None else sequence_dash_offset,
+    )
+
+
+def _apply_writer_options(
+    writer: YAML,
+    default_flow_style: bool | None,
+    map_indent: int | None,
+    sequence_indent: int | None,
+    sequence_dash_offset: int | None,
+) -> None:
+    """Set options on the writer (only the ones that aren't None)."""
+    if default_flow_style is not None:
+        writer.default_flow_style = default_flow_style
+    writer.indent(mapping=map_indent, sequence=sequence_indent, offset=sequence_dash_offset)
+
+
+def _new_writer(typ: str, pure: bool, *opts: Any) -> YAML:
+    writer = YAML(typ=typ, pure=pure)
+    _apply_writer_options(writer, *opts)
+    return writer
+
+
+@contextmanager
+def pooled_writer(
+    typ: str = "safe",
+    *,
+    default_flow_style: bool | None = None,
+    indent: int | None = None,
+    map_indent: int | None = None,
+    sequence_indent: int | None = None,
+    sequence_dash_offset: int | None = None,
+    engine: YamlEngine | None = None,
+) -> Iterator[YAML]:
+    """Get a pooled YAML writer, configured with the given options.
+
+    Parameters
+    ----------
+    typ : str
+        The `ruamel.yaml` type, e.g. "safe" or "rt" (round-trip).
+    default_flow_style : None or bool
+        Whether to use "flow style". None keeps the `ruamel.yaml` default.
+    indent : None or int
+        General indent value. Leave as None for the default.
+    map_indent, sequence_indent, sequence_dash_offset : None or int
+        More specific indent values.
+    engine : None or "auto" or "c" or "pure"
+        The YAML engine to use. None uses the default, see `set_default_engine()`.
+        The C emitter doesn't support custom indents, so those always use the pure-Python one,
+        as does the round-trip dumper.
+    """
+    indents = _resolve_indents(indent, map_indent, sequence_indent, sequence_dash_offset)
+    opts = (default_flow_style, *indents)
+    pure = _use_pure(engine) or typ == "rt" or any(x is not None for x in indents)
+    with _checkout(("writer", typ, pure, *opts), lambda: _new_writer(typ, pure, *opts)) as writer:
+        yield writer
+
+
+@contextmanager
+def configured_writer(
+    writer: YAML,
+    *,
+    default_flow_style: bool | None = None,
+    indent: int | None = None,
+    map_indent: int | None = None,
+    sequence_indent: int | None = None,
+    sequence_dash_offset: int | None = None,
+) -> Iterator[YAML]:
+    """Temporarily set options on a user-supplied writer, restoring them afterwards."""
+    if not isinstance(writer, YAML):
+        raise TypeError(f"Please pass a YAML instance or subclass. Got {writer!r}")
+    saved = (
+        writer.default_flow_style,
+        writer.map_indent,
+        writer.sequence_indent,
+        writer.sequence_dash_offset,
+    )
+    # The representer is created lazily, and copies `default_flow_style` when it is
+    representer = writer.__dict__.get("_representer")
+    saved_repr_flow_style = getattr(representer, "default_flow_style", None)
+    _apply_writer_options(
+        writer,
+        default_flow_style,
+        *_resolve_indents(indent, map_indent, sequence_indent, sequence_dash_offset),
+    )
+    if representer is not None and default_flow_style is not None:
+        representer.default_flow_style = default_flow_style
+    try:
+        yield writer
+    finally:
+        (
+            writer.default_flow_style,
+            writer.map_indent,
+            writer.sequence_indent,
+            writer.sequence_dash_offset,
+        ) = saved
+        if representer is None:
+            writer.__dict__.pop("_representer", None)
+        else:
+            representer.default_flow_style = saved_repr_flow_style
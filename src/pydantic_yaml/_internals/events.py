@@ -0,0 +1,291 @@
+"""Event-level loading of YAML documents, for constructing them piece by piece.
+
+`YAML.load()` composes the node graph of a whole document before constructing any of it.
+Here, the parser's events are consumed directly, and nodes are composed and constructed
+one at a time (e.g. per item of a top-level sequence), so only the current one is kept.
+Nodes that aren't needed (e.g. outside of a key path) are skipped without composing them.
+"""
+
+__all__ = ["EventLoader", "KeyPath", "event_loader", "lookup_key_path", "split_key_path"]
+
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Any
+
+from ruamel.yaml import YAML
+from ruamel.yaml.composer import Composer, ComposerError
+from ruamel.yaml.events import (
+    AliasEvent,
+    MappingEndEvent,
+    MappingStartEvent,
+    ScalarEvent,
+    SequenceEndEvent,
+    SequenceStartEvent,
+    StreamEndEvent,
+)
+from ruamel.yaml.nodes import MappingNode, Node, ScalarNode, SequenceNode
+
+from .resolver import SchemaResolver, resolve_used_nodes
+
+try:
+    from ruamel.yaml.docinfo import DocInfo, version
+except ImportError:  # ruamel.yaml < 0.18.4 has no document info
+    DocInfo = None  # type: ignore[assignment,misc]
+
+KeyPath = str | Sequence[Any]
+
+_MERGE_TAG = "tag:yaml.org,2002:merge"
+
+
+def split_key_path(key_path: KeyPath) -> list[Any]:
+    """Split a dotted key path (e.g. "services.api.0") into keys; sequences are kept as-is.
+
+    Parts that are decimal numbers are converted to `int`, like plain YAML scalars.
+    """
+    if isinstance(key_path, str):
+        if not key_path:
+            return []
+        return [int(k) if k.isascii() and k.isdigit() else k for k in key_path.split(".")]
+    return list(key_path)
+
+
+def _not_found(keys: Sequence[Any], key: Any) -> KeyError:
+    return KeyError(f"Key path {list(keys)!r} not found (at {key!r})")
+
+
+def lookup_key_path(obj: Any, keys: Sequence[Any], *, prefix: Sequence[Any] = ()) -> Any:
+    """Get the value at the key path of loaded objects, raising `KeyError` if it doesn't exist.
+
+    The `prefix` is only used for error messages, if the keys are the rest of a longer path.
+    """
+    for key in keys:
+        try:
+            if isinstance(obj, dict):
+                obj = obj[key]
+            elif isinstance(obj, list) and isinstance(key, int) and not isinstance(key, bool):
+                obj = obj[key]
+            else:
+                raise KeyError(key)
+        except (KeyError, IndexError, TypeError):
+            raise _not_found([*prefix, *keys], key) from None
+    return obj
+
+
+def _event_tag(event: Any) -> Any:
+    """Get the explicit tag of the event (a `Tag` object, or a string on older ruamel.yaml versions)."""
+    return getattr(event, "ctag", None) if hasattr(event, "ctag") else event.tag
+
+
+class _NodeComposer(Composer):
+    """Composer that works on top of any parser, including the C one (which has its own)."""
+
+    # NOTE: These shadow the properties of `Composer`, which look them up on a `YAML` instance
+    parser: Any = None
+    resolver: Any = None
+
+    def __init__(self, parser: Any, resolver: Any, max_depth: int | None) -> None:
+        super().__init__(loader=SimpleNamespace(max_depth=max_depth))
+        self.parser = parser
+        self.resolver = resolver
+        self.plain: dict[int, ScalarNode] | None = None
+        """If not None, scalar nodes that are resolved implicitly are collected here (by id)."""
+
+    def compose_scalar_node(self, anchor: Any) -> Any:
+        event = self.parser.peek_event()
+        node = super().compose_scalar_node(anchor)
+        tag = _event_tag(event)
+        implicit = event.implicit[0] and (tag is None or str(tag) == "!")
+        if self.plain is not None and implicit:
+            self.plain[id(node)] = node
+        return node
+
+
+class EventLoader:
+    """Parser events of a single-document stream, with methods to construct nodes from them."""
+
+    def __init__(self, reader: YAML, stream: Any) -> None:
+        # Same setup as `YAML.load()`
+        if DocInfo is not None:
+            reader.doc_infos.append(DocInfo(requested_version=version(reader.version)))
+        reader.tags = {}
+        self.constructor, self.parser = reader.get_constructor_parser(stream)
+        # The C loader is its own parser, resolver and constructor
+        resolver = self.parser if self.parser is self.constructor else reader.resolver
+        self.composer = _NodeComposer(self.parser, resolver, getattr(reader, "max_depth", None))
+        self._anchored_plain: dict[int, ScalarNode] = {}
+        """Implicitly resolved scalars of anchored nodes that were skipped, see `skip()`."""
+
+    def check(self, *event_types: type) -> bool:
+        """Check whether the next event is of one of the types."""
+        return self.parser.check_event(*event_types)
+
+    def peek(self) -> Any:
+        """Get the next event, without consuming it."""
+        return self.parser.peek_event()
+
+    def get(self) -> Any:
+        """Consume the next event."""
+        return self.parser.get_event()
+
+    def start_document(self) -> bool:
+        """Consume the start of the stream and document; returns False if the stream is empty."""
+        self.get()  # stream start
+        if self.check(StreamEndEvent):
+            return False
+        self.get()  # document start
+        return True
+
+    def end_document(self) -> None:
+        """Consume the end of the document and stream, ensuring there are no other documents."""
+        self.get()  # document end
+        if not self.check(StreamEndEvent):
+            event = self.get()
+            raise ComposerError(
+                "expected a single document in the stream",
+                None,
+                "but found another document",
+                event.start_mark,
+            )
+        self.get()
+
+    def start_collection(self, parent: Node | None = None, index: Any = None) -> Node:
+        """Consume the start of a sequence or mapping, returning its node (without any children).
+
+        The node is only used as the parent of its children, e.g. for the resolver.
+        """
+        resolver = self.composer.resolver
+        resolver.descend_resolver(parent, index)
+        event = self.get()
+        node_type = SequenceNode if isinstance(event, SequenceStartEvent) else MappingNode
+        tag = _event_tag(event)
+        if tag is None or str(tag) == "!":
+            tag = resolver.resolve(node_type, None, event.implicit)
+        return node_type(tag, [], event.start_mark, None, flow_style=event.flow_style)
+
+    def end_collection(self) -> None:
+        """Consume the end of a sequence or mapping started with `start_collection()`."""
+        self.get()
+        self.composer.resolver.ascend_resolver()
+
+    def skip(self, parent: Node | None, index: Any) -> None:
+        """Consume the next node without composing it.
+
+        Anchored nodes are composed anyway, as they may be referenced by aliases later on.
+        With a `SchemaResolver`, their plain scalars are collected, to be resolved again
+        by the schema of the position they are used at (see `construct()`).
+        """
+        if self.check(AliasEvent):
+            self.get()
+            return
+        if self.peek().anchor is not None:
+            if isinstance(self.composer.resolver, SchemaResolver):
+                self.composer.plain = self._anchored_plain
+            try:
+                self.composer.compose_node(parent, index)
+            finally:
+                self.composer.plain = None
+            return
+        if self.check(ScalarEvent):
+            self.get()
+            return
+        is_mapping = self.check(MappingStartEvent)
+        end_type = MappingEndEvent if is_mapping else SequenceEndEvent
+        node = self.start_collection(parent, index)
+        i = 0
+        while not self.check(end_type):
+            if is_mapping:
+                self.skip(node, None)  # key
+            self.skip(node, i)
+            i += 1
+        self.end_collection()
+
+    def construct_at(self, keys: Sequence[Any]) -> Any:
+        """Construct only the node at the key path of the document, skipping everything else.
+
+        The rest of the document (after the node) isn't read.
+        """
+        parent: Node | None = None
+        index: Any = None
+        depth = 0
+        try:
+            for i, key in enumerate(keys):
+                if self.check(MappingStartEvent):
+                    node = self.start_collection(parent, index)
+                    depth += 1
+                    merges: list[tuple[Node, Node]] = []
+                    while not self.check(MappingEndEvent):
+                        key_node = self.composer.compose_node(node, None)
+                        if key_node.tag == _MERGE_TAG:
+                            merges.append((key_node, self.composer.compose_node(node, key_node)))
+                            continue
+                        if _key_matches(self.constructor.construct_document(key_node), key):
+                            break
+                        self.skip(node, key_node)
+                    else:
+                        # Not an explicit key, but it may be merged into the mapping
+                        node.value = merges
+                        if self._resolves_used():
+                            schema = self.composer.resolver.current_schema
+                            resolve_used_nodes(node, schema, self._anchored_plain)
+                        merged = self.constructor.construct_document(node)
+                        return lookup_key_path(merged, keys[i:], prefix=keys[:i])
+                    parent, index = node, key_node
+                elif self.check(SequenceStartEvent):
+                    if not isinstance(key, int) or isinstance(key, bool) or key < 0:
+                        raise _not_found(keys, key)
+                    node = self.start_collection(parent, index)
+                    depth += 1
+                    for j in range(key):
+                        if self.check(SequenceEndEvent):
+                            break
+                        self.skip(node, j)
+                    if self.check(SequenceEndEvent):
+                        raise _not_found(keys, key)
+                    parent, index = node, key
+                else:
+                    # Scalars can't be indexed, but aliases can
+                    value = self.construct(parent, index)
+                    return lookup_key_path(value, keys[i:], prefix=keys[:i])
+            return self.construct(parent, index)
+        finally:
+            for _ in range(depth):
+                self.composer.resolver.ascend_resolver()
+
+    def construct(self, parent: Node | None, index: Any) -> Any:
+        """Compose the next node (a child of `parent`) and construct it into Python objects."""
+        if not self._resolves_used():
+            node = self.composer.compose_node(parent, index)
+        else:
+            schema = self.composer.resolver.schema_at(parent, index)
+            node = self.composer.compose_node(parent, index)
+            resolve_used_nodes(node, schema, self._anchored_plain)
+        return self.constructor.construct_document(node)
+
+    def _resolves_used(self) -> bool:
+        """Whether skipped anchored nodes have to be resolved where they are used, see `skip()`."""
+        return bool(self._anchored_plain) and isinstance(self.composer.resolver, SchemaResolver)
+
+
+def _key_matches(value: Any, key: Any) -> bool:
+    """Check whether a constructed mapping key is the key of the path."""
+    try:
+        return type(value) is type(key) and value == key
+    except Exception:
+        return False
+
+
+@contextmanager
+def event_loader(reader: YAML, stream: Any) -> Iterator[EventLoader]:
+    """Load a stream with the reader event by event, cleaning up the reader afterwards."""
+    loader = EventLoader(reader, stream)
+    try:
+        yield loader
+    finally:
+        # Same cleanup as `YAML.load()`
+        loader.parser.dispose()
+        for comp in ("reader", "scanner"):
+            try:
+                getattr(getattr(reader, "_" + comp), f"reset_{comp}")()
+            except AttributeError:
+                pass
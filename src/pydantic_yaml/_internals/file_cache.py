@@ -0,0 +1,199 @@
+"""Opt-in cache of parsed YAML files, invalidated when the files change."""
+
+__all__ = ["FileCacheInfo", "ParsedFileCache"]
+
+import hashlib
+import os
+from collections import OrderedDict
+from copy import copy as shallow_copy
+from copy import deepcopy
+from pathlib import Path
+from threading import Lock
+from typing import Any, Literal, NamedTuple, TypeVar
+
+from .engines import YamlEngine
+from .v2 import parse_yaml_file_as, parse_yaml_raw_as
+
+T = TypeVar("T")
+
+CopyOptions = Literal["none", "shallow", "deep"]
+
+
+class FileCacheInfo(NamedTuple):
+    """Statistics of a `ParsedFileCache`."""
+
+    hits: int
+    misses: int
+    max_entries: int
+    max_bytes: int | None
+    currsize: int
+    """Number of cached files."""
+    currbytes: int
+    """Total size of the cached files (on disk)."""
+
+
+class _Entry(NamedTuple):
+    signature: tuple[int, ...] | bytes
+    """Either the `stat` signature of the file, or the hash of its contents."""
+    nbytes: int
+    value: Any
+
+
+class ParsedFileCache:
+    """Cache of parsed (and validated) YAML files, keyed by resolved path and model type.
+
+    A cached value is reused as long as the file's modification time, size and inode
+    are unchanged, or (with `hash_content=True`) as long as its contents are unchanged.
+
+    Parameters
+    ----------
+    max_entries : int
+        Maximum number of cached files; least recently used ones are evicted.
+    max_bytes : None or int
+        Maximum total size of the cached files (as measured on disk), if any.
+        Files larger than this are never cached.
+    hash_content : bool
+        If True, files are read and hashed on every call, and their contents decide
+        whether the cached value is reused. This skips parsing and validation only, but also
+        detects changes that keep the modification time (e.g. on coarse-grained file systems).
+    copy : "none" or "shallow" or "deep"
+        What to return on a hit. "none" returns the shared, cached instance, which must not be
+        modified (consider using frozen models). "shallow" returns a cheap copy, i.e. with
+        the same field values; "deep" copies the whole structure.
+
+    Examples
+    --------
+    ```python
+    configs = ParsedFileCache(max_entries=32)
+
+    def handle_request():
+        cfg = configs.parse_yaml_file_as(Config, "config.yaml")  # only re-parsed when changed
+        ...
+    ```
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 128,
+        max_bytes: int | None = None,
+        hash_content: bool = False,
+        copy: CopyOptions = "none",
+    ) -> None:
+        if copy not in ("none", "shallow", "deep"):
+            raise ValueError(f"Expected copy to be 'none', 'shallow' or 'deep', got {copy!r}")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hash_content = hash_content
+        self.copy = copy
+        self._hits = 0
+        self._misses = 0
+        self._nbytes = 0
+        self._data: OrderedDict[tuple[str, Any, str], _Entry] = OrderedDict()
+        self._lock = Lock()
+
+    def parse_yaml_file_as(
+        self,
+        model_type: type[T],
+        file: Path | str,
+        *,
+        engine: YamlEngine | None = None,
+    ) -> T:
+        """Parse YAML file as the passed model type, reusing the cached result if it's up to date.
+
+        Parameters
+        ----------
+        model_type : Type[BaseModel]
+            The resulting model type.
+        file : Path or str
+            The file path to read from.
+        engine : None or "auto" or "c" or "pure"
+            The YAML engine to use, see `parse_yaml_file_as()`.
+        """
+        if not isinstance(file, str | Path):
+            raise TypeError(f"Expected Path or str, but got {file!r}")
+        path = Path(file).resolve()
+        try:
+            key = (str(path), model_type, repr(model_type))
+            hash(key)
+        except TypeError:  # unhashable type
+            with self._lock:
+                self._misses += 1
+            return parse_yaml_file_as(model_type, path, engine=engine)
+
+        data: bytes | None = None
+        signature: tuple[int, ...] | bytes
+        if self.hash_content:
+            data = path.read_bytes()
+            signature = hashlib.blake2b(data, digest_size=16).digest()
+            nbytes = len(data)
+        else:
+            # NOTE: Taken before reading, so a concurrent change is detected on the next call
+            st = os.stat(path)
+            signature = (st.st_mtime_ns, st.st_size, st.st_ino, st.st_dev)
+            nbytes = st.st_size
+
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry.signature == signature:
+                self._data.move_to_end(key)
+                self._hits += 1
+                return self._copy(entry.value)
+            self._misses += 1
+
+        if data is None:
+            value = parse_yaml_file_as(model_type, path, engine=engine)
+        else:
+            value = parse_yaml_raw_as(model_type, data, engine=engine)
+        self._store(key, _Entry(signature, nbytes, value))
+        return self._copy(value)
+
+    def _copy(self, value: T) -> T:
+        if self.copy == "shallow":
+            return shallow_copy(value)
+        elif self.copy == "deep":
+            return deepcopy(value)
+        return value
+
+    def _store(self, key: tuple[str, Any, str], entry: _Entry) -> None:
+        """Add (or replace) the entry, evicting the least recently used ones if required."""
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._nbytes -= old.nbytes
+            if self.max_bytes is not None and entry.nbytes > self.max_bytes:
+                return  # would evict everything else
+            self._data[key] = entry
+            self._nbytes += entry.nbytes
+            while len(self._data) > self.max_entries or (
+                self.max_bytes is not None and self._nbytes > self.max_bytes
+            ):
+                _, evicted = self._data.popitem(last=False)
+                self._nbytes -= evicted.nbytes
+
+    def invalidate(self, file: Path | str) -> None:
+        """Remove all cached values of the file (for any model type)."""
+        path = str(Path(file).resolve())
+        with self._lock:
+            for key in [k for k in self._data if k[0] == path]:
+                self._nbytes -= self._data.pop(key).nbytes
+
+    def clear(self) -> None:
+        """Remove all cached values and reset statistics."""
+        with self._lock:
+            self._data.clear()
+            self._nbytes = 0
+            self._hits = 0
+            self._misses = 0
+
+    def info(self) -> FileCacheInfo:
+        """Get cache statistics."""
+        with self._lock:
+            return FileCacheInfo(
+                self._hits,
+                self._misses,
+                self.max_entries,
+                self.max_bytes,
+                len(self._data),
+                self._nbytes,
+            )
@@ -0,0 +1,191 @@
+"""Phase-level instrumentation of loading and dumping.
+
+Registered hooks receive a `PhaseEvent` for each completed phase of a call, e.g. reading,
+parsing and validating for `parse_yaml_file_as()`, or serializing, commenting and emitting
+for `to_yaml_str()`. With no hooks registered, calls only check for them once.
+"""
+
+__all__ = [
+    "PhaseEvent",
+    "PhaseHook",
+    "add_phase_hook",
+    "record_phases",
+    "remove_phase_hook",
+]
+
+import threading
+import warnings
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from io import IOBase
+from time import perf_counter
+from typing import Any, Literal, NamedTuple
+
+Operation = Literal["load", "dump"]
+Phase = Literal["read", "parse", "adapter", "validate", "serialize", "comment", "emit"]
+
+
+class PhaseEvent(NamedTuple):
+    """A completed phase of a load or dump call."""
+
+    operation: Operation
+    """Either "load" or "dump"."""
+    phase: Phase
+    """For loading: "read" (I/O of streams and files), "parse" (YAML or JSON), "adapter"
+    (getting the `TypeAdapter`) and "validate". For dumping: "serialize" (`model_dump()`),
+    "comment" (adding comments) and "emit" (YAML or JSON output)."""
+    model_type: Any
+    """The type that is loaded, or the type of the dumped model."""
+    seconds: float
+    """Wall time of the phase."""
+    nbytes: int | None = None
+    """Size of the input or output, in bytes (or characters, for `str` and text streams)."""
+    documents: int | None = None
+    """Number of YAML documents parsed or emitted."""
+    nodes: int | None = None
+    """Number of nodes (mappings, sequences and scalars) parsed or serialized."""
+    detail: str | None = None
+    """Extra information, e.g. "json" if the JSON fast path was used, or the YAML engine."""
+
+
+PhaseHook = Callable[[PhaseEvent], None]
+
+_hooks: tuple[PhaseHook, ...] = ()
+_hooks_lock = threading.Lock()
+
+
+def add_phase_hook(hook: PhaseHook) -> None:
+    """Register a function that is called with a `PhaseEvent` after each phase of a call.
+
+    Hooks are global (i.e. called for calls in all threads) and run synchronously,
+    so they should be fast. Exceptions raised by hooks are turned into warnings.
+    """
+    global _hooks
+    with _hooks_lock:
+        _hooks = (*_hooks, hook)
+
+
+def remove_phase_hook(hook: PhaseHook) -> None:
+    """Unregister a function added with `add_phase_hook()`."""
+    global _hooks
+    with _hooks_lock:
+        hooks = list(_hooks)
+        hooks.remove(hook)
+        _hooks = tuple(hooks)
+
+
+@contextmanager
+def record_phases() -> Iterator[list[PhaseEvent]]:
+    """Record the phase events of all calls (in any thread) within the context.
+
+    Examples
+    --------
+    ```python
+    with record_phases() as events:
+        cfg = parse_yaml_file_as(Config, "config.yaml")
+    for ev in events:
+        print(f"{ev.phase}: {ev.seconds * 1e3:.2f} ms")
+    ```
+    """
+    events: list[PhaseEvent] = []
+    add_phase_hook(events.append)
+    try:
+        yield events
+    finally:
+        remove_phase_hook(events.append)
+
+
+class PhaseRecorder:
+    """Times consecutive phases of a single call, and reports them to the hooks."""
+
+    __slots__ = ("_hooks", "_last", "model_type", "operation")
+
+    def __init__(self, operation: Operation, model_type: Any, hooks: tuple[PhaseHook, ...]) -> None:
+        self.operation = operation
+        self.model_type = model_type
+        self._hooks = hooks
+        self._last = perf_counter()
+
+    def mark(self) -> None:
+        """Start timing the next phase now (i.e. exclude the time since the last phase)."""
+        self._last = perf_counter()
+
+    def end(self, phase: Phase, *, exclude: float = 0.0, **info: Any) -> None:
+        """End the current phase, reporting the time since the last one (minus `exclude`)."""
+        now = perf_counter()
+        self.emit(phase, now - self._last - exclude, **info)
+        self._last = now
+
+    def emit(self, phase: Phase, seconds: float, **info: Any) -> None:
+        """Report a phase with the given duration."""
+        event = PhaseEvent(self.operation, phase, self.model_type, seconds, **info)
+        for hook in self._hooks:
+            try:
+                hook(event)
+            except Exception as e:
+                warnings.warn(f"Phase hook {hook!r} failed: {e!r}", category=RuntimeWarning)
+
+
+def phase_recorder(operation: Operation, model_type: Any) -> PhaseRecorder | None:
+    """Get a recorder for a call, or None if no hooks are registered."""
+    hooks = _hooks
+    if not hooks:
+        return None
+    return PhaseRecorder(operation, model_type, hooks)
+
+
+class CountingReader(IOBase):
+    """Wraps a readable stream, counting the bytes (or characters) read and the time spent."""
+
+    def __init__(self, stream: IOBase) -> None:
+        self._stream = stream
+        self.name = getattr(stream, "name", None)
+        self.nbytes = 0
+        self.seconds = 0.0
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> Any:
+        t0 = perf_counter()
+        data = self._stream.read(size)
+        self.seconds += perf_counter() - t0
+        self.nbytes += len(data)
+        return data
+
+
+def stream_position(stream: IOBase) -> int | None:
+    """Get the position of the stream, if it's known."""
+    try:
+        return stream.tell()
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def engine_name(cls: type) -> str:
+    """Get the engine ("c" or "pure") of a parser or emitter class."""
+    return "c" if cls.__name__ in ("CParser", "CEmitter") else "pure"
+
+
+def count_nodes(obj: Any) -> int:
+    """Count the nodes of a loaded (or dumped) structure of dicts, lists and scalars.
+
+    Containers that are shared (e.g. by YAML aliases) are counted and walked once,
+    so recursive structures terminate and aliases don't multiply the work.
+    """
+    count = 0
+    seen: set[int] = set()
+    stack = [obj]
+    while stack:
+        val = stack.pop()
+        if isinstance(val, dict | list | tuple):
+            if id(val) in seen:
+                continue
+            seen.add(id(val))
+            if isinstance(val, dict):
+                stack.extend(val.keys())
+                stack.extend(val.values())
+            else:
+                stack.extend(val)
+        count += 1
+    return count
@@ -0,0 +1,114 @@
+"""Fast path for YAML input that is also (plain) JSON.
+
+YAML 1.2 is almost a superset of JSON, and parsing JSON with the standard library is orders of
+magnitude faster than parsing YAML. If the input is JSON that the YAML loader would read the same
+way, we use `json.loads()` instead. Anything else (including JSON that the YAML loader treats
+differently, or rejects) falls back to the YAML loader, so results and errors are identical.
+"""
+
+__all__ = ["NOT_JSON", "is_yaml_compatible_json", "load_json_subset"]
+
+import json
+import re
+from typing import Any
+
+NOT_JSON: Any = object()
+"""Sentinel returned when the input can't be loaded as JSON with the same result as YAML."""
+
+MAX_KEY_LENGTH = 160
+"""Longer keys may exceed the 1024-character limit of YAML implicit keys (e.g. with escapes)."""
+
+# Characters that YAML doesn't allow, or treats as line breaks
+_YAML_CHARS = r"[^\x09\x0A\x0D\x20-\x7E\xA0-\u2027\u202A-\uD7FF\uE000-\uFFFD\U00010000-\U0010FFFF]"
+_YAML_DIFFERENT = re.compile(
+    _YAML_CHARS
+    # Escaped surrogates, which JSON combines but YAML doesn't
+    + r"|\\u[dD][89a-fA-F]"
+    # Keys that aren't on the same line as (or are too far from) the colon
+    + r'|"\s*[\r\n]\s*:|"[ \t]{16,}:'
+)
+_YAML_DIFFERENT_CHARS = re.compile(_YAML_CHARS)
+# Quoted keys that may be too long (without escaped quotes, which are checked in full)
+_LONG_KEY = re.compile(rf'"[^"]{{{MAX_KEY_LENGTH + 1},}}"\s*:')
+
+
+class _Mismatch(Exception):
+    """The YAML loader would give a different result (or an error) for the JSON."""
+
+
+def _pairs_hook(pairs: list[tuple[str, Any]]) -> dict[str, Any]:
+    res = dict(pairs)
+    if len(res) != len(pairs):
+        raise _Mismatch("Duplicate keys are an error in YAML.")
+    if any(len(k) > MAX_KEY_LENGTH for k in res):
+        raise _Mismatch("Long keys may be an error in YAML.")
+    return res
+
+
+def _parse_constant(name: str) -> Any:
+    raise _Mismatch(f"{name} is a string in YAML.")
+
+
+_SPACES = frozenset(" \r\n")  # YAML doesn't allow tabs around the top-level node
+_BYTE_SPACES = frozenset(b" \r\n")
+_OPENING = (frozenset("[{"), frozenset(b"[{"))
+_CLOSING = (frozenset("]}"), frozenset(b"]}"))
+
+
+def _looks_like_json(raw: str | bytes) -> bool:
+    """Check whether the first and last non-space characters of the input open and close a collection.
+
+    This looks at the input in place, so other (e.g. huge YAML) inputs aren't copied or decoded.
+    """
+    is_bytes = isinstance(raw, bytes)
+    spaces = _BYTE_SPACES if is_bytes else _SPACES
+    start, end = 0, len(raw)
+    while start < end and raw[start] in spaces:
+        start += 1
+    while end > start and raw[end - 1] in spaces:
+        end -= 1
+    return start < end and raw[start] in _OPENING[is_bytes] and raw[end - 1] in _CLOSING[is_bytes]
+
+
+def load_json_subset(raw: str | bytes) -> Any:
+    """Load the input as JSON, if that's equivalent to loading it as YAML.
+
+    Only objects and arrays are considered (possibly surrounded by spaces and line breaks).
+    Returns `NOT_JSON` otherwise, in which case the input should be loaded as YAML.
+    """
+    if not _looks_like_json(raw):  # NOTE: This also rejects a BOM
+        return NOT_JSON
+    if isinstance(raw, bytes):
+        try:
+            raw = raw.decode("utf-8")
+        except UnicodeDecodeError:
+            return NOT_JSON
+    if _YAML_DIFFERENT.search(raw) is not None:
+        return NOT_JSON
+    try:
+        return json.loads(raw, object_pairs_hook=_pairs_hook, parse_constant=_parse_constant)
+    except (ValueError, _Mismatch, RecursionError):
+        return NOT_JSON
+
+
+def is_yaml_compatible_json(text: str) -> bool:
+    """Check whether JSON written by Pydantic is read back the same way by the YAML loader.
+
+    Unlike `load_json_subset()`, this mostly doesn't parse the text: Pydantic writes valid JSON
+    without duplicate keys, and with each key on the same line as its colon. The remaining
+    differences are found by substring checks, and a scan of non-ASCII text for characters
+    that YAML doesn't allow. Only text with `Infinity`, `NaN` or escaped quotes is loaded in full.
+    Some texts that `load_json_subset()` accepts may be rejected (e.g. with escaped surrogates).
+    """
+    if text[:1] not in ("[", "{"):
+        return False
+    if not text.isascii() and _YAML_DIFFERENT_CHARS.search(text) is not None:
+        return False
+    if "\x7f" in text:
+        return False
+    escaped = "\\" in text  # cheap; most text has no escapes at all
+    if escaped and ("\\ud" in text or "\\uD" in text):
+        return False
+    if "Infinity" in text or "NaN" in text or (escaped and '\\"' in text):
+        return load_json_subset(text) is not NOT_JSON  # may be inside strings
+    return _LONG_KEY.search(text) is None
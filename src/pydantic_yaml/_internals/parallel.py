@@ -0,0 +1,254 @@
+"""Parsing one large multi-document YAML file in parallel, split into chunks of whole documents.
+
+A line starting with a `---` marker (followed by a space, a tab or a line break) always starts
+a new document: inside block scalars, content lines are indented, and both the quoted and
+plain scalars of the YAML scanners end at (or fail on) a document marker in the first column.
+So the file can be split before such lines into byte ranges that each hold whole documents,
+and parsed as separate streams.
+
+Chunking is unsafe if a document marker can't be found on the raw bytes (for UTF-16 files),
+or if the result of a document depends on the documents before it: directives (`%YAML`, `%TAG`)
+can stay in effect for the documents that follow. These files are parsed serially instead.
+"""
+
+__all__ = ["document_ranges", "parse_yaml_stream_parallel_as"]
+
+import codecs
+import mmap
+import os
+import re
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Executor, Future
+from pathlib import Path
+from typing import Any, NamedTuple, TypeVar
+
+from pydantic import ValidationError
+from ruamel.yaml.error import FileMark, MarkedYAMLError, YAMLError
+
+from .batch import ExecutorOptions, _get_executor
+from .buffers import BufferStream, BytesLike
+from .engines import YamlEngine, get_default_engine
+from .streaming import DocumentError, OnErrorOptions, _iter_validated
+
+T = TypeVar("T")
+
+_DOCUMENT_START = re.compile(rb"^---(?=[ \t\r\n]|\Z)", re.MULTILINE)
+_DIRECTIVE = re.compile(rb"^%", re.MULTILINE)
+_WIDE_BOMS = (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)
+_POSITION_STEP = 1 << 20
+_CONTINUATION_BYTES = [bytes([b]) for b in range(0x80, 0xC0)]
+
+
+def _can_split(buffer: BytesLike) -> bool:
+    """Check whether the documents of the (UTF-8) YAML stream can be parsed separately."""
+    head = bytes(buffer[:4])
+    if head.startswith(_WIDE_BOMS) or b"\x00" in head:
+        return False
+    return _DIRECTIVE.search(buffer) is None  # type: ignore[call-overload]
+
+
+def document_ranges(buffer: BytesLike, chunk_size: int) -> Iterator[tuple[int, int]]:
+    """Split a YAML stream into byte ranges of whole documents, of at least `chunk_size` bytes.
+
+    Ranges are found lazily, so only the bytes up to the next boundary are scanned.
+    The last range may be shorter; a stream without document markers is a single range.
+    """
+    size = len(buffer)
+    start = 0
+    while start < size:
+        match = _DOCUMENT_START.search(buffer, start + chunk_size)  # type: ignore[call-overload]
+        end = size if match is None else match.start()
+        yield start, end
+        start = end
+
+
+def _position(buffer: BytesLike, offset: int) -> tuple[int, int]:
+    """Get the line number and character index at the byte offset of the UTF-8 buffer."""
+    line = index = 0
+    for pos in range(0, offset, _POSITION_STEP):
+        piece = bytes(buffer[pos : min(pos + _POSITION_STEP, offset)])
+        line += piece.count(b"\n")
+        index += len(piece) - sum(piece.count(b) for b in _CONTINUATION_BYTES)
+    return line, index
+
+
+def _shift_marks(error: MarkedYAMLError, buffer: BytesLike, offset: int, name: str) -> None:
+    """Make the marks of an error in a range relative to the start of the file."""
+    line, index = _position(buffer, offset)
+    # NOTE: Marks of the C engine are read-only (and can't be pickled), so they are replaced
+    for attr in ("context_mark", "problem_mark"):
+        mark = getattr(error, attr, None)
+        if mark is not None:
+            new_mark = FileMark(name, mark.index + index, mark.line + line, mark.column)
+            setattr(error, attr, new_mark)
+
+
+class _RangeResult(NamedTuple):
+    """Documents of a byte range, sent back from the worker."""
+
+    values: list[Any]
+    """Validated documents, in order."""
+    errors: list[DocumentError]
+    """Validation errors of skipped documents, with indexes relative to the range."""
+    failure: Exception | None
+    """Error that stopped parsing the range, raised after its values."""
+
+
+def _parse_range(
+    model_type: type[T], path: Path, start: int, end: int, on_error: OnErrorOptions, engine: YamlEngine
+) -> _RangeResult:
+    """Parse and validate the documents in a byte range of the file (runs in the worker)."""
+    values: list[Any] = []
+    errors: list[DocumentError] = []
+    with path.open(mode="rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        stream = BufferStream(memoryview(mm)[start:end])
+        try:
+            for value in _iter_validated(
+                model_type, stream, on_error=on_error, errors=errors, engine=engine
+            ):
+                values.append(value)
+        except ValidationError as e:
+            return _RangeResult(values, errors, e)
+        except MarkedYAMLError as e:
+            _shift_marks(e, mm, start, str(path))
+            return _RangeResult(values, errors, e)
+        except YAMLError as e:
+            return _RangeResult(values, errors, e)
+        finally:
+            stream.close()  # releases the view before the map is closed
+    return _RangeResult(values, errors, None)
+
+
+def _iter_parallel(
+    model_type: type[T],
+    path: Path,
+    *,
+    executor: ExecutorOptions | Executor,
+    max_workers: int | None,
+    chunk_size: int,
+    on_error: OnErrorOptions,
+    errors: list[DocumentError] | None,
+    engine: YamlEngine,
+) -> Iterator[T]:
+    """Parse the ranges of the file on the executor, yielding the models in order."""
+    with path.open(mode="rb") as f:
+        if os.fstat(f.fileno()).st_size <= chunk_size:
+            split = False  # a single range, incl. empty files (which can't be mapped)
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                split = _can_split(mm) and _DOCUMENT_START.search(mm, chunk_size) is not None
+    if not split:
+        yield from _iter_validated(model_type, path, on_error=on_error, errors=errors, engine=engine)
+        return
+
+    pool, owned = _get_executor(executor, max_workers)
+    # Only a few ranges are in flight, so results are buffered for a bounded part of the file
+    window = 2 * (max_workers or os.cpu_count() or 1)
+    futures: deque[Future[_RangeResult]] = deque()
+    try:
+        with path.open(mode="rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            ranges = document_ranges(mm, chunk_size)
+            offset = 0
+            while True:
+                for start, end in ranges:
+                    fut = pool.submit(_parse_range, model_type, path, start, end, on_error, engine)
+                    futures.append(fut)
+                    if len(futures) >= window:
+                        break
+                if not futures:
+                    break
+                res = futures.popleft().result()
+                yield from res.values
+                if errors is not None:
+                    for err in res.errors:
+                        errors.append(DocumentError(offset + err.document_index, err.error))
+                if res.failure is not None:
+                    raise res.failure
+                offset += len(res.values) + len(res.errors)
+    finally:
+        # Don't do any more work if the caller stopped iterating early
+        for fut in futures:
+            fut.cancel()
+        if owned:
+            pool.shutdown(wait=True)
+
+
+def parse_yaml_stream_parallel_as(
+    model_type: type[T],
+    file: Path | str,
+    *,
+    executor: ExecutorOptions | Executor = "process",
+    max_workers: int | None = None,
+    chunk_size: int = 1 << 22,
+    on_error: OnErrorOptions = "raise",
+    errors: list[DocumentError] | None = None,
+    engine: YamlEngine | None = None,
+) -> Iterator[T]:
+    """Parse a large multi-document YAML file on several processes, yielding the models in order.
+
+    The file is split before document markers (`---`) into byte ranges of whole documents,
+    which are parsed and validated in parallel. This gives the same models as
+    `parse_yaml_stream_as()`, but isn't bound to a single core.
+
+    Files that can't be split safely are parsed serially (on the calling thread): files with
+    directives (e.g. `%YAML 1.1`), which can apply to the documents after them,
+    UTF-16 files, and files no larger than `chunk_size`.
+
+    Parameters
+    ----------
+    model_type : Type[BaseModel]
+        The type of each document.
+    file : Path or str
+        Path to the file.
+    executor : "process" or "thread" or Executor
+        Run on a new process pool (the default), a new thread pool, or the given executor
+        (which isn't shut down). `model_type` and the models must be picklable
+        for process pools, i.e. the model must be importable from a module.
+    max_workers : None or int
+        Maximum number of workers for a new pool. None uses the `concurrent.futures` default.
+    chunk_size : int
+        Minimum size of a range in bytes; a range ends at the first document marker after it.
+        Larger ranges have less overhead, smaller ones spread the work more evenly.
+    on_error : "raise" or "skip"
+        What to do with documents that fail validation: raise the `ValidationError`,
+        or skip them. YAML syntax errors are always raised.
+    errors : None or list of DocumentError
+        If given, errors of skipped documents are appended to this list.
+    engine : None or "auto" or "c" or "pure"
+        The YAML engine to use: "c" for the libyaml-based parser, "pure" for the pure-Python
+        one, or "auto" to use the C one if available. None uses the global default,
+        see `set_default_engine()`.
+
+    Notes
+    -----
+    Models are yielded as soon as all the ranges before them are done, and only a few ranges
+    per worker are in flight, so memory use is bounded for files of any size. Errors are raised
+    after the models of the documents before them. Ranges are submitted on the first iteration;
+    pending work is cancelled if the iterator is closed early.
+
+    Examples
+    --------
+    ```python
+    for event in parse_yaml_stream_parallel_as(Event, Path("events.yaml"), max_workers=8):
+        ...
+    ```
+    """
+    if on_error not in ("raise", "skip"):
+        raise ValueError(f"Expected on_error to be 'raise' or 'skip', got {on_error!r}")
+    if not isinstance(executor, Executor) and executor not in ("thread", "process"):
+        raise ValueError(f"Expected executor to be 'thread', 'process' or an Executor, got {executor!r}")
+    if chunk_size < 1:
+        raise ValueError(f"Expected a positive chunk_size, got {chunk_size!r}")
+    # Pass the engine explicitly, as worker processes don't share our default
+    engine = get_default_engine() if engine is None else engine
+    return _iter_parallel(
+        model_type,
+        Path(file).resolve(),
+        executor=executor,
+        max_workers=max_workers,
+        chunk_size=chunk_size,
+        on_error=on_error,
+        errors=errors,
+        engine=engine,
+    )
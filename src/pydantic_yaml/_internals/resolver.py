@@ -0,0 +1,282 @@
+"""Schema-aware resolution of plain YAML scalars.
+
+The YAML resolver matches every plain scalar against the implicit type patterns (int, float,
+bool, null, timestamp) before Pydantic validates it again against the declared type.
+Where the target type expects a string, this is wasted work, and it can even turn strings
+into other types (e.g. `NO` into `False` with YAML 1.1, or `1.10` into `1.1`).
+
+Here, a tree of the scalar "modes" is derived from the target type, and the resolver follows it
+while the document is composed (using its `descend_resolver()` and `ascend_resolver()` hooks).
+Plain scalars at positions typed as `str` are resolved as strings directly; everything else
+(e.g. unions, fields with validators, extra fields) is resolved as usual.
+"""
+
+__all__ = ["SchemaResolver", "key_path_schema", "resolve_used_nodes", "scalar_schema", "schema_scope"]
+
+import threading
+from collections.abc import Iterator, Mapping, Sequence, Set
+from contextlib import contextmanager
+from functools import lru_cache
+from types import NoneType, UnionType
+from typing import Annotated, Any, Literal, Union, get_args, get_origin
+
+from pydantic import BaseModel, BeforeValidator, PlainValidator, RootModel, WrapValidator
+from ruamel.yaml.nodes import MappingNode, ScalarNode, SequenceNode
+from ruamel.yaml.resolver import VersionedResolver
+
+from .aliases import _has_before_validators, _input_keys, _validated_fields
+
+try:
+    from ruamel.yaml.tag import Tag
+except ImportError:  # older ruamel.yaml versions use plain strings as tags
+    _NULL_TAG: Any = "tag:yaml.org,2002:null"
+    _STR_TAG: Any = "tag:yaml.org,2002:str"
+else:
+    _NULL_TAG = Tag(suffix="tag:yaml.org,2002:null")
+    _STR_TAG = Tag(suffix="tag:yaml.org,2002:str")
+_NULL_VALUES = frozenset(["", "~", "null", "Null", "NULL"])
+_MERGE_KEY = "<<"
+_MERGE_TAG = "tag:yaml.org,2002:merge"
+
+
+class _Schema:
+    """Scalar handling at a position of the document, and the positions of its children."""
+
+    __slots__ = ("fields", "items", "mode", "str_keys", "values")
+
+    def __init__(
+        self,
+        mode: Literal["str", "str-or-null", "key"] | None = None,
+        *,
+        fields: dict[str, "_Schema"] | None = None,
+        items: "_Schema | None" = None,
+        values: "_Schema | None" = None,
+        str_keys: bool = False,
+    ) -> None:
+        self.mode = mode
+        """How plain scalars are resolved here: as strings, strings or null, keys or (None) as usual."""
+        self.fields = fields
+        """Schemas of the values of a model, by input key."""
+        self.items = items
+        """Schema of the items of a sequence."""
+        self.values = values
+        """Schema of the values of a mapping (that isn't a model)."""
+        self.str_keys = str_keys
+        """Whether the keys of a mapping are strings."""
+
+    def child(self, node: Any, index: Any) -> "_Schema | None":
+        """Get the schema of a child of the node (with the index passed to `descend_resolver()`)."""
+        if isinstance(node, MappingNode):
+            if index is None:  # the key itself
+                return _KEY if self.str_keys else None
+            if self.fields is not None:
+                return self.fields.get(index.value) if isinstance(index, ScalarNode) else None
+            return self.values
+        elif isinstance(node, SequenceNode):
+            return self.items
+        return None
+
+
+_STR = _Schema("str")
+_STR_OR_NULL = _Schema("str-or-null")
+_KEY = _Schema("key")
+
+_VALIDATORS = (BeforeValidator, PlainValidator, WrapValidator)
+
+
+def _build(tp: Any, memo: dict[type, _Schema | None]) -> _Schema | None:
+    """Build the schema of the type, or None if its scalars are resolved as usual."""
+    origin = get_origin(tp)
+    args = get_args(tp)
+    if origin is Annotated:
+        if any(isinstance(meta, _VALIDATORS) for meta in args[1:]):
+            return None
+        return _build(args[0], memo)
+    elif origin in (Union, UnionType):
+        non_null = [arg for arg in args if arg is not NoneType]
+        if len(non_null) != 1:
+            return None
+        sub = _build(non_null[0], memo)
+        return _STR_OR_NULL if sub is _STR else sub
+    elif origin is Literal:
+        return _STR if args and all(isinstance(arg, str) for arg in args) else None
+    elif origin is tuple:
+        if len(args) != 2 or args[1] is not Ellipsis:
+            return None
+        items = _build(args[0], memo)
+        return None if items is None else _Schema(items=items)
+    elif isinstance(origin, type) and issubclass(origin, Mapping):
+        if len(args) != 2:
+            return None
+        values = _build(args[1], memo)
+        if values is None and args[0] is not str:
+            return None
+        return _Schema(values=values, str_keys=args[0] is str)
+    elif isinstance(origin, type) and issubclass(origin, Sequence | Set) and not issubclass(origin, str):
+        items = _build(args[0], memo) if len(args) == 1 else None
+        return None if items is None else _Schema(items=items)
+    elif origin is not None or not isinstance(tp, type):
+        return None
+    elif issubclass(tp, str):  # including `str` enums
+        return _STR
+    elif issubclass(tp, BaseModel) and tp is not BaseModel:
+        return _build_model(tp, memo)
+    return None
+
+
+def _build_model(cls: type[BaseModel], memo: dict[type, _Schema | None]) -> _Schema | None:
+    """Build the schema of a model class, with the schemas of its fields by input key."""
+    if cls in memo:
+        return memo[cls]  # recursive models refer to the same schema
+    if _has_before_validators(cls):
+        memo[cls] = None
+        return None
+    skipped = _validated_fields(cls)
+    if issubclass(cls, RootModel):
+        memo[cls] = None  # until it's built, for recursive root models
+        if "root" not in skipped:
+            memo[cls] = _build(cls.model_fields["root"].annotation, memo)
+        return memo[cls]
+    schema = memo[cls] = _Schema(fields={}, str_keys=True)
+    assert schema.fields is not None
+    for name, info in cls.model_fields.items():
+        keys = _input_keys(cls, name, info)
+        if name in skipped or keys is None:
+            continue
+        if any(isinstance(meta, _VALIDATORS) for meta in info.metadata):
+            continue
+        sub = _build(info.annotation, memo)
+        if sub is not None:
+            schema.fields.update(dict.fromkeys(keys, sub))
+    return schema
+
+
+@lru_cache(maxsize=256)
+def _cached_scalar_schema(model_type: Any) -> _Schema | None:
+    """Build the schema of a hashable type, once."""
+    return _build(model_type, {})
+
+
+def scalar_schema(model_type: Any) -> _Schema | None:
+    """Get the (cached) scalar schema of the type, or None if its scalars are all resolved as usual."""
+    try:
+        return _cached_scalar_schema(model_type)
+    except TypeError:  # unhashable type
+        return _build(model_type, {})
+
+
+def key_path_schema(schema: _Schema | None, keys: Sequence[Any]) -> _Schema | None:
+    """Get the schema of a document, where the schema applies to the node at the key path.
+
+    Keys on the path are resolved as usual, as they are matched by type.
+    """
+    if schema is None:
+        return None
+    for key in reversed(keys):
+        if isinstance(key, str):
+            schema = _Schema(fields={key: schema})
+        else:  # an index of a sequence, or a non-string key
+            schema = _Schema(items=schema, values=schema)
+    return schema
+
+
+_local = threading.local()
+
+
+@contextmanager
+def schema_scope(schema: _Schema | None) -> Iterator[None]:
+    """Use the schema for documents loaded by a `SchemaResolver` on this thread."""
+    previous = getattr(_local, "schema", None)
+    _local.schema = schema
+    try:
+        yield
+    finally:
+        _local.schema = previous
+
+
+class SchemaResolver(VersionedResolver):
+    """Resolver that resolves plain scalars as strings where the schema expects strings.
+
+    The schema is set with `schema_scope()`. Outside of it, this is a `VersionedResolver`.
+    The merge key (`<<`) is always resolved as usual.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._positions: list[_Schema | None] = []
+
+    def descend_resolver(self, current_node: Any, current_index: Any) -> None:
+        if current_node is None:  # root of a document
+            schema = getattr(_local, "schema", None)
+        else:
+            parent = self._positions[-1] if self._positions else None
+            schema = None if parent is None else parent.child(current_node, current_index)
+        self._positions.append(schema)
+
+    def ascend_resolver(self) -> None:
+        if self._positions:
+            self._positions.pop()
+
+    @property
+    def current_schema(self) -> _Schema | None:
+        """The schema of the current collection node (after `descend_resolver()`)."""
+        return self._positions[-1] if self._positions else None
+
+    def schema_at(self, parent: Any, index: Any) -> _Schema | None:
+        """Get the schema of the next child of `parent` (with the index of `descend_resolver()`)."""
+        if parent is None:
+            return getattr(_local, "schema", None)
+        schema = self._positions[-1] if self._positions else None
+        return None if schema is None else schema.child(parent, index)
+
+    def resolve(self, kind: Any, value: Any, implicit: Any) -> Any:
+        if kind is ScalarNode and implicit[0] and self._positions:
+            tag = _schema_tag(self._positions[-1], value)
+            if tag is not None:
+                return tag
+        return super().resolve(kind, value, implicit)
+
+
+def _schema_tag(schema: _Schema | None, value: str) -> Any:
+    """Get the tag of a plain scalar where the schema expects a string (None: resolve it as usual)."""
+    if schema is None or schema.mode is None:
+        return None
+    elif schema.mode == "str":
+        return _STR_TAG
+    elif schema.mode == "str-or-null":
+        return _NULL_TAG if value in _NULL_VALUES else _STR_TAG
+    elif value != _MERGE_KEY:  # "key"
+        return _STR_TAG
+    return None
+
+
+def resolve_used_nodes(node: Any, schema: _Schema | None, plain: dict[int, ScalarNode]) -> None:
+    """Resolve plain scalars of anchored nodes by the schema of the position they are used at.
+
+    Anchored nodes outside of a key path are composed without a schema, but they may be used
+    (as aliases or merged mappings) inside the node at the path. `plain` has the scalar nodes
+    that were resolved implicitly there; their tags are changed where the schema expects strings.
+    Merged mappings get the schema of the mapping they are merged into.
+    """
+    seen: set[tuple[int, int]] = set()
+    stack = [(node, schema)]
+    while stack:
+        node, schema = stack.pop()
+        if schema is None or (id(node), id(schema)) in seen:
+            continue
+        seen.add((id(node), id(schema)))
+        if isinstance(node, ScalarNode):
+            if id(node) in plain:
+                tag = _schema_tag(schema, node.value)
+                if tag is not None:
+                    node.tag = tag
+        elif isinstance(node, MappingNode):
+            for key_node, value_node in node.value:
+                if str(key_node.tag) == _MERGE_TAG:
+                    merged = value_node.value if isinstance(value_node, SequenceNode) else [value_node]
+                    stack.extend((sub, schema) for sub in merged)
+                else:
+                    stack.append((key_node, schema.child(node, None)))
+                    stack.append((value_node, schema.child(node, key_node)))
+        elif isinstance(node, SequenceNode):
+            stack.extend((item, schema.child(node, i)) for i, item in enumerate(node.value))
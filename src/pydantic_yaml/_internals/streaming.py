@@ -0,0 +1,429 @@
+"""Streaming of multi-document YAML (documents separated by `---`)."""
+
+__all__ = ["DocumentError", "parse_yaml_items_as", "parse_yaml_stream_as", "to_yaml_stream"]
+
+from collections.abc import Iterable, Iterator
+from contextlib import AbstractContextManager, nullcontext
+from functools import partial
+from io import IOBase
+from pathlib import Path
+from typing import Any, Literal, NamedTuple, TypeVar
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from ruamel.yaml import YAML
+from ruamel.yaml.events import SequenceEndEvent, SequenceStartEvent
+
+from .adapters import get_type_adapter
+from .aliases import share_repeated_subtrees
+from .buffers import BufferStream, BytesLike
+from .engines import YamlEngine, pooled_reader, pooled_writer
+from .events import event_loader
+from .v2 import (
+    CommentsOptions,
+    _as_stream,
+    _check_dump_options,
+    _commented_value,
+    _dump_json_compatible,
+    _dump_model,
+    _write_file,
+    _writer_context,
+)
+
+T = TypeVar("T")
+
+OnErrorOptions = Literal["raise", "skip"]
+
+
+class DocumentError(NamedTuple):
+    """Validation error for a single document of a multi-document stream."""
+
+    document_index: int
+    """Index of the document in the stream (starting at 0)."""
+    error: ValidationError
+
+
+def _open_source(source: Path | IOBase) -> AbstractContextManager[IOBase]:
+    """Open the file, or use the stream (closing it only if it's our wrapper of a buffer)."""
+    if isinstance(source, Path):
+        return source.open(mode="rb")
+    elif isinstance(source, BufferStream):
+        return source  # must be released when done
+    return nullcontext(source)
+
+
+def _iter_validated(
+    model_type: type[T],
+    source: Path | IOBase,
+    *,
+    on_error: OnErrorOptions,
+    errors: list[DocumentError] | None,
+    engine: YamlEngine | None,
+) -> Iterator[T]:
+    """Validate documents of the stream (or file) one by one."""
+    ta = get_type_adapter(model_type)
+    with _open_source(source) as stream, pooled_reader("safe", engine=engine) as reader:
+        for i, obj in enumerate(reader.load_all(stream)):
+            # `YAML.load_all()` keeps a (small) info object per document; only the last one is used
+            # (on ruamel.yaml >= 0.18.4)
+            doc_infos = getattr(reader, "doc_infos", None)
+            if doc_infos is not None:
+                del doc_infos[:-1]
+            try:
+                res = ta.validate_python(obj)
+            except ValidationError as e:
+                if on_error == "raise":
+                    raise
+                if errors is not None:
+                    errors.append(DocumentError(i, e))
+                continue
+            del obj
+            yield res
+
+
+def parse_yaml_stream_as(
+    model_type: type[T],
+    source: str | BytesLike | Path | IOBase,
+    *,
+    on_error: OnErrorOptions = "raise",
+    errors: list[DocumentError] | None = None,
+    engine: YamlEngine | None = None,
+) -> Iterator[T]:
+    """Lazily parse a multi-document YAML stream, yielding one model per document.
+
+    Documents are parsed and validated one at a time, so memory use is bounded by
+    the largest single document rather than by the whole stream (for streams and files).
+
+    Parameters
+    ----------
+    model_type : Type[BaseModel]
+        The type of each document.
+    source : str or bytes-like or Path or IOBase
+        The YAML string, encoded bytes (incl. `bytearray`, `memoryview` or `mmap`),
+        stream, or path to a file. Note that `str` is treated as YAML content;
+        pass a `Path` to read from a file.
+    on_error : "raise" or "skip"
+        What to do with documents that fail validation: raise the `ValidationError`,
+        or skip them. YAML syntax errors are always raised, as the rest of the stream can't be read.
+    errors : None or list of DocumentError
+        If given, errors of skipped documents are appended to this list.
+    engine : None or "auto" or "c" or "pure"
+        The YAML engine to use: "c" for the libyaml-based parser, "pure" for the pure-Python
+        one, or "auto" to use the C one if available. None uses the global default,
+        see `set_default_engine()`.
+
+    Examples
+    --------
+    ```python
+    errors = []
+    for event in parse_yaml_stream_as(Event, Path("events.yaml"), on_error="skip", errors=errors):
+        ...
+    ```
+    """
+    if on_error not in ("raise", "skip"):
+        raise ValueError(f"Expected on_error to be 'raise' or 'skip', got {on_error!r}")
+    if not isinstance(source, Path):
+        source = _as_stream(source)
+    return _iter_validated(model_type, source, on_error=on_error, errors=errors, engine=engine)
+
+
+def _iter_items(item_type: type[T], source: Path | IOBase, *, engine: YamlEngine | None) -> Iterator[T]:
+    """Validate items of the top-level sequence one by one."""
+    ta = get_type_adapter(item_type)
+    with (
+        _open_source(source) as stream,
+        pooled_reader("safe", engine=engine) as reader,
+        event_loader(reader, stream) as events,
+    ):
+        if not events.start_document():
+            return  # empty stream
+        if not events.check(SequenceStartEvent):
+            event = events.peek()
+            kind = type(event).__name__
+            raise ValueError(f"Expected a sequence at the top level, but got {kind}\n{event.start_mark}")
+        seq_node = events.start_collection()
+        index = 0
+        while not events.check(SequenceEndEvent):
+            obj = events.construct(seq_node, index)
+            res = ta.validate_python(obj)
+            del obj
+            yield res
+            index += 1
+        events.end_collection()
+        events.end_document()
+
+
+def parse_yaml_items_as(
+    item_type: type[T],
+    source: str | BytesLike | Path | IOBase,
+    *,
+    engine: YamlEngine | None = None,
+) -> Iterator[T]:
+    """Lazily parse a document that is a (huge) sequence, yielding one validated item at a time.
+
+    This is equivalent to `parse_yaml_raw_as(list[item_type], source)`, but items are parsed
+    and validated one by one as the result is iterated, so (for streams and files) memory use
+    is bounded by the largest single item rather than by the whole document.
+
+    Parameters
+    ----------
+    item_type : Type[BaseModel]
+        The type of each item of the sequence.
+    source : str or bytes-like or Path or IOBase
+        The YAML string, encoded bytes (incl. `bytearray`, `memoryview` or `mmap`),
+        stream, or path to a file. Note that `str` is treated as YAML content;
+        pass a `Path` to read from a file.
+    engine : None or "auto" or "c" or "pure"
+        The YAML engine to use: "c" for the libyaml-based parser, "pure" for the pure-Python
+        one, or "auto" to use the C one if available. None uses the global default,
+        see `set_default_engine()`.
+
+    Raises
+    ------
+    ValueError
+        If the top level of the document isn't a sequence (raised when iterating).
+
+    Notes
+    -----
+    Items may use aliases of anchors defined in earlier items, so anchored nodes are kept
+    until the end. An empty document gives no items.
+
+    Examples
+    --------
+    ```python
+    for record in parse_yaml_items_as(Record, Path("records.yaml")):
+        ...
+    ```
+    """
+    if not isinstance(source, Path):
+        source = _as_stream(source)
+    return _iter_items(item_type, source, engine=engine)
+
+
+def _check_document(model: Any, adapter: TypeAdapter | None) -> None:
+    """Check that the model can be written without a `model_type`, raising `TypeError` otherwise."""
+    if adapter is None and not isinstance(model, BaseModel):
+        raise TypeError(
+            f"Expected a Pydantic BaseModel, but got {type(model)} (pass `model_type` for other types)"
+        )
+
+
+def _iter_documents(
+    stream: IOBase,
+    models: Iterable[BaseModel | Any],
+    *,
+    model_type: Any,
+    writer: YAML,
+    add_comments: CommentsOptions,
+    flow_style: bool | None,
+    json_roundtrip: bool,
+    use_anchors: bool,
+    json_kwargs: dict[str, Any],
+) -> Iterator[Any]:
+    """Convert models to documents one by one, flushing the stream between documents."""
+    adapter = None if model_type is None else get_type_adapter(model_type)
+    for i, model in enumerate(models):
+        _check_document(model, adapter)
+        val = _dump_json_compatible(model, json_roundtrip=json_roundtrip, adapter=adapter, **json_kwargs)
+        if use_anchors:
+            val = share_repeated_subtrees(val)
+        if add_comments is not False:
+            ystruct = _commented_value(
+                val, model, writer=writer, opts=add_comments, flow_style=flow_style
+            )
+            if ystruct is not None:
+                val = ystruct
+        if i > 0:
+            # The previous document has been fully emitted by now
+            stream.flush()
+        yield val
+
+
+def _write_json_stream(
+    stream: IOBase,
+    models: Iterable[BaseModel | Any],
+    *,
+    model_type: Any,
+    indent: int | None,
+    engine: YamlEngine | None,
+    json_roundtrip: bool,
+    json_kwargs: dict[str, Any],
+) -> None:
+    """Write models as JSON documents, separated by `---` (see `emit_json` of `to_yaml_str()`)."""
+    adapter = None if model_type is None else get_type_adapter(model_type)
+    for i, model in enumerate(models):
+        _check_document(model, adapter)
+        if i > 0:
+            stream.write("---\n")
+        _dump_model(
+            stream,
+            model,
+            model_type=model_type,
+            adapter=adapter,
+            add_comments=False,
+            default_flow_style=True,
+            indent=indent,
+            map_indent=None,
+            sequence_indent=None,
+            sequence_dash_offset=None,
+            custom_yaml_writer=None,
+            engine=engine,
+            json_roundtrip=json_roundtrip,
+            emit_json=True,
+            use_anchors=False,
+            **json_kwargs,
+        )
+        stream.flush()
+
+
+def _write_yaml_stream(
+    stream: IOBase,
+    models: Iterable[BaseModel | Any],
+    *,
+    model_type: Any = None,
+    add_comments: CommentsOptions = False,
+    default_flow_style: bool | None = None,
+    indent: int | None = None,
+    map_indent: int | None = None,
+    sequence_indent: int | None = None,
+    sequence_dash_offset: int | None = None,
+    custom_yaml_writer: YAML | None = None,
+    engine: YamlEngine | None = None,
+    json_roundtrip: bool = False,
+    emit_json: bool = False,
+    use_anchors: bool = False,
+    **json_kwargs,
+) -> None:
+    """Write models as a multi-document YAML stream."""
+    if add_comments not in (False, True, "fields-only", "models-only"):
+        raise ValueError(f"Unknown comment option: {add_comments!r}")
+    _check_dump_options(
+        add_comments=add_comments,
+        map_indent=map_indent,
+        sequence_indent=sequence_indent,
+        sequence_dash_offset=sequence_dash_offset,
+        custom_yaml_writer=custom_yaml_writer,
+        emit_json=emit_json,
+        use_anchors=use_anchors,
+    )
+    if emit_json:
+        _write_json_stream(
+            stream,
+            models,
+            model_type=model_type,
+            indent=indent,
+            engine=engine,
+            json_roundtrip=json_roundtrip,
+            json_kwargs=json_kwargs,
+        )
+        return
+    writer_ctx = _writer_context(
+        custom_yaml_writer,
+        engine=engine,
+        default_flow_style=default_flow_style,
+        indent=indent,
+        map_indent=map_indent,
+        sequence_indent=sequence_indent,
+        sequence_dash_offset=sequence_dash_offset,
+    )
+    with writer_ctx as writer:
+        docs = _iter_documents(
+            stream,
+            models,
+            model_type=model_type,
+            writer=writer,
+            add_comments=add_comments,
+            flow_style=default_flow_style if custom_yaml_writer is None else None,
+            json_roundtrip=json_roundtrip,
+            use_anchors=use_anchors,
+            json_kwargs=json_kwargs,
+        )
+        if add_comments is False:
+            writer.dump_all(docs, stream)
+        else:
+            # Commented structures need the round-trip dumper
+            with pooled_writer("rt") as rt_writer:
+                rt_writer.dump_all(docs, stream)
+    stream.flush()
+
+
+def to_yaml_stream(
+    file: Path | str | IOBase,
+    models: Iterable[BaseModel | Any],
+    *,
+    model_type: Any = None,
+    add_comments: CommentsOptions = False,
+    default_flow_style: bool | None = False,
+    indent: int | None = None,
+    map_indent: int | None = None,
+    sequence_indent: int | None = None,
+    sequence_dash_offset: int | None = None,
+    custom_yaml_writer: YAML | None = None,
+    engine: YamlEngine | None = None,
+    json_roundtrip: bool = False,
+    emit_json: bool = False,
+    use_anchors: bool = False,
+    encoding: str = "utf-8",
+    **json_kwargs,
+) -> None:
+    """Write models as a multi-document YAML stream (documents separated by `---`).
+
+    The writer is configured once, and models are consumed and written one at a time,
+    so `models` can be a (lazy) generator. The output is flushed after each document.
+
+    Parameters
+    ----------
+    file : Path or str or IOBase
+        The file path or stream to write to. Binary streams are written to directly,
+        encoding the output in chunks.
+    models : Iterable[BaseModel or Any]
+        The models to write, one per document, or values of `model_type`.
+    model_type : None or Any
+        If given, each document is serialized as this type (e.g. `list[MyModel]`),
+        see `to_yaml_str()`. Otherwise, the models must be `BaseModel` instances.
+    add_comments : False or True or "fields-only" or "models-only"
+        Whether to add comments to the output YAML using fields and/or model descriptions.
+    default_flow_style : bool
+        Whether to use "flow style" (more human-readable).
+        https://yaml.readthedocs.io/en/latest/detail.html?highlight=default_flow_style#indentation-of-block-sequences
+    indent : None or int
+        General indent value. Leave as None for the default.
+    map_indent, sequence_indent, sequence_dash_offset : None or int
+        More specific indent values.
+    custom_yaml_writer : None or YAML
+        An instance of ruamel.yaml.YAML (or a subclass) to use as the writer.
+        The above options will be set on it for the duration of the call, if given.
+    engine : None or "auto" or "c" or "pure"
+        The YAML engine to use: "c" for the libyaml-based emitter, "pure" for the pure-Python
+        one, or "auto" to use the C one if available. None uses the global default,
+        see `set_default_engine()`. Ignored when `custom_yaml_writer` is passed.
+    json_roundtrip : bool
+        If True, serialize via a JSON string, i.e. `json.loads(model.model_dump_json())`.
+        This is slower and uses more memory, and is only kept for backwards compatibility.
+    emit_json : bool
+        If True, write each document as JSON (which is valid flow-style YAML),
+        see `to_yaml_str()`.
+    use_anchors : bool
+        If True, identical repeated subtrees of each document are written only once,
+        with an anchor, and then as aliases, see `to_yaml_str()`.
+    encoding : str
+        The encoding of the output, for files and binary streams (text streams do their own).
+    json_kwargs : Any
+        Keyword arguments to pass `model.model_dump()` (or `model.model_dump_json()`).
+    """
+    write_kwargs = dict(
+        model_type=model_type,
+        add_comments=add_comments,
+        default_flow_style=default_flow_style,
+        indent=indent,
+        map_indent=map_indent,
+        sequence_indent=sequence_indent,
+        sequence_dash_offset=sequence_dash_offset,
+        custom_yaml_writer=custom_yaml_writer,
+        engine=engine,
+        json_roundtrip=json_roundtrip,
+        emit_json=emit_json,
+        use_anchors=use_anchors,
+        **json_kwargs,
+    )
+    write = partial(_write_yaml_stream, models=models, **write_kwargs)
+    _write_file(write, file, encoding=encoding)
@@ -9,17 +9,28 @@ Roundtrip comments with ruamel.yaml
 """
 
 import json
+import math
 import warnings
-from collections.abc import Mapping, Sequence
+from collections.abc import Callable, Mapping, Sequence
+from contextlib import AbstractContextManager, nullcontext
+from functools import lru_cache, partial
 from io import BytesIO, IOBase, StringIO
 from pathlib import Path
 from textwrap import dedent
-from typing import Any, Literal, TypeVar
+from typing import Annotated, Any, Literal, NamedTuple, TypeVar, get_args, get_origin
 
 from pydantic import BaseModel, RootModel, TypeAdapter
-from pydantic.fields import FieldInfo
 from ruamel.yaml import YAML, CommentedMap, CommentedSeq
 
+from .adapters import get_type_adapter
+from .aliases import share_repeated_subtrees, validate_memoized
+from .buffers import BufferStream, BytesLike, open_memory_map, text_writer
+from .engines import YamlEngine, configured_writer, pooled_reader, pooled_writer
+from .events import KeyPath, event_loader, lookup_key_path, split_key_path
+from .instrumentation import CountingReader, count_nodes, engine_name, phase_recorder, stream_position
+from .json_subset import NOT_JSON, is_yaml_compatible_json, load_json_subset
+from .resolver import SchemaResolver, key_path_schema, scalar_schema, schema_scope
+
 CommentsOptions = Literal["fields-only", "models-only"] | bool
 
 
@@ -31,20 +42,113 @@ def as_yaml_comment(value: str | None) -> str | None:
     return "\n".join([f"# {v}".strip() for v in lines])
 
 
-T = TypeVar("T", bound=BaseModel)
+T = TypeVar("T")
+
+
+class _CommentPlan(NamedTuple):
+    """Comments of a model class, computed once per class and comment options."""
+
+    model_comment: str | None
+    """The model docstring, if allowed by the options."""
+    field_comments: dict[str, str]
+    """Single-line field descriptions, in field definition order."""
+    subtree_fields: frozenset[str]
+    """Fields whose values may contain (nested) comments."""
+    subclass_fields: frozenset[str] = frozenset()
+    """Other fields with models, whose values may be instances of subclasses with comments."""
+
+    @property
+    def has_comments(self) -> bool:
+        """Whether an instance of the model can produce any comments (by the declared field types)."""
+        return self.model_comment is not None or bool(self.field_comments or self.subtree_fields)
+
+
+def _model_may_comment(cls: type[BaseModel], opts: CommentsOptions, seen: set[type]) -> bool:
+    """Check whether the model class, or any model used in its fields, has comments."""
+    if cls in seen:
+        return False  # already being checked further up
+    seen.add(cls)
+    if opts in (True, "models-only") and cls.__doc__ is not None:
+        return True
+    for fld_info in cls.model_fields.values():
+        if opts in (True, "fields-only") and fld_info.description is not None:
+            return True
+        if _type_may_comment(fld_info.annotation, opts, seen):
+            return True
+    return False
+
+
+def _type_may_comment(tp: Any, opts: CommentsOptions, seen: set[type]) -> bool:
+    """Check whether values of the (declared) type can contain models with comments."""
+    if tp is None or tp is Ellipsis:
+        return False
+    origin = get_origin(tp)
+    if origin is Annotated:
+        return _type_may_comment(get_args(tp)[0], opts, seen)
+    elif origin is Literal:
+        return False
+    elif origin is not None:  # generic collections, unions, etc.
+        return any(_type_may_comment(arg, opts, seen) for arg in get_args(tp))
+    elif isinstance(tp, type):
+        if issubclass(tp, BaseModel) and tp is not BaseModel:
+            return _model_may_comment(tp, opts, seen)
+        return tp in (object, BaseModel)  # could be anything
+    # `Any`, type variables, forward references... we can't tell, so be safe
+    return True
+
+
+def _type_has_models(tp: Any) -> bool:
+    """Check whether the (declared) type uses model classes."""
+    origin = get_origin(tp)
+    if origin is not None:
+        return any(_type_has_models(arg) for arg in get_args(tp))
+    return isinstance(tp, type) and issubclass(tp, BaseModel)
+
+
+@lru_cache(maxsize=1024)
+def _get_comment_plan(cls: type[BaseModel], opts: CommentsOptions) -> _CommentPlan:
+    """Get the (cached) comment plan for the model class."""
+    model_comment = cls.__doc__ if opts in (True, "models-only") else None
+    field_comments: dict[str, str] = {}
+    subtree_fields: set[str] = set()
+    subclass_fields: set[str] = set()
+    for fld_name, fld_info in cls.model_fields.items():
+        if opts in (True, "fields-only") and fld_info.description is not None:
+            # Convert multi-line descriptions to single-line by replacing newlines with spaces
+            field_comments[fld_name] = fld_info.description.replace("\n", " ").strip()
+        if _type_may_comment(fld_info.annotation, opts, set()):
+            subtree_fields.add(fld_name)
+        elif _type_has_models(fld_info.annotation):
+            subclass_fields.add(fld_name)
+    return _CommentPlan(
+        model_comment, field_comments, frozenset(subtree_fields), frozenset(subclass_fields)
+    )
 
 
-def _get_doc(obj: BaseModel | FieldInfo | Any, opts: CommentsOptions) -> str | None:
-    """Get documentation for the model or field, taking options into account."""
+def _value_may_comment(obj: Any, opts: CommentsOptions) -> bool:
+    """Check whether the value contains model instances with comments, e.g. of subclasses."""
     if isinstance(obj, BaseModel):
-        if opts in (True, "models-only"):
-            return getattr(obj, "__doc__", None)
-        return None
-    elif isinstance(obj, FieldInfo):
-        if opts in (True, "fields-only"):
-            return obj.description
-        return None
-    return None
+        plan = _get_comment_plan(type(obj), opts)
+        return plan.has_comments or any(
+            _value_may_comment(getattr(obj, fld_name, None), opts) for fld_name in plan.subclass_fields
+        )
+    elif isinstance(obj, Mapping):
+        return any(_value_may_comment(v, opts) for v in obj.values())
+    elif isinstance(obj, Sequence | set | frozenset) and not isinstance(obj, str | bytes):
+        return any(_value_may_comment(v, opts) for v in obj)
+    return False
+
+
+def _commented_fields(obj: BaseModel, plan: _CommentPlan, opts: CommentsOptions) -> frozenset[str]:
+    """Get the fields of the model instance whose values may contain comments.
+
+    Plans are based on the declared field types, so values of the other fields with models
+    are checked for instances of (subclasses of) models that have comments.
+    """
+    if not plan.subclass_fields:
+        return plan.subtree_fields
+    found = [name for name in plan.subclass_fields if _value_may_comment(getattr(obj, name, None), opts)]
+    return plan.subtree_fields.union(found) if found else plan.subtree_fields
 
 
 def _add_descriptions(
@@ -56,43 +160,44 @@ def _add_descriptions(
 
     This will fail if `ystruct` and `obj` don't have the same structure.
     """
-    # Add top-level comment
-    top_lvl = _get_doc(obj, opts=opts)
-    if top_lvl is not None:
-        try:
-            indent = ystruct.lc.col
-        except Exception:
-            indent = 0
-        ystruct.yaml_set_start_comment(top_lvl, indent=indent)
-
     if isinstance(obj, BaseModel):
+        plan = _get_comment_plan(type(obj), opts)
+        fields = _commented_fields(obj, plan, opts)
+        if not (plan.has_comments or fields):
+            return  # nothing to add in this subtree
+
+        # Add top-level comment
+        if plan.model_comment is not None:
+            try:
+                indent = ystruct.lc.col
+            except Exception:
+                indent = 0
+            ystruct.yaml_set_start_comment(plan.model_comment, indent=indent)
+
         if obj.__pydantic_root_model__:
             # RootModel should probably work
             assert isinstance(obj, RootModel), "Model incorrectly set as RootModel."
+            if "root" not in fields:
+                return
             obj = obj.root
 
     if isinstance(obj, BaseModel):
-        # Add field information
-        flds: dict[str, FieldInfo]
-
-        if isinstance(obj, BaseModel):
-            flds = type(obj).model_fields
-
-        for fld_name, fld_info in flds.items():
+        plan = _get_comment_plan(type(obj), opts)
+        fields = _commented_fields(obj, plan, opts)
+        for fld_name in type(obj).model_fields:
             if not isinstance(ystruct, CommentedMap):
                 raise NotImplementedError("Can't add field descriptions to non-mapping YAML structures.")
             if fld_name in ystruct.keys():
                 # Add field description (if any/allowed)
-                fld_desc = _get_doc(fld_info, opts=opts)
+                fld_desc = plan.field_comments.get(fld_name)
                 if fld_desc is not None:
-                    # Convert multi-line descriptions to single-line by replacing newlines with spaces
-                    fld_desc_single = fld_desc.replace("\n", " ").strip()
-                    ystruct.yaml_add_eol_comment(fld_desc_single, key=fld_name)
-
-                # Recurse into fields
-                fld_obj = getattr(obj, fld_name, None)
-                if isinstance(fld_obj, BaseModel | Sequence | Mapping):
-                    _add_descriptions(ystruct[fld_name], fld_obj, opts=opts)
+                    ystruct.yaml_add_eol_comment(fld_desc, key=fld_name)
+
+                # Recurse into fields, if they can have comments
+                if fld_name in fields:
+                    fld_obj = getattr(obj, fld_name, None)
+                    if isinstance(fld_obj, BaseModel | Sequence | Mapping):
+                        _add_descriptions(ystruct[fld_name], fld_obj, opts=opts)
                 # otherwise - no additional descriptions
     elif isinstance(obj, Sequence) and isinstance(ystruct, CommentedSeq):
         # Recurse into parts of the sequence; needed in cases of `list[dict[str, MyModel]]` and such
@@ -103,10 +208,246 @@ def _add_descriptions(
             _add_descriptions(ystruct[key], sub_obj, opts=opts)
 
 
+def _dump_json_str(model: Any, adapter: TypeAdapter | None, **json_kwargs) -> str:
+    """Dump the model (or any value of the adapter's type) to a JSON string."""
+    if adapter is None:
+        return model.model_dump_json(**json_kwargs)
+    return adapter.dump_json(model, **json_kwargs).decode()
+
+
+def _dump_json_compatible(
+    model: Any,
+    *,
+    json_roundtrip: bool = False,
+    adapter: TypeAdapter | None = None,
+    **json_kwargs,
+) -> Any:
+    """Dump the model to JSON-compatible Python objects.
+
+    This gives the same result as `json.loads(model.model_dump_json())`, without the JSON string.
+    If an adapter is given, it serializes the value instead, e.g. a whole `list[MyModel]`
+    in a single call.
+    """
+    if json_roundtrip:
+        return json.loads(_dump_json_str(model, adapter, **json_kwargs))
+    # This only affects escaping in the JSON string, so it's irrelevant here
+    ensure_ascii = json_kwargs.pop("ensure_ascii", None)
+    if adapter is None:
+        val = model.model_dump(mode="json", **json_kwargs)
+    else:
+        val = adapter.dump_python(model, mode="json", **json_kwargs)
+    if _has_non_finite(val):
+        # Non-finite floats are kept as-is by `mode="json"`; in JSON, they are written according
+        # to the `ser_json_inf_nan` setting of each model (`null` by default), so use that instead
+        if ensure_ascii is not None:
+            json_kwargs["ensure_ascii"] = ensure_ascii
+        return json.loads(_dump_json_str(model, adapter, **json_kwargs))
+    return val
+
+
+def _has_non_finite(val: Any) -> bool:
+    """Check whether the JSON-compatible value contains any infinite or NaN floats."""
+    stack = [val]
+    while stack:
+        v = stack.pop()
+        if type(v) is dict:
+            stack.extend(v.values())
+        elif type(v) is list:
+            stack.extend(v)
+        elif type(v) is float and not math.isfinite(v):
+            return True
+    return False
+
+
+def _dump_yaml_json(
+    model: Any,
+    *,
+    indent: int | None,
+    adapter: TypeAdapter | None = None,
+    **json_kwargs,
+) -> str | None:
+    """Dump the model as JSON, if the YAML loader reads it back the same way (otherwise None).
+
+    The text is checked without parsing it again, except if it contains `Infinity`, `NaN`
+    or escaped quotes, see `is_yaml_compatible_json()`.
+    """
+    text = _dump_json_str(model, adapter, indent=indent, **json_kwargs)
+    if not is_yaml_compatible_json(text):
+        return None
+    return text + "\n"
+
+
+def _writer_context(
+    custom_yaml_writer: YAML | None,
+    *,
+    engine: YamlEngine | None,
+    **writer_opts: Any,
+) -> AbstractContextManager[YAML]:
+    """Get a configured writer: either from the pool, or the custom one (only changed temporarily)."""
+    if custom_yaml_writer is None:
+        return pooled_writer("safe", engine=engine, **writer_opts)
+    return configured_writer(custom_yaml_writer, **writer_opts)
+
+
+def _build_plain(val: Any, *, flow_style: bool) -> Any:
+    """Build a round-trip YAML structure from the dumped value, without any comments."""
+    if isinstance(val, dict):
+        items = list(val.items())
+        try:
+            items = sorted(items)  # same as the "safe" representer
+        except TypeError:
+            pass
+        if not flow_style:
+            # The round-trip representer writes plain collections the same way, and they're cheaper
+            return {k: _build_plain(v, flow_style=False) for k, v in items}
+        ystruct: CommentedMap | CommentedSeq = CommentedMap(
+            (k, _build_plain(v, flow_style=True)) for k, v in items
+        )
+    elif isinstance(val, list):
+        if not flow_style:
+            return [_build_plain(v, flow_style=False) for v in val]
+        ystruct = CommentedSeq(_build_plain(v, flow_style=True) for v in val)
+    else:
+        return val
+    ystruct.fa.set_flow_style()
+    return ystruct
+
+
+def _build_commented(
+    val: Any,
+    obj: BaseModel | Mapping | Sequence | Any,
+    opts: CommentsOptions,
+    *,
+    flow_style: bool,
+    col: int = 0,
+) -> Any:
+    """Build a round-trip YAML structure from the dumped value, adding descriptions from the object.
+
+    This gives the same result as dumping `val`, re-loading it with the round-trip loader
+    and calling `_add_descriptions()`, but in a single pass.
+    Subtrees that don't match the structure of `obj`, or can't have comments
+    according to the model's comment plan, are converted without comments.
+
+    Parameters
+    ----------
+    val : Any
+        The JSON-compatible value, as dumped from `obj`.
+    obj : Any
+        The original object, used to get the descriptions.
+    opts : False or True or "fields-only" or "models-only"
+        Which comments to add.
+    flow_style : bool
+        Whether to use flow style for all collections.
+    col : int
+        Column the structure starts at (in block style), used for indenting the header comment.
+    """
+    if not isinstance(val, dict | list):
+        return val
+
+    model_comment: str | None = None
+    plan: _CommentPlan | None = None
+    fields: frozenset[str] = frozenset()
+    if isinstance(obj, BaseModel):
+        plan = _get_comment_plan(type(obj), opts)
+        fields = _commented_fields(obj, plan, opts)
+        if not (plan.has_comments or fields):
+            return _build_plain(val, flow_style=flow_style)
+        model_comment = plan.model_comment
+        if obj.__pydantic_root_model__:
+            assert isinstance(obj, RootModel), "Model incorrectly set as RootModel."
+            obj = obj.root if "root" in fields else None
+            plan = None
+            if isinstance(obj, BaseModel):
+                plan = _get_comment_plan(type(obj), opts)
+                fields = _commented_fields(obj, plan, opts)
+    if model_comment is None and (obj is None or isinstance(obj, str)):
+        return _build_plain(val, flow_style=flow_style)
+
+    ystruct: CommentedMap | CommentedSeq
+    if isinstance(val, dict):
+        items = list(val.items())
+        try:
+            items = sorted(items)  # same as the "safe" representer
+        except TypeError:
+            pass
+        sub_objs: dict[Any, Any]
+        if isinstance(obj, BaseModel):
+            assert plan is not None
+            sub_objs = {k: getattr(obj, k, None) for k in val.keys() if k in fields}
+        elif isinstance(obj, Mapping):
+            if len(obj) == len(val):
+                # Keys might have been converted (e.g. `int` to `str`), but the order is kept
+                sub_objs = dict(zip(val.keys(), obj.values(), strict=True))
+            else:
+                sub_objs = {k: obj[k] for k in val.keys() if k in obj}
+        else:
+            sub_objs = {}
+        ystruct = CommentedMap()
+        for k, v in items:
+            sub_col = col + 2 if isinstance(v, dict) else col
+            ystruct[k] = _build_commented(v, sub_objs.get(k), opts, flow_style=flow_style, col=sub_col)
+    else:
+        if isinstance(obj, Sequence) and len(obj) == len(val):
+            seq_objs: Sequence[Any] = obj
+        else:
+            seq_objs = [None] * len(val)
+        ystruct = CommentedSeq(
+            _build_commented(v, o, opts, flow_style=flow_style, col=col + 2)
+            for v, o in zip(val, seq_objs, strict=True)
+        )
+    if flow_style:
+        ystruct.fa.set_flow_style()
+
+    # Add comments, in the same order as `_add_descriptions()`
+    if model_comment is not None:
+        ystruct.yaml_set_start_comment(model_comment, indent=col)
+    if plan is not None and isinstance(ystruct, CommentedMap):
+        for fld_name, fld_desc in plan.field_comments.items():
+            if fld_name in ystruct:
+                ystruct.yaml_add_eol_comment(fld_desc, key=fld_name)
+    return ystruct
+
+
+def _commented_value(
+    val: Any,
+    model: BaseModel | Mapping | Sequence | Any,
+    *,
+    writer: YAML,
+    opts: CommentsOptions,
+    flow_style: bool | None,
+) -> dict | list | None:
+    """Convert the dumped value to a round-trip YAML structure with comments from the model.
+
+    If `flow_style` is None (i.e. unknown, for custom writers), the value is dumped with `writer`
+    and re-loaded to get the structure; otherwise it's built directly.
+
+    Returns None (with a warning) if comments can't be added to the value.
+    """
+    ystruct: Any
+    if flow_style is None:
+        # We need to roundtrip!
+        temp_stream = StringIO()
+        writer.dump(val, temp_stream)
+        with pooled_reader("rt") as rt_reader:
+            ystruct = rt_reader.load(temp_stream.getvalue())
+        if isinstance(ystruct, CommentedMap | CommentedSeq):
+            _add_descriptions(ystruct, obj=model, opts=opts)
+    else:
+        ystruct = _build_commented(val, model, opts, flow_style=flow_style)
+    if isinstance(ystruct, dict | list):  # including `CommentedMap` and `CommentedSeq`
+        return ystruct
+    warnings.warn(
+        "Failed to add comments to model; is not a map or sequence.",
+        category=UserWarning,
+    )
+    return None
+
+
 def _write_yaml_model(
     stream: IOBase,
-    model: BaseModel,
+    model: BaseModel | Any,
     *,
+    model_type: Any = None,
     add_comments: CommentsOptions = False,
     default_flow_style: bool | None = None,
     indent: int | None = None,
@@ -114,18 +455,25 @@ def _write_yaml_model(
     sequence_indent: int | None = None,
     sequence_dash_offset: int | None = None,
     custom_yaml_writer: YAML | None = None,
+    engine: YamlEngine | None = None,
+    json_roundtrip: bool = False,
+    emit_json: bool = False,
+    use_anchors: bool = False,
     **json_kwargs,
 ) -> None:
     """Write YAML model to the stream object.
 
-    This uses JSON dumping as an intermediary.
+    This uses JSON-mode serialization of the model as an intermediary.
 
     Parameters
     ----------
     stream : IOBase
         The stream to write to.
-    model : BaseModel
-        The model to write.
+    model : BaseModel or Any
+        The model to write, or a value of `model_type`.
+    model_type : None or Any
+        If given, the model is serialized as this type (e.g. `list[MyModel]`), with its cached
+        `TypeAdapter`. Otherwise, the model must be a `BaseModel`.
     add_comments : False or True or "fields-only" or "models-only"
         Whether to add comments to the output YAML using fields and/or model descriptions.
     default_flow_style : bool
@@ -137,50 +485,162 @@ def _write_yaml_model(
         More specific indent values.
     custom_yaml_writer : None or YAML
         An instance of ruamel.yaml.YAML (or a subclass) to use as the writer.
-        The above options will be set on it, if given.
+        The above options will be set on it for the duration of the call, if given.
+    engine : None or "auto" or "c" or "pure"
+        The YAML engine to use: "c" for the libyaml-based emitter, "pure" for the pure-Python
+        one, or "auto" to use the C one if available. None uses the global default,
+        see `set_default_engine()`. Ignored when `custom_yaml_writer` is passed.
+    json_roundtrip : bool
+        If True, serialize via a JSON string, i.e. `json.loads(model.model_dump_json())`.
+        This is slower and uses more memory, and is only kept for backwards compatibility.
+    emit_json : bool
+        If True, write the model as JSON (which is valid flow-style YAML) straight from
+        `model.model_dump_json()`, which is much faster than the YAML emitter. `indent` sets
+        the JSON indentation; comments, custom writers and specific indents aren't supported.
+        Unlike the YAML output, keys are kept in field order. If the JSON can't be read back
+        the same way as YAML (e.g. with `ser_json_inf_nan="constants"`), flow-style YAML is written.
+    use_anchors : bool
+        If True, identical repeated subtrees (mappings and sequences) are written only once,
+        with an anchor, and then as aliases (e.g. `&id001` and `*id001`). This shrinks
+        the output of models with repeated parts. Comments aren't supported.
     json_kwargs : Any
-        Keyword arguments to pass `model.model_dump_json()`.
+        Keyword arguments to pass `model.model_dump()` (or `model.model_dump_json()`).
     """
-    if not isinstance(model, BaseModel):
-        raise TypeError(f"Expected a Pydantic BaseModel, but got {type(model)}")
-    json_val = model.model_dump_json(**json_kwargs)
-    val = json.loads(json_val)
-    # Allow setting custom writer
-    if custom_yaml_writer is None:
-        writer = YAML(typ="safe", pure=True)
-    elif isinstance(custom_yaml_writer, YAML):
-        writer = custom_yaml_writer
-    else:
-        raise TypeError(f"Please pass a YAML instance or subclass. Got {custom_yaml_writer!r}")
-    # Set options
-    if default_flow_style is not None:
-        writer.default_flow_style = default_flow_style
-    writer.indent(mapping=indent, sequence=indent, offset=indent)
-    writer.indent(mapping=map_indent, sequence=sequence_indent, offset=sequence_dash_offset)
-    # TODO: Configure writer further?
-    if add_comments is False:
-        writer.dump(val, stream)
-    elif add_comments in (True, "fields-only", "models-only"):
-        # We need to roundtrip!
-        temp_stream = StringIO()
-        writer.dump(val, temp_stream)
-        rt_yaml = YAML(typ="rt", pure=True)
-        ystruct = rt_yaml.load(temp_stream.getvalue())
-        if isinstance(ystruct, CommentedMap | CommentedSeq):
-            _add_descriptions(ystruct, obj=model, opts=add_comments)
-            rt_yaml.dump(ystruct, stream)
-        else:
-            # Don't know what to do with this; just write the original value
-            warnings.warn(
-                "Failed to add comments to model; is not a map or sequence.",
-                category=UserWarning,
-            )
+    if model_type is None and not isinstance(model, BaseModel):
+        raise TypeError(
+            f"Expected a Pydantic BaseModel, but got {type(model)} (pass `model_type` for other types)"
+        )
+    _check_dump_options(
+        add_comments=add_comments,
+        map_indent=map_indent,
+        sequence_indent=sequence_indent,
+        sequence_dash_offset=sequence_dash_offset,
+        custom_yaml_writer=custom_yaml_writer,
+        emit_json=emit_json,
+        use_anchors=use_anchors,
+    )
+    _dump_model(
+        stream,
+        model,
+        model_type=model_type,
+        add_comments=add_comments,
+        default_flow_style=default_flow_style,
+        indent=indent,
+        map_indent=map_indent,
+        sequence_indent=sequence_indent,
+        sequence_dash_offset=sequence_dash_offset,
+        custom_yaml_writer=custom_yaml_writer,
+        engine=engine,
+        json_roundtrip=json_roundtrip,
+        emit_json=emit_json,
+        use_anchors=use_anchors,
+        **json_kwargs,
+    )
+
+
+def _check_dump_options(
+    *,
+    add_comments: CommentsOptions,
+    map_indent: int | None,
+    sequence_indent: int | None,
+    sequence_dash_offset: int | None,
+    custom_yaml_writer: YAML | None,
+    emit_json: bool,
+    use_anchors: bool,
+) -> None:
+    """Check that the dump options can be combined, raising `ValueError` otherwise."""
+    if use_anchors and (add_comments is not False or emit_json):
+        raise ValueError("Can't use comments or `emit_json=True` with `use_anchors=True`.")
+    if emit_json:
+        if add_comments is not False or custom_yaml_writer is not None:
+            raise ValueError("Can't use comments or a custom YAML writer with `emit_json=True`.")
+        if not (map_indent is None and sequence_indent is None and sequence_dash_offset is None):
+            raise ValueError("Only the general `indent` is supported with `emit_json=True`.")
+
+
+def _dump_model(
+    stream: IOBase,
+    model: BaseModel | Any,
+    *,
+    model_type: Any = None,
+    adapter: TypeAdapter | None = None,
+    add_comments: CommentsOptions,
+    default_flow_style: bool | None,
+    indent: int | None,
+    map_indent: int | None,
+    sequence_indent: int | None,
+    sequence_dash_offset: int | None,
+    custom_yaml_writer: YAML | None,
+    engine: YamlEngine | None,
+    json_roundtrip: bool,
+    emit_json: bool,
+    use_anchors: bool,
+    **json_kwargs,
+) -> None:
+    """Write the model to the stream, with options already checked by `_check_dump_options()`.
+
+    With a `model_type`, the model is serialized by the adapter (the cached one, if not given).
+    """
+    if model_type is not None and adapter is None:
+        adapter = get_type_adapter(model_type)
+    rec = phase_recorder("dump", type(model) if model_type is None else model_type)
+    if emit_json:
+        text = _dump_yaml_json(model, indent=indent, adapter=adapter, **json_kwargs)
+        if text is not None:
+            if rec is not None:
+                rec.end("serialize", detail="json")
+            stream.write(text)
+            if rec is not None:
+                rec.end("emit", nbytes=len(text), documents=1, detail="json")
+            return
+        default_flow_style = True
+    val = _dump_json_compatible(model, json_roundtrip=json_roundtrip, adapter=adapter, **json_kwargs)
+    if use_anchors:
+        val = share_repeated_subtrees(val)
+    if rec is not None:
+        rec.end("serialize", nodes=count_nodes(val))
+    writer_ctx = _writer_context(
+        custom_yaml_writer,
+        engine=engine,
+        default_flow_style=default_flow_style,
+        indent=indent,
+        map_indent=map_indent,
+        sequence_indent=sequence_indent,
+        sequence_dash_offset=sequence_dash_offset,
+    )
+    start = None if rec is None else stream_position(stream)
+    with writer_ctx as writer:
+        # TODO: Configure writer further?
+        emitter = writer.Emitter
+        if add_comments is False:
             writer.dump(val, stream)
+        elif add_comments in (True, "fields-only", "models-only"):
+            ystruct = _commented_value(
+                val,
+                model,
+                writer=writer,
+                opts=add_comments,
+                flow_style=default_flow_style if custom_yaml_writer is None else None,
+            )
+            if rec is not None:
+                rec.end("comment")
+            if ystruct is not None:
+                with pooled_writer("rt") as rt_writer:
+                    emitter = rt_writer.Emitter
+                    rt_writer.dump(ystruct, stream)
+            else:
+                # Don't know what to do with this; just write the original value
+                writer.dump(val, stream)
+    if rec is not None:
+        end = None if start is None else stream_position(stream)
+        nbytes = None if end is None or start is None else end - start
+        rec.end("emit", nbytes=nbytes, documents=1, detail=engine_name(emitter))
 
 
 def to_yaml_str(
-    model: BaseModel,
+    model: BaseModel | Any,
     *,
+    model_type: Any = None,
     add_comments: CommentsOptions = False,
     default_flow_style: bool | None = False,
     indent: int | None = None,
@@ -188,14 +648,22 @@ def to_yaml_str(
     sequence_indent: int | None = None,
     sequence_dash_offset: int | None = None,
     custom_yaml_writer: YAML | None = None,
+    engine: YamlEngine | None = None,
+    json_roundtrip: bool = False,
+    emit_json: bool = False,
+    use_anchors: bool = False,
     **json_kwargs,
 ) -> str:
     """Generate a YAML string representation of the model.
 
     Parameters
     ----------
-    model : BaseModel
-        The model to convert.
+    model : BaseModel or Any
+        The model to convert, or a value of `model_type`.
+    model_type : None or Any
+        If given, the model is serialized as this type, e.g. `list[MyModel]` or
+        `dict[str, MyModel]`, in a single call of its (cached) `TypeAdapter`.
+        Otherwise, the model must be a `BaseModel`.
     add_comments : False or "all" or "fields-only" or "models-only"
         Whether to add comments to the output YAML using fields and/or model descriptions.
     default_flow_style : bool
@@ -207,19 +675,37 @@ def to_yaml_str(
         More specific indent values.
     custom_yaml_writer : None or YAML
         An instance of ruamel.yaml.YAML (or a subclass) to use as the writer.
-        The above options will be set on it, if given.
+        The above options will be set on it for the duration of the call, if given.
+    engine : None or "auto" or "c" or "pure"
+        The YAML engine to use: "c" for the libyaml-based emitter, "pure" for the pure-Python
+        one, or "auto" to use the C one if available. None uses the global default,
+        see `set_default_engine()`. Ignored when `custom_yaml_writer` is passed.
+    json_roundtrip : bool
+        If True, serialize via a JSON string, i.e. `json.loads(model.model_dump_json())`.
+        This is slower and uses more memory, and is only kept for backwards compatibility.
+    emit_json : bool
+        If True, write the model as JSON (which is valid flow-style YAML) straight from
+        `model.model_dump_json()`, which is much faster than the YAML emitter. `indent` sets
+        the JSON indentation; comments, custom writers and specific indents aren't supported.
+        Unlike the YAML output, keys are kept in field order. If the JSON can't be read back
+        the same way as YAML (e.g. with `ser_json_inf_nan="constants"`), flow-style YAML is written.
+    use_anchors : bool
+        If True, identical repeated subtrees (mappings and sequences) are written only once,
+        with an anchor, and then as aliases (e.g. `&id001` and `*id001`). This shrinks
+        the output of models with repeated parts. Comments aren't supported.
     json_kwargs : Any
-        Keyword arguments to pass `model.model_dump_json()`.
+        Keyword arguments to pass `model.model_dump()` (or `model.model_dump_json()`).
 
     Notes
     -----
-    This currently uses JSON dumping as an intermediary.
-    This means that you can use `json_encoders` in your model.
+    This uses JSON-mode serialization, i.e. `model.model_dump(mode="json")`, as an intermediary.
+    This means that you can use custom (JSON) serializers in your model.
     """
     stream = StringIO()
     _write_yaml_model(
         stream,
         model,
+        model_type=model_type,
         add_comments=add_comments,
         default_flow_style=default_flow_style,
         indent=indent,
@@ -227,16 +713,112 @@ def to_yaml_str(
         sequence_indent=sequence_indent,
         sequence_dash_offset=sequence_dash_offset,
         custom_yaml_writer=custom_yaml_writer,
+        engine=engine,
+        json_roundtrip=json_roundtrip,
+        emit_json=emit_json,
+        use_anchors=use_anchors,
         **json_kwargs,
     )
-    stream.seek(0)
-    return stream.read()
+    return stream.getvalue()  # unlike `seek()` and `read()`, this doesn't copy the buffer
+
+
+def to_yaml_bytes(
+    model: BaseModel | Any,
+    *,
+    model_type: Any = None,
+    add_comments: CommentsOptions = False,
+    default_flow_style: bool | None = False,
+    indent: int | None = None,
+    map_indent: int | None = None,
+    sequence_indent: int | None = None,
+    sequence_dash_offset: int | None = None,
+    custom_yaml_writer: YAML | None = None,
+    engine: YamlEngine | None = None,
+    json_roundtrip: bool = False,
+    emit_json: bool = False,
+    use_anchors: bool = False,
+    encoding: str = "utf-8",
+    **json_kwargs,
+) -> bytes:
+    """Generate an encoded YAML representation of the model.
+
+    This is the same as `to_yaml_str(model).encode(encoding)`, but the output is encoded
+    in chunks while it's written, so the whole output isn't kept as a `str` as well.
+
+    Parameters
+    ----------
+    model : BaseModel or Any
+        The model to convert, or a value of `model_type`.
+    model_type : None or Any
+        If given, the model is serialized as this type, e.g. `list[MyModel]` or
+        `dict[str, MyModel]`, in a single call of its (cached) `TypeAdapter`.
+        Otherwise, the model must be a `BaseModel`.
+    add_comments : False or "all" or "fields-only" or "models-only"
+        Whether to add comments to the output YAML using fields and/or model descriptions.
+    default_flow_style : bool
+        Whether to use "flow style" (more human-readable).
+        https://yaml.readthedocs.io/en/latest/detail.html?highlight=default_flow_style#indentation-of-block-sequences
+    indent : None or int
+        General indent value. Leave as None for the default.
+    map_indent, sequence_indent, sequence_dash_offset : None or int
+        More specific indent values.
+    custom_yaml_writer : None or YAML
+        An instance of ruamel.yaml.YAML (or a subclass) to use as the writer.
+        The above options will be set on it for the duration of the call, if given.
+    engine : None or "auto" or "c" or "pure"
+        The YAML engine to use: "c" for the libyaml-based emitter, "pure" for the pure-Python
+        one, or "auto" to use the C one if available. None uses the global default,
+        see `set_default_engine()`. Ignored when `custom_yaml_writer` is passed.
+    json_roundtrip : bool
+        If True, serialize via a JSON string, i.e. `json.loads(model.model_dump_json())`.
+        This is slower and uses more memory, and is only kept for backwards compatibility.
+    emit_json : bool
+        If True, write the model as JSON (which is valid flow-style YAML) straight from
+        `model.model_dump_json()`, which is much faster than the YAML emitter. `indent` sets
+        the JSON indentation; comments, custom writers and specific indents aren't supported.
+        Unlike the YAML output, keys are kept in field order. If the JSON can't be read back
+        the same way as YAML (e.g. with `ser_json_inf_nan="constants"`), flow-style YAML is written.
+    use_anchors : bool
+        If True, identical repeated subtrees (mappings and sequences) are written only once,
+        with an anchor, and then as aliases (e.g. `&id001` and `*id001`). This shrinks
+        the output of models with repeated parts. Comments aren't supported.
+    encoding : str
+        The encoding of the output.
+    json_kwargs : Any
+        Keyword arguments to pass `model.model_dump()` (or `model.model_dump_json()`).
+
+    Notes
+    -----
+    This uses JSON-mode serialization, i.e. `model.model_dump(mode="json")`, as an intermediary.
+    This means that you can use custom (JSON) serializers in your model.
+    """
+    stream = BytesIO()
+    with text_writer(stream, encoding) as f:
+        _write_yaml_model(
+            f,
+            model,
+            model_type=model_type,
+            add_comments=add_comments,
+            default_flow_style=default_flow_style,
+            indent=indent,
+            map_indent=map_indent,
+            sequence_indent=sequence_indent,
+            sequence_dash_offset=sequence_dash_offset,
+            custom_yaml_writer=custom_yaml_writer,
+            engine=engine,
+            json_roundtrip=json_roundtrip,
+            emit_json=emit_json,
+            use_anchors=use_anchors,
+            **json_kwargs,
+        )
+    return stream.getvalue()
 
 
 def to_yaml_file(
     file: Path | str | IOBase,
-    model: BaseModel,
+    model: BaseModel | Any,
     *,
+    model_type: Any = None,
     add_comments: CommentsOptions = False,
     default_flow_style: bool | None = False,
     indent: int | None = None,
@@ -244,6 +826,11 @@ def to_yaml_file(
     sequence_indent: int | None = None,
     sequence_dash_offset: int | None = None,
     custom_yaml_writer: YAML | None = None,
+    engine: YamlEngine | None = None,
+    json_roundtrip: bool = False,
+    emit_json: bool = False,
+    use_anchors: bool = False,
+    encoding: str = "utf-8",
     **json_kwargs,
 ) -> None:
     """Write a YAML file representation of the model.
@@ -251,9 +838,12 @@ def to_yaml_file(
     Parameters
     ----------
     file : Path or str or IOBase
-        The file path or stream to write to.
-    model : BaseModel
-        The model to write.
+        The file path or stream to write to. Binary streams are written to directly,
+        encoding the output in chunks.
+    model : BaseModel or Any
+        The model to write, or a value of `model_type`.
+    model_type : None or Any
+        If given, the model is serialized as this type, see `to_yaml_str()`.
     add_comments : False or "all" or "fields-only" or "models-only"
         Whether to add comments to the output YAML using fields and/or model descriptions.
     default_flow_style : bool
@@ -265,16 +855,36 @@ def to_yaml_file(
         More specific indent values.
     custom_yaml_writer : None or YAML
         An instance of ruamel.yaml.YAML (or a subclass) to use as the writer.
-        The above options will be set on it, if given.
+        The above options will be set on it for the duration of the call, if given.
+    engine : None or "auto" or "c" or "pure"
+        The YAML engine to use: "c" for the libyaml-based emitter, "pure" for the pure-Python
+        one, or "auto" to use the C one if available. None uses the global default,
+        see `set_default_engine()`. Ignored when `custom_yaml_writer` is passed.
+    json_roundtrip : bool
+        If True, serialize via a JSON string, i.e. `json.loads(model.model_dump_json())`.
+        This is slower and uses more memory, and is only kept for backwards compatibility.
+    emit_json : bool
+        If True, write the model as JSON (which is valid flow-style YAML) straight from
+        `model.model_dump_json()`, which is much faster than the YAML emitter. `indent` sets
+        the JSON indentation; comments, custom writers and specific indents aren't supported.
+        Unlike the YAML output, keys are kept in field order. If the JSON can't be read back
+        the same way as YAML (e.g. with `ser_json_inf_nan="constants"`), flow-style YAML is written.
+    use_anchors : bool
+        If True, identical repeated subtrees (mappings and sequences) are written only once,
+        with an anchor, and then as aliases (e.g. `&id001` and `*id001`). This shrinks
+        the output of models with repeated parts. Comments aren't supported.
+    encoding : str
+        The encoding of the output, for files and binary streams (text streams do their own).
     json_kwargs : Any
-        Keyword arguments to pass `model.model_dump_json()`.
+        Keyword arguments to pass `model.model_dump()` (or `model.model_dump_json()`).
 
     Notes
     -----
-    This currently uses JSON dumping as an intermediary.
-    This means that you can use `json_encoders` in your model.
+    This uses JSON-mode serialization, i.e. `model.model_dump(mode="json")`, as an intermediary.
+    This means that you can use custom (JSON) serializers in your model.
     """
     write_kwargs = dict(
+        model_type=model_type,
         add_comments=add_comments,
         default_flow_style=default_flow_style,
         indent=indent,
@@ -282,10 +892,21 @@ def to_yaml_file(
         sequence_indent=sequence_indent,
         sequence_dash_offset=sequence_dash_offset,
         custom_yaml_writer=custom_yaml_writer,
+        engine=engine,
+        json_roundtrip=json_roundtrip,
+        emit_json=emit_json,
+        use_anchors=use_anchors,
         **json_kwargs,
     )
+    write = partial(_write_yaml_model, model=model, **write_kwargs)
+    _write_file(write, file, encoding=encoding)
+
+
+def _write_file(write: Callable[[IOBase], None], file: Path | str | IOBase, *, encoding: str) -> None:
+    """Open the file (unless it's a stream) in text mode, and write to it."""
     if isinstance(file, IOBase):  # open file handle
-        _write_yaml_model(file, model, **write_kwargs)  # type: ignore
+        with text_writer(file, encoding) as f:
+            write(f)
         return
 
     if isinstance(file, str):  # local path to file
@@ -295,37 +916,163 @@ def to_yaml_file(
     else:
         raise TypeError(f"Expected Path, str, or stream, but got {file!r}")
 
-    with file.open(mode="w") as f:
-        _write_yaml_model(f, model, **write_kwargs)  # type: ignore
-        return
+    with file.open(mode="w", encoding=encoding) as f:
+        write(f)
 
 
-def parse_yaml_raw_as(model_type: type[T], raw: str | bytes | IOBase) -> T:
+def _as_stream(raw: str | BytesLike | IOBase) -> IOBase:
+    """Wrap raw YAML input into a stream, if required (without copying bytes-like objects)."""
+    if isinstance(raw, str):
+        return StringIO(raw)
+    elif isinstance(raw, bytes):
+        return BytesIO(raw)  # doesn't copy `bytes`
+    elif isinstance(raw, BytesLike):
+        return BufferStream(raw)
+    elif isinstance(raw, IOBase):
+        return raw
+    raise TypeError(f"Expected str, bytes-like or IO, but got {raw!r}")
+
+
+def _load_yaml(reader: YAML, stream: IOBase, keys: list[Any] | None) -> Any:
+    """Load the document of the stream, or only the node at the key path."""
+    if not keys:
+        return reader.load(stream)
+    with event_loader(reader, stream) as events:
+        if not events.start_document():
+            return lookup_key_path(None, keys)  # empty stream
+        return events.construct_at(keys)
+
+
+def parse_yaml_raw_as(
+    model_type: type[T],
+    raw: str | BytesLike | IOBase,
+    *,
+    engine: YamlEngine | None = None,
+    key_path: KeyPath | None = None,
+    memoize_aliases: bool = False,
+    schema_aware: bool = False,
+    json_fast_path: bool = True,
+) -> T:
     """Parse raw YAML string as the passed model type.
 
     Parameters
     ----------
     model_type : Type[BaseModel]
         The resulting model type.
-    raw : str or bytes or IOBase
-        The YAML string or stream.
+    raw : str or bytes or bytearray or memoryview or mmap or IOBase
+        The YAML string, encoded bytes (UTF-8 or UTF-16) or stream.
+        Bytes-like objects are read in chunks, without copying them.
+    engine : None or "auto" or "c" or "pure"
+        The YAML engine to use: "c" for the libyaml-based parser, "pure" for the pure-Python
+        one, or "auto" to use the C one if available. None uses the global default,
+        see `set_default_engine()`.
+    key_path : None or str or sequence of keys
+        If given, only the subtree at this path is validated, e.g. "services.api"
+        (or `["services", "api"]`; use a sequence for keys containing dots, non-string keys,
+        or integer indexes of sequences). Other branches of the document are skipped
+        while parsing, without constructing them; parsing stops after the subtree.
+        A `KeyError` is raised if the path doesn't exist.
+    memoize_aliases : bool
+        If True, nodes that are referenced by aliases (e.g. `*defaults`) are validated only once
+        where a model is expected, and the same model instance is used for every occurrence.
+        Don't modify such models, as the change shows up everywhere they're used.
+        Fields with "before" validators (or in models with them) are validated as usual.
+    schema_aware : bool
+        If True, plain scalars where the type expects a string (e.g. `str` fields, or keys of
+        models and `dict[str, ...]`) are read as strings directly, without matching them against
+        the implicit types (int, float, bool, null, timestamp). This is faster for documents
+        with many strings, and e.g. `version: 1.10` or `country: NO` (with YAML 1.1) keep
+        their text, instead of failing validation. Other positions (e.g. unions, `Any` or fields
+        with validators) are resolved as usual. Aliases get the value of their anchored node.
+    json_fast_path : bool
+        If True, a `str` or `bytes` input that is plain JSON (an object or array) is loaded with
+        the much faster `json` module instead, unless the YAML loader would read it differently.
+        Set to False to always use the YAML loader, e.g. if inputs are known not to be JSON.
     """
-    stream: IOBase
-    if isinstance(raw, str):
-        stream = StringIO(raw)
-    elif isinstance(raw, bytes):
-        stream = BytesIO(raw)
-    elif isinstance(raw, IOBase):
-        stream = raw
+    keys = None if key_path is None else split_key_path(key_path)
+    return _parse_raw(
+        model_type,
+        raw,
+        engine=engine,
+        keys=keys,
+        memoize_aliases=memoize_aliases,
+        schema_aware=schema_aware,
+        json_fast_path=json_fast_path,
+    )
+
+
+def _parse_raw(
+    model_type: Any,
+    raw: str | BytesLike | IOBase,
+    *,
+    engine: YamlEngine | None,
+    keys: list[Any] | None,
+    memoize_aliases: bool,
+    schema_aware: bool = False,
+    json_fast_path: bool = True,
+    adapter: TypeAdapter | None = None,
+) -> Any:
+    """Parse and validate raw YAML, using the adapter (if given) instead of the cached one."""
+    rec = phase_recorder("load", model_type)
+    objects = NOT_JSON
+    if json_fast_path and isinstance(raw, str | bytes):
+        objects = load_json_subset(raw)
+        if rec is not None and objects is not NOT_JSON:
+            rec.end("parse", nbytes=len(raw), documents=1, nodes=count_nodes(objects), detail="json")
+        if keys is not None and objects is not NOT_JSON:
+            objects = lookup_key_path(objects, keys)
+    if objects is NOT_JSON:
+        stream = _as_stream(raw)
+        schema = None
+        if schema_aware:
+            schema = scalar_schema(model_type)
+            if keys and schema is not None:
+                schema = key_path_schema(schema, keys)
+        resolver = None if schema is None else SchemaResolver
+        try:
+            with (
+                pooled_reader("safe", engine=engine, resolver=resolver) as reader,  # YAML 1.2 support
+                nullcontext() if schema is None else schema_scope(schema),
+            ):
+                if rec is None:
+                    objects = _load_yaml(reader, stream, keys)
+                else:
+                    counter = CountingReader(stream)
+                    objects = _load_yaml(reader, counter, keys)
+                    rec.emit("read", counter.seconds, nbytes=counter.nbytes)
+                    rec.end(
+                        "parse",
+                        exclude=counter.seconds,
+                        nbytes=counter.nbytes,
+                        documents=1,
+                        nodes=count_nodes(objects),
+                        detail=engine_name(reader.Parser),
+                    )
+        finally:
+            if stream is not raw:
+                stream.close()  # releases wrapped buffers, even on errors
+    ta = get_type_adapter(model_type) if adapter is None else adapter
+    if rec is not None:
+        rec.end("adapter")
+    if memoize_aliases:
+        res = validate_memoized(model_type, ta, objects)
     else:
-        raise TypeError(f"Expected str, bytes or IO, but got {raw!r}")
-    reader = YAML(typ="safe", pure=True)  # YAML 1.2 support
-    objects = reader.load(stream)
-    ta = TypeAdapter(model_type)
-    return ta.validate_python(objects)
+        res = ta.validate_python(objects)
+    if rec is not None:
+        rec.end("validate")
+    return res
 
 
-def parse_yaml_file_as(model_type: type[T], file: Path | str | IOBase) -> T:
+def parse_yaml_file_as(
+    model_type: type[T],
+    file: Path | str | IOBase,
+    *,
+    engine: YamlEngine | None = None,
+    memory_map: bool = False,
+    key_path: KeyPath | None = None,
+    memoize_aliases: bool = False,
+    schema_aware: bool = False,
+) -> T:
     """Parse YAML file as the passed model type.
 
     Parameters
@@ -334,10 +1081,41 @@ def parse_yaml_file_as(model_type: type[T], file: Path | str | IOBase) -> T:
         The resulting model type.
     file : Path or str or IOBase
         The file path or stream to read from.
+    engine : None or "auto" or "c" or "pure"
+        The YAML engine to use: "c" for the libyaml-based parser, "pure" for the pure-Python
+        one, or "auto" to use the C one if available. None uses the global default,
+        see `set_default_engine()`.
+    memory_map : bool
+        If True, memory-map the file instead of reading it through a file buffer.
+        This can reduce memory use and system calls for large files. Ignored for streams.
+    key_path : None or str or sequence of keys
+        If given, only the subtree at this path is validated, see `parse_yaml_raw_as()`.
+    memoize_aliases : bool
+        If True, aliased nodes are validated only once, see `parse_yaml_raw_as()`.
+    schema_aware : bool
+        If True, plain scalars are read as strings where the type expects them,
+        see `parse_yaml_raw_as()`.
+
+    Notes
+    -----
+    Files are read in binary mode; the encoding (UTF-8 or UTF-16) is detected by the parser.
     """
+    parse = partial(
+        parse_yaml_raw_as,
+        model_type,
+        engine=engine,
+        key_path=key_path,
+        memoize_aliases=memoize_aliases,
+        schema_aware=schema_aware,
+    )
+    return _parse_file(parse, file, memory_map=memory_map)
+
+
+def _parse_file(parse: Callable[[Any], T], file: Path | str | IOBase, *, memory_map: bool) -> T:
+    """Open the file (unless it's a stream) in binary mode, or memory-map it, and parse it."""
     # Short-circuit
     if isinstance(file, IOBase):
-        return parse_yaml_raw_as(model_type, raw=file)
+        return parse(file)
 
     if isinstance(file, str):
         file = Path(file).resolve()
@@ -346,5 +1124,8 @@ def parse_yaml_file_as(model_type: type[T], file: Path | str | IOBase) -> T:
     else:
         raise TypeError(f"Expected Path, str or IO, but got {file!r}")
 
-    with file.open(mode="r") as f:
-        return parse_yaml_raw_as(model_type, f)
+    if memory_map:
+        with open_memory_map(file) as f:
+            return parse(f)
+    with file.open(mode="rb") as f:
+        return parse(f)
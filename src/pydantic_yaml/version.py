@@ -1,11 +1,16 @@
 """Gets the version, either installed or dynamically.
 
+The version is only computed when `__version__` is first accessed, as computing it
+dynamically (with `hatchling`) is slow. The installed package metadata is tried first.
+
 Adapted from:
 https://github.com/maresb/hatch-vcs-footgun-example/blob/main/hatch_vcs_footgun_example/version.py
 """
 
 __all__ = ["__version__"]
 
+__version__: str  # computed by `__getattr__()` on first access
+
 
 def __get_hatch_version() -> str:
     """Compute the most up-to-date version number in a development environment.
@@ -57,12 +62,17 @@ def __get_importlib_metadata_version():
 
 def __get_version() -> str:
     try:
-        return __get_hatch_version()
+        return __get_importlib_metadata_version()
     except Exception:
         try:
-            return __get_importlib_metadata_version()
+            return __get_hatch_version()
         except Exception:
             return "0.0.0"
 
 
-__version__ = __get_version()
+def __getattr__(name: str) -> str:
+    """Compute `__version__` on first access, and cache it."""
+    if name == "__version__":
+        value = globals()["__version__"] = __get_version()
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,63 @@
+"""Tests for the `TypeAdapter` cache."""
+
+from threading import Thread
+from typing import Union
+
+from pydantic import BaseModel, create_model
+
+from pydantic_yaml import adapter_cache_info, clear_adapter_cache, parse_yaml_raw_as
+from pydantic_yaml._internals.adapters import _AdapterCache, get_type_adapter
+from pydantic_yaml.examples.base_models import A, B
+
+
+def test_adapter_reused():
+    """Test that repeated parsing reuses the same adapter."""
+    clear_adapter_cache()
+    assert get_type_adapter(A) is get_type_adapter(A)
+    parse_yaml_raw_as(A, "a: x")
+    info = adapter_cache_info()
+    assert info.misses == 1
+    assert info.hits == 2
+    assert info.currsize == 1
+    clear_adapter_cache()
+    assert adapter_cache_info().currsize == 0
+
+
+def test_union_order_kept():
+    """Unions compare equal regardless of order, but must not share adapters."""
+    ta_ab = get_type_adapter(Union[A, B])  # noqa: UP007
+    ta_ba = get_type_adapter(Union[B, A])  # noqa: UP007
+    assert ta_ab is not ta_ba
+
+
+def test_lru_eviction():
+    """Test that dynamically created models are evicted from a bounded cache."""
+    cache = _AdapterCache(maxsize=4)
+    models: list[type[BaseModel]] = [create_model(f"M{i}", x=(int, 0)) for i in range(10)]
+    for mdl in models:
+        cache.get(mdl)
+    assert cache.info().currsize == 4
+    # Most recent ones are kept
+    assert cache.get(models[-1]) is cache.get(models[-1])
+    assert cache.info().hits == 2
+
+
+def test_threaded_access():
+    """Test concurrent parsing with a shared cache."""
+    clear_adapter_cache()
+    errors: list[Exception] = []
+
+    def _work():
+        try:
+            for _ in range(50):
+                assert parse_yaml_raw_as(A, "a: x") == A(a="x")
+        except Exception as e:  # pragma: no cover
+            errors.append(e)
+
+    threads = [Thread(target=_work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert adapter_cache_info().currsize == 1
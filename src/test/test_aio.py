@@ -0,0 +1,90 @@
+"""Tests for the asyncio API."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from pydantic_yaml import (
+    DocumentError,
+    aparse_yaml_file_as,
+    aparse_yaml_raw_as,
+    aparse_yaml_stream_as,
+    ato_yaml_file,
+    ato_yaml_str,
+    to_yaml_str,
+)
+from pydantic_yaml.examples.base_models import A, CommentedModel
+
+
+def test_aio_file_roundtrip(tmp_path: Path):
+    """Test writing and reading files asynchronously, with an executor and a concurrency limit."""
+
+    async def main() -> list[A]:
+        executor = ThreadPoolExecutor(max_workers=4)
+        limit = asyncio.Semaphore(2)
+        paths = [tmp_path / f"{i}.yaml" for i in range(8)]
+        await asyncio.gather(
+            *(ato_yaml_file(fn, A(a=fn.stem), executor=executor, semaphore=limit) for fn in paths)
+        )
+        return await asyncio.gather(
+            *(aparse_yaml_file_as(A, fn, executor=executor, semaphore=limit) for fn in paths)
+        )
+
+    assert asyncio.run(main()) == [A(a=str(i)) for i in range(8)]
+
+
+def test_aio_str():
+    """Test that options are passed through, and that errors are raised in the caller."""
+    mdl = CommentedModel(a=1, b=2.0)
+
+    async def main() -> str:
+        assert await aparse_yaml_raw_as(A, "a: x") == A(a="x")
+        with pytest.raises(ValidationError):
+            await aparse_yaml_raw_as(A, "b: x")
+        return await ato_yaml_str(mdl, add_comments=True)
+
+    assert asyncio.run(main()) == to_yaml_str(mdl, add_comments=True)
+
+
+def test_aio_parse_options(tmp_path: Path):
+    """Test that the options of the sync parse functions are passed through, e.g. `key_path`."""
+    fn = tmp_path / "config.yaml"
+    fn.write_text("services:\n  api: {a: x}\n  db: {a: 'no'}\n")
+
+    async def main() -> list[A]:
+        return [
+            await aparse_yaml_raw_as(A, fn.read_text(), key_path="services.api"),
+            await aparse_yaml_file_as(A, fn, key_path=["services", "db"], schema_aware=True),
+        ]
+
+    assert asyncio.run(main()) == [A(a="x"), A(a="no")]
+
+
+def test_aio_stream(tmp_path: Path):
+    """Test iterating over a multi-document file asynchronously."""
+    fn = tmp_path / "docs.yaml"
+    fn.write_text("a: x\n---\nb: 1\n---\na: y\n---\na: z\n")
+    errors: list[DocumentError] = []
+
+    async def main() -> list[A]:
+        return [doc async for doc in aparse_yaml_stream_as(A, fn, on_error="skip", errors=errors)]
+
+    assert asyncio.run(main()) == [A(a="x"), A(a="y"), A(a="z")]
+    assert [err.document_index for err in errors] == [1]
+
+
+def test_aio_stream_cancel(tmp_path: Path):
+    """Test that stopping early (or cancelling) closes the file."""
+    fn = tmp_path / "docs.yaml"
+    fn.write_text("a: x\n---\na: y\n---\na: z\n")
+
+    async def main() -> A:
+        docs = aparse_yaml_stream_as(A, fn)
+        first = await docs.__anext__()
+        await docs.aclose()
+        return first
+
+    assert asyncio.run(main()) == A(a="x")
@@ -0,0 +1,131 @@
+"""Tests for anchors and aliases: memoized validation, and anchor-emitting dumps."""
+
+import pytest
+from pydantic import BaseModel, ValidationError, field_validator
+
+from pydantic_yaml import parse_yaml_raw_as, to_yaml_str
+from pydantic_yaml._internals.aliases import share_repeated_subtrees
+
+
+class Defaults(BaseModel):
+    """Shared defaults."""
+
+    retries: int
+    tags: list[str] = []
+
+
+class Entry(BaseModel):
+    """Entry using the defaults."""
+
+    name: str
+    defaults: Defaults
+    fallback: Defaults | None = None
+
+
+class Config(BaseModel):
+    """Top-level config."""
+
+    entries: list[Entry]
+    by_name: dict[str, Defaults] = {}
+
+
+class CheckedEntry(BaseModel):
+    """Entry with a "before" field validator, which must see the raw input."""
+
+    defaults: Defaults
+
+    @field_validator("defaults", mode="before")
+    @classmethod
+    def _check(cls, v):
+        """Check that the input isn't validated yet."""
+        assert isinstance(v, dict)
+        return v
+
+
+class Points(BaseModel):
+    """Lists of coordinates."""
+
+    points: list[list[float]]
+
+
+raw = """
+base: &d {retries: 3, tags: [a, b]}
+entries:
+  - {name: x, defaults: *d, fallback: *d}
+  - {name: y, defaults: *d}
+by_name: {z: *d}
+"""
+
+
+def test_memoize_aliases():
+    """Test that aliased nodes are validated once, and instances are shared."""
+    plain = parse_yaml_raw_as(Config, raw)
+    memo = parse_yaml_raw_as(Config, raw, memoize_aliases=True)
+    assert memo == plain
+    assert plain.entries[0].defaults is not plain.entries[1].defaults
+    shared = memo.entries[0].defaults
+    assert memo.entries[0].fallback is shared
+    assert memo.entries[1].defaults is shared
+    assert memo.by_name["z"] is shared
+
+
+def test_memoize_aliases_before_validators():
+    """Test that fields with "before" validators get the raw input."""
+    raw_entries = "- defaults: &d {retries: 1}\n- defaults: *d\n"
+    res = parse_yaml_raw_as(list[CheckedEntry], raw_entries, memoize_aliases=True)
+    assert res[0].defaults is not res[1].defaults
+
+
+def test_memoize_aliases_errors():
+    """Test that errors are the same as without memoization."""
+    bad = raw.replace("retries: 3", "retries: three")
+    with pytest.raises(ValidationError) as plain_info:
+        parse_yaml_raw_as(Config, bad)
+    with pytest.raises(ValidationError) as memo_info:
+        parse_yaml_raw_as(Config, bad, memoize_aliases=True)
+    assert memo_info.value.errors() == plain_info.value.errors()
+
+
+def test_dump_anchors():
+    """Test that repeated subtrees are written as anchors and aliases."""
+    mdl = parse_yaml_raw_as(Config, raw)
+    text = to_yaml_str(mdl, use_anchors=True)
+    assert text.count("&id001") == 1
+    assert text.count("*id001") == 3
+    assert len(text) < len(to_yaml_str(mdl))
+    assert parse_yaml_raw_as(Config, text) == mdl
+
+
+def test_dump_anchors_small_subtrees():
+    """Test that small subtrees aren't replaced by aliases."""
+    entries = [Entry(name="x", defaults=Defaults(retries=i, tags=["a", "b"])) for i in range(2)]
+    mdl = Config(entries=entries)
+    assert to_yaml_str(mdl, use_anchors=True) == to_yaml_str(mdl)
+
+
+@pytest.mark.parametrize("kwargs", [dict(add_comments=True), dict(emit_json=True)])
+def test_dump_anchors_unsupported(kwargs: dict):
+    """Test that anchors can't be combined with comments or JSON output."""
+    with pytest.raises(ValueError):
+        to_yaml_str(Config(entries=[]), use_anchors=True, **kwargs)
+
+
+def test_share_repeated_subtrees():
+    """Test that only identical subtrees (incl. scalar types) are shared."""
+    val = share_repeated_subtrees(
+        {"a": {"x": 1, "y": [1, 2]}, "b": {"x": 1, "y": [1, 2]}, "c": {"x": True, "y": [1, 2]}}
+    )
+    assert val["a"] is val["b"]
+    assert val["c"] is not val["a"]
+    assert val["a"]["y"] is not val["c"]["y"]  # too small
+
+
+def test_share_repeated_subtrees_signed_zeros():
+    """Test that subtrees are only shared if their floats are the same, incl. the sign of zeros."""
+    val = share_repeated_subtrees({"a": [0.0, 1.0, 2.0], "b": [-0.0, 1.0, 2.0], "c": [0.0, 1.0, 2.0]})
+    assert val["a"] is val["c"]
+    assert val["b"] is not val["a"]
+    mdl = Points(points=[[0.0, 1.0, 2.0], [-0.0, 1.0, 2.0]])
+    text = to_yaml_str(mdl, use_anchors=True)
+    assert text == to_yaml_str(mdl)
+    assert str(parse_yaml_raw_as(Points, text).points[1][0]) == "-0.0"
@@ -0,0 +1,60 @@
+"""Tests for parsing many files at once."""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+from ruamel.yaml import YAMLError
+
+from pydantic_yaml import FileResult, parse_yaml_files_as
+from pydantic_yaml.examples.base_models import A
+
+
+@pytest.fixture
+def configs(tmp_path: Path) -> Path:
+    """Directory with some valid and invalid files."""
+    for i in range(10):
+        (tmp_path / f"good_{i}.yaml").write_text(f"a: v{i}\n")
+    (tmp_path / "invalid.yaml").write_text("b: 1\n")
+    (tmp_path / "broken.yaml").write_text("a: [\n")
+    (tmp_path / "other.yml").write_text("a: other\n")
+    return tmp_path
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_batch_directory(configs: Path, executor):
+    """Test parsing a directory, keeping the (sorted) order and collecting errors."""
+    results = list(parse_yaml_files_as(A, configs, executor=executor, max_workers=2))
+    assert [res.path.name for res in results] == sorted(p.name for p in configs.glob("*.yaml"))
+    by_name = {res.path.name: res for res in results}
+    assert by_name["good_3.yaml"] == FileResult(configs / "good_3.yaml", value=A(a="v3"))
+    assert isinstance(by_name["invalid.yaml"].error, ValidationError)
+    assert isinstance(by_name["broken.yaml"].error, YAMLError)
+    assert sum(res.ok for res in results) == 10
+
+
+def test_batch_paths(configs: Path):
+    """Test parsing a list of paths (and a pattern for directories), including missing files."""
+    files: list[Path | str] = [str(configs / "good_1.yaml"), configs / "missing.yaml", configs]
+    results = list(parse_yaml_files_as(A, files, pattern="*.yml"))
+    assert results[0].value == A(a="v1")
+    assert isinstance(results[1].error, FileNotFoundError)
+    assert results[1].value is None
+    assert results[2].value == A(a="other")
+    assert len(results) == 3
+
+
+def test_batch_as_completed(configs: Path):
+    """Test yielding results as they complete, on a user-supplied executor."""
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        results = list(parse_yaml_files_as(A, configs, executor=executor, ordered=False))
+        # The executor isn't shut down
+        assert executor.submit(int, "1").result() == 1
+    assert {res.path for res in results} == set(configs.glob("*.yaml"))
+
+
+def test_batch_bad_executor(configs: Path):
+    """Test that invalid executors are rejected early."""
+    with pytest.raises(ValueError):
+        parse_yaml_files_as(A, configs, executor="fibers")  # type: ignore
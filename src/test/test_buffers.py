@@ -0,0 +1,101 @@
+"""Tests for parsing bytes-like objects and memory-mapped files, and writing bytes."""
+
+import mmap
+from io import BytesIO, StringIO
+from pathlib import Path
+
+import pytest
+from ruamel.yaml.composer import ComposerError
+
+from pydantic_yaml import (
+    parse_yaml_file_as,
+    parse_yaml_raw_as,
+    parse_yaml_stream_as,
+    to_yaml_bytes,
+    to_yaml_file,
+    to_yaml_str,
+)
+from pydantic_yaml._internals.buffers import BufferStream, text_writer
+from pydantic_yaml.examples.base_models import A, UsesRefs, root
+
+raw = "a: ü\r\n".encode()
+
+
+@pytest.mark.parametrize("buf", [raw, bytearray(raw), memoryview(raw), memoryview(bytearray(raw))])
+def test_parse_bytes_like(buf):
+    """Test parsing bytes-like objects (with non-ASCII text and CRLF line breaks)."""
+    assert parse_yaml_raw_as(A, buf) == A(a="ü")
+
+
+def test_parse_utf16():
+    """Test that the encoding of bytes is detected."""
+    assert parse_yaml_raw_as(A, "﻿a: ü\n".encode("utf-16-le")) == A(a="ü")
+
+
+def test_parse_mmap(tmp_path: Path):
+    """Test parsing a user-supplied memory map, which can be closed afterwards."""
+    fn = tmp_path / "docs.yaml"
+    fn.write_bytes(raw + b"---\n" + raw)
+    with fn.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        assert list(parse_yaml_stream_as(A, mm)) == [A(a="ü"), A(a="ü")]
+        with pytest.raises(ComposerError):
+            parse_yaml_raw_as(A, mm)  # expects a single document
+
+
+@pytest.mark.parametrize("memory_map", [False, True])
+def test_parse_file_memory_map(memory_map: bool, tmp_path: Path):
+    """Test parsing files with and without memory-mapping."""
+    expected = parse_yaml_file_as(UsesRefs, root / "uses_refs.yaml")
+    assert parse_yaml_file_as(UsesRefs, root / "uses_refs.yaml", memory_map=memory_map) == expected
+    (tmp_path / "empty.yaml").write_bytes(b"")
+    (tmp_path / "crlf.yaml").write_bytes(raw)
+    assert parse_yaml_file_as(A, tmp_path / "crlf.yaml", memory_map=memory_map) == A(a="ü")
+    with pytest.raises(ValueError):
+        parse_yaml_file_as(A, tmp_path / "empty.yaml", memory_map=memory_map)
+
+
+def test_buffer_stream_releases():
+    """Test that closing the stream releases the buffer."""
+    buf = bytearray(b"a: b")
+    with BufferStream(buf) as stream:
+        assert stream.read(2) == b"a:"
+        assert stream.read() == b" b"
+        assert stream.read() == b""
+    buf.extend(b"c")  # would fail with an exported buffer
+
+
+@pytest.mark.parametrize("kwargs", [dict(), dict(add_comments=True), dict(emit_json=True)])
+@pytest.mark.parametrize("encoding", ["utf-8", "utf-16", "latin-1"])
+def test_dump_bytes(encoding: str, kwargs: dict):
+    """Test that dumping bytes is the same as encoding the dumped string."""
+    mdl = A(a="ü")
+    expected = to_yaml_str(mdl, **kwargs).encode(encoding)
+    assert to_yaml_bytes(mdl, encoding=encoding, **kwargs) == expected
+    stream = BytesIO()
+    to_yaml_file(stream, mdl, encoding=encoding, **kwargs)
+    assert stream.getvalue() == expected
+    if encoding != "latin-1":  # YAML input must be UTF-8 or UTF-16
+        assert parse_yaml_raw_as(A, expected) == mdl
+
+
+def test_dump_file_encoding(tmp_path: Path):
+    """Test writing files and binary file handles with an encoding."""
+    mdl = A(a="ü")
+    to_yaml_file(tmp_path / "a.yaml", mdl, encoding="utf-16")
+    assert (tmp_path / "a.yaml").read_bytes() == "\ufeffa: ü\n".encode("utf-16-le")
+    with (tmp_path / "b.yaml").open("wb") as f:
+        to_yaml_file(f, mdl)
+        assert not f.closed
+    assert (tmp_path / "b.yaml").read_bytes() == "a: ü\n".encode()
+
+
+def test_text_writer():
+    """Test that text streams are used as-is, and binary streams are left open."""
+    text = StringIO()
+    with text_writer(text, "utf-8") as f:
+        assert f is text
+    raw_stream = BytesIO()
+    with text_writer(raw_stream, "utf-16-le") as f:
+        f.write("ü")
+    assert raw_stream.getvalue() == "ü".encode("utf-16-le")
+    assert not raw_stream.closed
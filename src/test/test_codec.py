@@ -0,0 +1,111 @@
+"""Tests for the reusable `YamlCodec`."""
+
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from pydantic_yaml import (
+    YamlCodec,
+    parse_yaml_raw_as,
+    record_phases,
+    set_default_engine,
+    to_yaml_bytes,
+    to_yaml_str,
+)
+from pydantic_yaml.examples.base_models import A, CommentedModel, UsesRefs
+
+refs = UsesRefs.model_validate(
+    {"bill-to": {"given": "A", "family": "B"}, "ship-to": {"given": "C", "family": "D"}}
+)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        dict(),
+        dict(indent=4, add_comments="fields-only"),
+        dict(add_comments=True, default_flow_style=True),
+        dict(emit_json=True, indent=2),
+        dict(by_alias=True, exclude_none=True),
+    ],
+)
+def test_codec_same_as_functions(kwargs: dict):
+    """Test that the codec gives the same output as the functions with the same options."""
+    codec = YamlCodec(UsesRefs, **kwargs)
+    text = codec.dump(refs)
+    assert text == to_yaml_str(refs, **kwargs)
+    assert codec.dump_bytes(refs) == to_yaml_bytes(refs, **kwargs)
+    assert codec.load(text) == parse_yaml_raw_as(UsesRefs, text) == refs
+
+
+def test_codec_files(tmp_path: Path):
+    """Test loading and dumping files and streams."""
+    fn = tmp_path / "a.yaml"
+    for codec in (YamlCodec(A), YamlCodec(A, memory_map=True, encoding="utf-16")):
+        codec.dump_file(fn, A(a="x"))
+        assert codec.load_file(fn) == A(a="x")
+        assert codec.load_file(str(fn)) == A(a="x")
+        buf = BytesIO()
+        codec.dump_file(buf, A(a="y"))
+        assert codec.load_file(BytesIO(buf.getvalue())) == A(a="y")
+
+
+def test_codec_load_options():
+    """Test the loading options, and non-model types."""
+    codec = YamlCodec(A, key_path="x.1")
+    assert codec.load("x: [{a: p}, {a: q}]") == A(a="q")
+    assert YamlCodec(list[A]).load("- a: p\n") == [A(a="p")]
+    with record_phases() as events:
+        YamlCodec(A).load("a: x")
+    assert [ev.phase for ev in events] == ["read", "parse", "adapter", "validate"]
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        dict(add_comments="all"),
+        dict(emit_json=True, add_comments=True),
+        dict(emit_json=True, map_indent=2),
+        dict(use_anchors=True, add_comments=True),
+        dict(engine="fast"),
+        dict(encoding="nope"),
+    ],
+)
+def test_codec_invalid_options(kwargs: dict[str, Any]):
+    """Test that invalid options fail when the codec is created."""
+    with pytest.raises((ValueError, LookupError)):
+        YamlCodec(A, **kwargs)
+
+
+def test_codec_dump_wrong_type():
+    """Test that only models can be dumped."""
+    with pytest.raises(TypeError):
+        YamlCodec(A).dump({"a": "x"})  # type: ignore[arg-type]
+
+
+def test_codec_engine_frozen():
+    """Test that the engine is resolved when the codec is created."""
+    codec = YamlCodec(A)
+    set_default_engine("auto")
+    try:
+        assert repr(codec) == "YamlCodec(A, engine='pure')"
+        assert repr(YamlCodec(A)) == "YamlCodec(A, engine='auto')"
+    finally:
+        set_default_engine("pure")
+
+
+def test_codec_threads():
+    """Test that a codec can be shared across threads."""
+    codec = YamlCodec(CommentedModel, add_comments=True)
+    expected = to_yaml_str(CommentedModel(), add_comments=True)
+
+    def _roundtrip(i: int) -> str:
+        text = codec.dump(CommentedModel(ann1=i))
+        assert codec.load(text) == CommentedModel(ann1=i)
+        return codec.dump(CommentedModel())
+
+    with ThreadPoolExecutor(8) as pool:
+        assert set(pool.map(_roundtrip, range(64))) == {expected}
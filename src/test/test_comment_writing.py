@@ -3,11 +3,12 @@
 from pathlib import Path
 
 import pytest
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, RootModel, SerializeAsAny
+from ruamel.yaml import YAML
 
 from pydantic_yaml import parse_yaml_file_as, to_yaml_str
-from pydantic_yaml._internals.v2 import CommentsOptions
-from pydantic_yaml.examples.base_models import CommentedModel, UsesRefs, commented, root
+from pydantic_yaml._internals.v2 import CommentsOptions, _get_comment_plan
+from pydantic_yaml.examples.base_models import CommentedModel, UsesRefs, _Name, commented, root
 
 sub_ps: dict[CommentsOptions, Path] = {
     False: commented / "false",
@@ -55,3 +56,122 @@ def test_load_rt_simple_files(model_type: type[BaseModel], fn: str):
         got_i = to_yaml_str(obj, add_comments=add_c)
         expected_i = (commented / sub_p / fn).read_text()
         assert eq_within_spaces(got_i, expected_i), "Comments not as expected."
+
+
+@pytest.mark.parametrize("add_c", list(sub_ps.keys()))
+def test_comments_exact(add_c: CommentsOptions):
+    """Test that comments are written byte-for-byte as in the example files."""
+    obj = parse_yaml_file_as(UsesRefs, root / "uses_refs.yaml")
+    got = to_yaml_str(obj, add_comments=add_c)
+    assert got == (sub_ps[add_c] / "uses_refs.yaml").read_text()
+
+
+class _Item(BaseModel):
+    """An item."""
+
+    name: str = Field("x", description="The name")
+    tags: list[str] = []
+    extra: dict[str, int] = {}
+
+
+class _Outer(BaseModel):
+    """Outer model."""
+
+    items: list[_Item] = Field(description="Some items")
+    by_key: dict[str, _Item] = Field(description="Items by key")
+    nested: list[list[_Item]] = []
+    sub: UsesRefs | None = None
+
+
+class _RootItems(RootModel[list[_Item]]):
+    """Root model of items."""
+
+
+_outer = _Outer(
+    items=[_Item(), _Item(name="y", tags=["a", "b"])],
+    by_key={"k": _Item(extra={"q": 1}), "a": _Item()},
+    nested=[[_Item()], []],
+    sub=UsesRefs(bill_to=_Name(given="A", family="B"), ship_to=_Name(given="C", family="D")),
+)
+
+
+@pytest.mark.parametrize("model", [_outer, _RootItems([_Item(), _Item(name="z")])])
+@pytest.mark.parametrize("add_c", [True, "fields-only", "models-only"])
+def test_comments_same_as_reparse(model: BaseModel, add_c: CommentsOptions):
+    """Test that building comments directly gives the same output as re-parsing the dumped YAML."""
+    # A custom writer uses the (slower) dump, re-parse and annotate approach
+    writer = YAML(typ="safe", pure=True)
+    assert to_yaml_str(model, add_comments=add_c) == to_yaml_str(
+        model, add_comments=add_c, custom_yaml_writer=writer
+    )
+
+
+class _Plain(BaseModel):
+    x: int = 1
+    values: list[int] = [1, 2]
+
+
+class _HasPlain(BaseModel):
+    """Has plain items."""
+
+    plain: list[_Plain] = Field(default_factory=lambda: [_Plain()], description="Plain items")
+    item: _Item = Field(default_factory=lambda: _Item(name="x"))
+
+
+def test_comment_plan():
+    """Test that comment plans are cached per class and find subtrees that can have comments."""
+    plan = _get_comment_plan(_HasPlain, True)
+    assert plan is _get_comment_plan(_HasPlain, True)
+    assert plan.model_comment == "Has plain items."
+    assert plan.field_comments == {"plain": "Plain items"}
+    assert plan.subtree_fields == {"item"}
+    assert plan.subclass_fields == {"plain"}
+    assert plan.has_comments
+
+    assert not _get_comment_plan(_Plain, True).has_comments
+    assert _get_comment_plan(_HasPlain, "fields-only").model_comment is None
+    # Only `_Item` has a field description (and `UsesRefs` has `_Name` with descriptions)
+    fields_plan = _get_comment_plan(_Outer, "fields-only")
+    assert fields_plan.subtree_fields == {"items", "by_key", "nested", "sub"}
+
+
+def test_comments_skip_plain_subtrees():
+    """Test that subtrees without comments are written as usual."""
+    got = to_yaml_str(_HasPlain(), add_comments=True)
+    assert got == (
+        "# Has plain items.\n"
+        "item:\n"
+        "  # An item.\n"
+        "  extra: {}\n"
+        "  name: x  # The name\n"
+        "  tags: []\n"
+        "plain:  # Plain items\n"
+        "- values:\n"
+        "  - 1\n"
+        "  - 2\n"
+        "  x: 1\n"
+    )
+    writer = YAML(typ="safe", pure=True)
+    assert got == to_yaml_str(_HasPlain(), add_comments=True, custom_yaml_writer=writer)
+
+
+class _DocumentedPlain(_Plain):
+    """Documented subclass."""
+
+    y: int = Field(default=2, description="why")
+
+
+class _HasAnyPlain(BaseModel):
+    one: SerializeAsAny[_Plain] = Field(default_factory=lambda: _DocumentedPlain())
+    many: list[SerializeAsAny[_Plain]] = Field(default_factory=lambda: [_Plain(), _DocumentedPlain()])
+
+
+@pytest.mark.parametrize("model", [_HasAnyPlain(), _HasAnyPlain(one=_Plain(), many=[_Plain()])])
+def test_comments_of_subclasses(model: _HasAnyPlain):
+    """Test that comments of subclass instances are written, though the declared types have none."""
+    got = to_yaml_str(model, add_comments=True)
+    writer = YAML(typ="safe", pure=True)
+    assert got == to_yaml_str(model, add_comments=True, custom_yaml_writer=writer)
+    has_sub = isinstance(model.one, _DocumentedPlain)
+    assert ("# Documented subclass." in got) == has_sub
+    assert ("y: 2  # why" in got) == has_sub
@@ -3,8 +3,14 @@
 import pytest
 from pydantic import BaseModel
 
-from pydantic_yaml import to_yaml_str
-from pydantic_yaml.examples.base_models import HasEnums
+from pydantic_yaml import parse_yaml_raw_as, to_yaml_str
+from pydantic_yaml.examples.base_models import (
+    CustomRootListStr,
+    HasEnums,
+    SecretTstModelDumpable,
+    UsesRefs,
+    _Name,
+)
 from pydantic_yaml.examples.common import MyIntEnum, MyStrEnum
 
 has_enums = HasEnums(opts=MyStrEnum.option1, vals=[MyIntEnum.v1, MyIntEnum.v2])
@@ -23,3 +29,83 @@ def test_dump_kwargs(mdl: BaseModel, kwargs: dict, expected: str):
     """Test dumping keyword arguments."""
     res = to_yaml_str(mdl, **kwargs)
     assert res == expected
+
+
+@pytest.mark.parametrize(
+    ["mdl", "kwargs"],
+    [
+        [has_enums, dict()],
+        [has_enums, dict(include={"vals"})],
+        [has_enums, dict(exclude={"vals": {0}})],
+        [UsesRefs(bill_to=_Name(given="A", family="B"), ship_to=_Name(given="C", family="D")), dict()],
+        [
+            UsesRefs(bill_to=_Name(given="A", family="B"), ship_to=_Name(given="C", family="D")),
+            dict(by_alias=True),
+        ],
+        [SecretTstModelDumpable(ss="123", sb=b"321"), dict()],  # type: ignore
+        [CustomRootListStr.model_validate(["a", "b"]), dict()],
+        [has_enums, dict(add_comments=True)],
+    ],
+)
+def test_dump_json_roundtrip_same(mdl: BaseModel, kwargs: dict):
+    """Test that direct dumping gives the same result as the legacy JSON roundtrip."""
+    assert to_yaml_str(mdl, **kwargs) == to_yaml_str(mdl, json_roundtrip=True, **kwargs)
+
+
+def test_dump_non_finite():
+    """Test that non-finite floats are written as in JSON, i.e. by the `ser_json_inf_nan` setting."""
+
+    class Floats(BaseModel):
+        """Model with floats."""
+
+        vals: list[float]
+
+    class Constants(BaseModel, ser_json_inf_nan="constants"):
+        """Model with floats written as `Infinity` in JSON, and the other model nested."""
+
+        vals: list[float]
+        nested: Floats
+
+    mdl = Floats(vals=[1.5, float("inf"), float("-inf")])
+    assert to_yaml_str(mdl) == "vals:\n- 1.5\n- null\n- null\n"
+    assert to_yaml_str(mdl) == to_yaml_str(mdl, json_roundtrip=True)
+    both = Constants(vals=[float("-inf")], nested=mdl)
+    assert to_yaml_str(both) == "nested:\n  vals:\n  - 1.5\n  - null\n  - null\nvals:\n- -.inf\n"
+    assert to_yaml_str(both) == to_yaml_str(both, json_roundtrip=True)
+    inf = Constants(vals=[float("inf")], nested=Floats(vals=[]))
+    assert parse_yaml_raw_as(Constants, to_yaml_str(inf)) == inf
+    assert to_yaml_str([mdl], model_type=list[Floats]) == "- vals:\n  - 1.5\n  - null\n  - null\n"
+
+
+@pytest.mark.parametrize(
+    "mdl",
+    [
+        has_enums,
+        UsesRefs(bill_to=_Name(given="A", family="B"), ship_to=_Name(given="C", family="D")),
+        CustomRootListStr.model_validate(["a", "ü", "😀", "x: y", "#z"]),
+    ],
+)
+@pytest.mark.parametrize("kwargs", [dict(), dict(indent=2), dict(by_alias=True, exclude_none=True)])
+def test_dump_emit_json(mdl: BaseModel, kwargs: dict):
+    """Test that JSON output is read back the same as flow-style YAML."""
+    got = to_yaml_str(mdl, emit_json=True, **kwargs)
+    assert got == mdl.model_dump_json(**kwargs) + "\n"
+    assert parse_yaml_raw_as(type(mdl), got) == parse_yaml_raw_as(
+        type(mdl), to_yaml_str(mdl, default_flow_style=True, by_alias=kwargs.get("by_alias"))
+    )
+
+
+def test_dump_emit_json_fallback():
+    """Test that output that isn't read back the same as YAML falls back to flow-style YAML."""
+
+    class Floats(BaseModel, ser_json_inf_nan="constants"):
+        """Model with floats written as `Infinity` in JSON."""
+
+        vals: list[float]
+
+    mdl = Floats(vals=[1.5, float("inf")])
+    assert to_yaml_str(mdl, emit_json=True) == "{vals: [1.5, .inf]}\n"
+    with pytest.raises(ValueError):
+        to_yaml_str(mdl, emit_json=True, add_comments=True)
+    with pytest.raises(ValueError):
+        to_yaml_str(mdl, emit_json=True, map_indent=4)
@@ -0,0 +1,111 @@
+"""Tests for dumping (and loading) values of arbitrary types, e.g. lists of models."""
+
+import asyncio
+from io import StringIO
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from pydantic import BaseModel, Field, TypeAdapter
+
+from pydantic_yaml import (
+    ParsedFileCache,
+    YamlCodec,
+    aparse_yaml_raw_as,
+    parse_yaml_file_as,
+    parse_yaml_files_as,
+    parse_yaml_raw_as,
+    parse_yaml_stream_as,
+    record_phases,
+    to_yaml_bytes,
+    to_yaml_file,
+    to_yaml_str,
+    to_yaml_stream,
+)
+
+
+class Item(BaseModel):
+    """An item."""
+
+    name: str = Field(description="Name of the item")
+    size: float = 1.0
+
+
+items = [Item(name="a"), Item(name="b", size=2.5)]
+
+
+@pytest.mark.parametrize(
+    ["value", "model_type"],
+    [
+        (items, list[Item]),
+        ({"x": items[0], "y": items[1]}, dict[str, Item]),
+        ((items[0], 3), tuple[Item, int]),
+        (items[0], Item),
+        (3, int),
+    ],
+)
+def test_dump_types_roundtrip(value: Any, model_type: Any):
+    """Test that values of the type are dumped, and loaded back as the same values."""
+    text = to_yaml_str(value, model_type=model_type)
+    assert parse_yaml_raw_as(model_type, text) == value
+    assert to_yaml_bytes(value, model_type=model_type) == text.encode()
+
+
+def test_dump_types_single_call():
+    """Test that a collection of models is serialized with one call, not one per model."""
+    with patch.object(Item, "model_dump", side_effect=AssertionError("called per item")):
+        text = to_yaml_str(items, model_type=list[Item])
+    assert text == "- name: a\n  size: 1.0\n- name: b\n  size: 2.5\n"
+    with record_phases() as events:
+        to_yaml_str(items, model_type=list[Item])
+    assert events[0].model_type == list[Item]
+
+
+def test_dump_types_options(tmp_path: Path):
+    """Test the dump options with arbitrary types."""
+    by_name = {"x": items[0]}
+    assert to_yaml_str(by_name, model_type=dict[str, Item], add_comments="fields-only") == (
+        "x:\n  name: a  # Name of the item\n  size: 1.0\n"
+    )
+    assert to_yaml_str(items, model_type=list[Item], exclude={0}) == "- name: b\n  size: 2.5\n"
+    text = to_yaml_str(by_name, model_type=dict[str, Item], emit_json=True)
+    assert text == '{"x":{"name":"a","size":1.0}}\n'
+    text = to_yaml_str(items, model_type=list[Item], json_roundtrip=True)
+    assert text == to_yaml_str(items, model_type=list[Item])
+    fn = tmp_path / "items.yaml"
+    to_yaml_file(fn, items, model_type=list[Item])
+    assert parse_yaml_file_as(list[Item], fn) == items
+
+
+def test_dump_types_streams_and_files(tmp_path: Path):
+    """Test writing streams of, and parsing batches and cached files as, arbitrary types."""
+    stream = StringIO()
+    to_yaml_stream(stream, [items, items[:1]], model_type=list[Item], add_comments="fields-only")
+    assert stream.getvalue().count("# Name of the item") == 3
+    assert list(parse_yaml_stream_as(list[Item], stream.getvalue())) == [items, items[:1]]
+    with pytest.raises(TypeError):
+        to_yaml_stream(StringIO(), [items])
+
+    fn = tmp_path / "items.yaml"
+    to_yaml_file(fn, items, model_type=list[Item])
+    results = list(parse_yaml_files_as(list[Item], [fn], executor="thread"))
+    assert results[0].value == items
+    assert ParsedFileCache().parse_yaml_file_as(list[Item], fn) == items
+    assert asyncio.run(aparse_yaml_raw_as(list[Item], fn.read_text())) == items
+
+
+def test_dump_types_codec():
+    """Test that a codec of a non-model type dumps its values with the adapter."""
+    codec = YamlCodec(list[Item])
+    assert codec.dump(items) == to_yaml_str(items, model_type=list[Item])
+    assert codec.load(codec.dump(items)) == items
+
+
+def test_dump_types_invalid():
+    """Test that values that don't match the type fail like in Pydantic."""
+    with pytest.raises(TypeError):
+        to_yaml_str(items)
+    with pytest.warns(UserWarning):
+        expected = TypeAdapter(list[int]).dump_python(["x"], mode="json")
+        assert parse_yaml_raw_as(list[str], to_yaml_str(["x"], model_type=list[int])) == expected
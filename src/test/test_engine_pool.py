@@ -0,0 +1,81 @@
+"""Tests for pooling of YAML reader/writer instances."""
+
+from typing import Any
+
+import pytest
+from ruamel.yaml import YAML
+from ruamel.yaml.error import YAMLError
+
+from pydantic_yaml import parse_yaml_raw_as, to_yaml_str
+from pydantic_yaml._internals.engines import clear_engine_pool, pooled_reader, pooled_writer
+from pydantic_yaml.examples.base_models import HasEnums
+from pydantic_yaml.examples.common import MyIntEnum, MyStrEnum
+
+has_enums = HasEnums(opts=MyStrEnum.option1, vals=[MyIntEnum.v1, MyIntEnum.v2])
+
+
+def test_reader_reused():
+    """Test that readers are reused, but not shared while in use."""
+    clear_engine_pool()
+    with pooled_reader() as r1:
+        with pooled_reader() as r2:
+            assert r1 is not r2
+    with pooled_reader() as r3:
+        assert r3 in (r1, r2)
+    assert parse_yaml_raw_as(HasEnums, "opts: option1\nvals: [1]") == HasEnums(opts="option1", vals=[1])
+
+
+def test_reader_dropped_on_error():
+    """Test that readers are not reused after a failure."""
+    clear_engine_pool()
+    with pytest.raises(YAMLError):
+        with pooled_reader() as r1:
+            r1.load("a: *undefined")
+    with pooled_reader() as r2:
+        assert r2 is not r1
+
+
+def test_reader_version_reset():
+    """Test that a `%YAML 1.1` directive doesn't apply to later documents of a pooled reader."""
+    clear_engine_pool()
+    assert parse_yaml_raw_as(Any, "%YAML 1.1\n---\nflag: on\n", engine="pure") == {"flag": True}
+    expected = {"country": "NO", "flag": "on"}
+    assert parse_yaml_raw_as(Any, "country: NO\nflag: on\n", engine="pure") == expected
+    with pooled_reader(engine="pure") as reader:
+        assert reader.version is None
+        assert reader.resolver.processing_version == (1, 2)
+
+
+def test_writers_keyed_by_options():
+    """Test that writers with different options are kept separate."""
+    clear_engine_pool()
+    with pooled_writer(indent=4) as w1:
+        pass
+    with pooled_writer(indent=2) as w2:
+        assert w2 is not w1
+    with pooled_writer(indent=4) as w3:
+        assert w3 is w1
+    # Results are consistent when switching between options
+    for _ in range(2):
+        assert to_yaml_str(has_enums, indent=4) == "opts: option1\nvals:\n    - 1\n    - 2\n"
+        assert to_yaml_str(has_enums, default_flow_style=True) == "{opts: option1, vals: [1, 2]}\n"
+
+
+def test_custom_writer_not_mutated():
+    """Test that the custom writer's options are restored after dumping."""
+    writer = YAML(typ="safe", pure=True)
+    writer.default_flow_style = True
+    res = to_yaml_str(has_enums, indent=4, default_flow_style=False, custom_yaml_writer=writer)
+    assert res == "opts: option1\nvals:\n    - 1\n    - 2\n"
+    assert writer.default_flow_style is True
+    assert writer.map_indent is None
+    assert writer.sequence_indent is None
+    assert writer.sequence_dash_offset == 0
+    assert to_yaml_str(has_enums, custom_yaml_writer=writer, default_flow_style=None) == (
+        "{opts: option1, vals: [1, 2]}\n"
+    )
+    # Existing representers get the options as well
+    assert writer.representer.default_flow_style is True
+    res = to_yaml_str(has_enums, indent=4, default_flow_style=False, custom_yaml_writer=writer)
+    assert res == "opts: option1\nvals:\n    - 1\n    - 2\n"
+    assert writer.representer.default_flow_style is True
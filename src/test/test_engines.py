@@ -0,0 +1,128 @@
+"""Conformance tests for the pure-Python and libyaml-based (C) YAML engines.
+
+Loading the example files gives identical results with both engines.
+
+Known differences when loading:
+
+- The C parser ignores `%YAML 1.1` directives and always resolves plain scalars with YAML 1.2
+  rules, so e.g. `yes` loads as `'yes'` instead of `True`, and `017` as `17` instead of `15`.
+
+Known differences when dumping (the loaded values are still identical):
+
+- Long plain strings are wrapped differently (the C emitter keeps the first word on the key line).
+- Multi-line strings are written as single-quoted scalars by the C emitter,
+  rather than double-quoted with escapes.
+- Custom indents aren't supported by the C emitter, so the pure-Python one is always used for those.
+"""
+
+from typing import Any
+
+import pytest
+from pydantic import BaseModel
+
+from pydantic_yaml import (
+    get_default_engine,
+    parse_yaml_file_as,
+    parse_yaml_raw_as,
+    set_default_engine,
+    to_yaml_str,
+)
+from pydantic_yaml._internals.engines import HAS_LIBYAML, pooled_reader, pooled_writer
+from pydantic_yaml.examples.base_models import (
+    A,
+    B,
+    CustomRootListObj,
+    CustomRootListStr,
+    HasEnums,
+    UsesRefs,
+    root,
+)
+
+needs_libyaml = pytest.mark.skipif(not HAS_LIBYAML, reason="ruamel.yaml.clib is not installed.")
+
+examples = [
+    (A, "a.yaml"),
+    (A, "a-1.1.yaml"),
+    (A, "a-1.2.yaml"),
+    (B, "b.yaml"),
+    (UsesRefs, "uses_refs.yaml"),
+    (HasEnums, "has_enums.yaml"),
+    (CustomRootListStr, "root_list_str.yaml"),
+    (CustomRootListObj, "root_list_obj.yaml"),
+]
+
+
+@needs_libyaml
+@pytest.mark.parametrize("fn", sorted(p.name for p in root.glob("*.yaml") if p.name != "recursive.yaml"))
+def test_load_same_objects(fn: str):
+    """Test that both engines construct the same objects for the example files."""
+    with pooled_reader(engine="pure") as reader:
+        got_pure = reader.load(root / fn)
+    with pooled_reader(engine="c") as reader:
+        got_c = reader.load(root / fn)
+    assert got_pure == got_c
+
+
+@needs_libyaml
+@pytest.mark.parametrize(["model_type", "fn"], examples)
+def test_rt_same_models(model_type: type[BaseModel], fn: str):
+    """Test that models are the same, regardless of the engine used for loading and dumping."""
+    obj_pure = parse_yaml_file_as(model_type, root / fn, engine="pure")
+    obj_c = parse_yaml_file_as(model_type, root / fn, engine="c")
+    assert obj_pure == obj_c
+    raw_pure = to_yaml_str(obj_pure, engine="pure")
+    raw_c = to_yaml_str(obj_c, engine="c")
+    assert raw_pure == raw_c
+    for engine in ("pure", "c"):
+        assert parse_yaml_raw_as(model_type, raw_c, engine=engine) == obj_pure  # type: ignore
+
+
+@needs_libyaml
+def test_load_yaml_1_1():
+    """Test the documented difference: the C parser ignores `%YAML 1.1` directives."""
+    raw = "%YAML 1.1\n---\nflag: yes\nmode: 017\ncountry: NO\n"
+    assert parse_yaml_raw_as(Any, raw, engine="pure") == {"flag": True, "mode": 15, "country": False}
+    assert parse_yaml_raw_as(Any, raw, engine="c") == {"flag": "yes", "mode": 17, "country": "NO"}
+
+
+@needs_libyaml
+def test_engine_selection():
+    """Test that the C engine is selected only when possible."""
+    with pooled_writer(engine="c") as writer:
+        assert not writer.pure
+    with pooled_writer(engine="auto") as writer:
+        assert not writer.pure
+    with pooled_writer(engine="c", indent=4) as writer:
+        assert writer.pure
+    with pooled_writer("rt", engine="c") as writer:
+        assert writer.pure
+    with pooled_reader(engine="c") as reader:
+        assert not reader.pure
+
+
+def test_default_engine():
+    """Test setting the default engine."""
+    old = get_default_engine()
+    try:
+        set_default_engine("auto")
+        assert get_default_engine() == "auto"
+        with pooled_reader() as reader:
+            assert reader.pure is not HAS_LIBYAML
+        with pytest.raises(ValueError):
+            set_default_engine("fast")  # type: ignore
+    finally:
+        set_default_engine(old)
+    with pooled_reader() as reader:
+        assert reader.pure
+
+
+def test_fallback_without_libyaml(monkeypatch: pytest.MonkeyPatch):
+    """Test falling back to the pure-Python engine if libyaml isn't available."""
+    from pydantic_yaml._internals import engines
+
+    monkeypatch.setattr(engines, "HAS_LIBYAML", False)
+    with pooled_reader(engine="auto") as reader:
+        assert reader.pure
+    assert parse_yaml_raw_as(A, "a: x", engine="auto") == A(a="x")
+    with pytest.raises(RuntimeError):
+        parse_yaml_raw_as(A, "a: x", engine="c")
@@ -0,0 +1,93 @@
+"""Tests for the parsed file cache."""
+
+import os
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from pydantic_yaml import FileCacheInfo, ParsedFileCache
+from pydantic_yaml.examples.base_models import A, Empty, UsesRefs, root
+
+
+def _touch_same_mtime(fn: Path, content: str) -> None:
+    """Rewrite the file with the same size, keeping its modification time."""
+    st = fn.stat()
+    fn.write_text(content)
+    os.utime(fn, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+
+def test_file_cache_hits(tmp_path: Path):
+    """Test that unchanged files are only parsed once, per model type."""
+    fn = tmp_path / "a.yaml"
+    fn.write_text("a: x\n")
+    cache = ParsedFileCache()
+    first = cache.parse_yaml_file_as(A, fn)
+    assert cache.parse_yaml_file_as(A, str(fn)) is first
+    assert cache.parse_yaml_file_as(Empty, fn) == Empty()
+    assert cache.info() == FileCacheInfo(
+        hits=1, misses=2, max_entries=128, max_bytes=None, currsize=2, currbytes=10
+    )
+
+    fn.write_text("a: yy\n")
+    assert cache.parse_yaml_file_as(A, fn) == A(a="yy")
+    assert cache.info().misses == 3
+
+    cache.invalidate(fn)
+    assert cache.info().currsize == 0
+    cache.clear()
+    assert cache.info() == FileCacheInfo(0, 0, 128, None, 0, 0)
+
+
+def test_file_cache_hash_content(tmp_path: Path):
+    """Test that content hashing detects changes that keep the size and modification time."""
+    fn = tmp_path / "a.yaml"
+    fn.write_text("a: x\n")
+    by_stat = ParsedFileCache()
+    by_hash = ParsedFileCache(hash_content=True)
+    assert by_stat.parse_yaml_file_as(A, fn) == by_hash.parse_yaml_file_as(A, fn) == A(a="x")
+    _touch_same_mtime(fn, "a: y\n")
+    assert by_stat.parse_yaml_file_as(A, fn) == A(a="x")  # stale
+    assert by_hash.parse_yaml_file_as(A, fn) == A(a="y")
+
+
+def test_file_cache_eviction(tmp_path: Path):
+    """Test eviction by number of entries and by total size."""
+    files = [tmp_path / f"{i}.yaml" for i in range(4)]
+    for i, fn in enumerate(files):
+        fn.write_text(f"a: {'abcd'[i]}\n")  # 5 bytes each
+    cache = ParsedFileCache(max_entries=3, max_bytes=12)
+    for fn in files:
+        cache.parse_yaml_file_as(A, fn)
+    assert cache.info().currsize == 2
+    assert cache.info().currbytes == 10
+    cache.parse_yaml_file_as(A, files[3])
+    assert cache.info().hits == 1
+
+    files[0].write_text("a: " + "x" * 20)
+    cache.parse_yaml_file_as(A, files[0])  # too large to be cached
+    assert cache.info().currsize == 2
+
+
+@pytest.mark.parametrize("copy", ["none", "shallow", "deep"])
+def test_file_cache_copies(copy):
+    """Test the copy options."""
+    cache = ParsedFileCache(copy=copy)
+    first = cache.parse_yaml_file_as(UsesRefs, root / "uses_refs.yaml")
+    second = cache.parse_yaml_file_as(UsesRefs, root / "uses_refs.yaml")
+    assert first == second
+    assert (first is second) == (copy == "none")
+    assert (first.bill_to is second.bill_to) == (copy != "deep")
+
+
+def test_file_cache_errors(tmp_path: Path):
+    """Test that errors are raised, and not cached."""
+    cache = ParsedFileCache()
+    with pytest.raises(FileNotFoundError):
+        cache.parse_yaml_file_as(A, tmp_path / "missing.yaml")
+    (tmp_path / "b.yaml").write_text("b: 1\n")
+    with pytest.raises(ValidationError):
+        cache.parse_yaml_file_as(A, tmp_path / "b.yaml")
+    assert cache.info().currsize == 0
+    with pytest.raises(ValueError):
+        ParsedFileCache(copy="all")  # type: ignore
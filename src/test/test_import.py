@@ -1,8 +1,38 @@
 """Tests for the basic functionality advertised in README."""
 
+import subprocess
+import sys
+
+import pytest
+
 
 def test_import():
     """Ensure pydantic_yaml can be imported."""
     from pydantic_yaml import __version__
 
     assert __version__ != "0.0.0"
+
+
+def test_import_is_lazy():
+    """Ensure importing pydantic_yaml doesn't import heavy dependencies until they are used."""
+    code = """
+import sys
+import pydantic_yaml
+heavy = ["pydantic", "ruamel.yaml", "asyncio", "hatchling"]
+assert not [m for m in heavy if m in sys.modules], [m for m in heavy if m in sys.modules]
+assert "pydantic_yaml.version" not in sys.modules
+assert pydantic_yaml.__version__ != "0.0.0"
+assert "ruamel.yaml" not in sys.modules and "hatchling" not in sys.modules
+from pydantic_yaml import to_yaml_str
+assert "ruamel.yaml" in sys.modules and "asyncio" not in sys.modules
+assert set(pydantic_yaml.__all__) <= set(dir(pydantic_yaml))
+"""
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_unknown_attribute():
+    """Ensure unknown attributes still raise AttributeError."""
+    import pydantic_yaml
+
+    with pytest.raises(AttributeError):
+        pydantic_yaml.does_not_exist  # noqa: B018
@@ -0,0 +1,121 @@
+"""Tests for the phase-level instrumentation hooks."""
+
+from io import BytesIO
+from pathlib import Path
+from typing import Any
+
+import pytest
+from pydantic import ValidationError
+
+from pydantic_yaml import (
+    PhaseEvent,
+    add_phase_hook,
+    parse_yaml_file_as,
+    parse_yaml_raw_as,
+    record_phases,
+    remove_phase_hook,
+    to_yaml_str,
+)
+from pydantic_yaml._internals.instrumentation import count_nodes, phase_recorder
+from pydantic_yaml.examples.base_models import A, CommentedModel
+
+
+def test_no_hooks():
+    """Test that no recorder is created without hooks."""
+    assert phase_recorder("load", A) is None
+    with record_phases():
+        assert phase_recorder("load", A) is not None
+    assert phase_recorder("load", A) is None
+
+
+def test_load_phases(tmp_path: Path):
+    """Test the phases of loading YAML from a file."""
+    fn = tmp_path / "a.yaml"
+    fn.write_text("a: x\n")
+    with record_phases() as events:
+        assert parse_yaml_file_as(A, fn) == A(a="x")
+    assert [ev.phase for ev in events] == ["read", "parse", "adapter", "validate"]
+    assert all(ev.operation == "load" and ev.model_type is A for ev in events)
+    assert all(ev.seconds >= 0 for ev in events)
+    read, parse = events[:2]
+    assert read.nbytes == parse.nbytes == 5
+    assert parse.documents == 1
+    assert parse.nodes == 3
+    assert parse.detail == "pure"
+
+
+def test_load_phases_json():
+    """Test that the JSON fast path is reported as such."""
+    with record_phases() as events:
+        parse_yaml_raw_as(A, b'{"a": "x"}')
+    assert [ev.phase for ev in events] == ["parse", "adapter", "validate"]
+    assert events[0] == PhaseEvent(
+        "load", "parse", A, events[0].seconds, nbytes=10, documents=1, nodes=3, detail="json"
+    )
+
+
+def test_load_phases_error():
+    """Test that phases are reported up to the one that failed."""
+    with record_phases() as events, pytest.raises(ValidationError):
+        parse_yaml_raw_as(A, BytesIO(b"b: x\n"))
+    assert [ev.phase for ev in events] == ["read", "parse", "adapter"]
+
+
+@pytest.mark.parametrize(
+    ["kwargs", "phases", "detail"],
+    [
+        (dict(), ["serialize", "emit"], "pure"),
+        (dict(add_comments=True), ["serialize", "comment", "emit"], "pure"),
+        (dict(emit_json=True), ["serialize", "emit"], "json"),
+    ],
+)
+def test_dump_phases(kwargs: dict, phases: list[str], detail: str):
+    """Test the phases of dumping."""
+    mdl = CommentedModel()
+    with record_phases() as events:
+        text = to_yaml_str(mdl, **kwargs)
+    assert [ev.phase for ev in events] == phases
+    assert all(ev.operation == "dump" and ev.model_type is CommentedModel for ev in events)
+    assert events[-1].nbytes == len(text)
+    assert events[-1].detail == detail
+
+
+def test_hook_registry():
+    """Test adding and removing hooks, and that failing hooks only warn."""
+    seen: list[PhaseEvent] = []
+
+    def failing(event: PhaseEvent) -> None:
+        raise RuntimeError("oops")
+
+    add_phase_hook(seen.append)
+    add_phase_hook(failing)
+    try:
+        with pytest.warns(RuntimeWarning, match="oops"):
+            parse_yaml_raw_as(A, "a: x")
+    finally:
+        remove_phase_hook(failing)
+        remove_phase_hook(seen.append)
+    assert len(seen) == 4
+    parse_yaml_raw_as(A, "a: x")
+    assert len(seen) == 4
+
+
+def test_count_nodes():
+    """Test counting the nodes of loaded structures."""
+    assert count_nodes(1) == 1
+    assert count_nodes({"a": [1, 2], "b": {}}) == 7
+
+
+def test_count_nodes_shared():
+    """Test that shared and recursive containers are counted once, also while loading."""
+    shared = [1, 2]
+    assert count_nodes({"a": shared, "b": shared}) == 6
+    with record_phases() as events:
+        res = parse_yaml_raw_as(Any, "a: &x [1, *x]\n")
+    assert res["a"][1] is res["a"]
+    assert [ev.nodes for ev in events if ev.phase == "parse"] == [4]
+    levels = zip("abcdefgh", "bcdefghi")
+    bomb = "a: &a [x, x]\n" + "".join(f"{c}: &{c} [*{p}, *{p}]\n" for p, c in levels)
+    with record_phases() as events:
+        parse_yaml_raw_as(Any, bomb)
+    assert [ev.nodes for ev in events if ev.phase == "parse"] == [21]
@@ -0,0 +1,143 @@
+"""Tests for the JSON fast path of parsing."""
+
+import json
+import random
+import tracemalloc
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from ruamel.yaml import YAML
+from ruamel.yaml.constructor import DuplicateKeyError
+
+from pydantic_yaml import YamlCodec, parse_yaml_raw_as, record_phases, to_yaml_str
+from pydantic_yaml._internals.json_subset import NOT_JSON, is_yaml_compatible_json, load_json_subset
+from pydantic_yaml.examples.base_models import A
+
+yaml_reader = YAML(typ="safe", pure=True)
+
+
+def _random_value(rng: random.Random, depth: int = 0) -> Any:
+    """Generate a random JSON-compatible value."""
+    kind = rng.choice(["int", "float", "str", "bool", "null"] + ["list", "dict"] * (depth < 3))
+    if kind == "int":
+        return rng.randint(-(10**20), 10**20)
+    elif kind == "float":
+        return rng.uniform(-1e6, 1e6) * 10 ** rng.randint(-30, 30)
+    elif kind == "str":
+        return "".join(rng.choice("ab :#-'\"\\/\n\té€😀{}[],&*!|>%@`") for _ in range(rng.randint(0, 8)))
+    elif kind == "bool":
+        return rng.random() < 0.5
+    elif kind == "null":
+        return None
+    elif kind == "list":
+        return [_random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+    return {str(_random_value(rng, 3)): _random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))}
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("indent", [None, 2])
+def test_json_subset_same_as_yaml(seed: int, indent: int | None):
+    """Test that random JSON documents are loaded the same way as with YAML."""
+    rng = random.Random(seed)
+    raw = json.dumps([_random_value(rng) for _ in range(10)], indent=indent, ensure_ascii=seed % 2 == 0)
+    got = load_json_subset(raw)
+    assert got is not NOT_JSON or "\\ud" in raw
+    if got is not NOT_JSON:
+        assert got == yaml_reader.load(raw)
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        "a: 1",
+        "[1, 2] # comment",
+        '{"a": 1, "a": 2}',  # duplicate keys
+        "[NaN, Infinity]",
+        '["\\ud83d\\ude00"]',  # surrogate pair
+        '["a\x7fb"]',  # not printable in YAML
+        '["a\x85b"]',  # line break in YAML
+        '{"a"\n: 1}',
+        '{"%s": 1}' % ("k" * 200),
+        "\t[1]",
+        "﻿[1]",
+        "[1, 2",
+        '"just a string"',
+    ],
+)
+def test_json_subset_fallback(raw: str):
+    """Test that anything the YAML loader treats differently isn't loaded as JSON."""
+    assert load_json_subset(raw) is NOT_JSON
+    assert load_json_subset(raw.encode()) is NOT_JSON
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("indent", [None, 2])
+def test_yaml_compatible_json(seed: int, indent: int | None):
+    """Test that the quick check of written JSON only accepts what is loaded the same as YAML."""
+    rng = random.Random(seed)
+    raw = json.dumps([_random_value(rng) for _ in range(10)], indent=indent, ensure_ascii=seed % 2 == 0)
+    assert is_yaml_compatible_json(raw) == (load_json_subset(raw) is not NOT_JSON) or "\\ud" in raw
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        "[NaN, Infinity]",
+        '{"a": -Infinity}',
+        '["\\ud83d\\ude00"]',
+        '["a\x7fb"]',
+        '["a\x85b"]',
+        '["a\u2028b"]',
+        '{"%s": 1}' % ("k" * 200),
+        '{"%s\\"": 1}' % ("k" * 200),
+        '"just a string"',
+        "3",
+    ],
+)
+def test_yaml_compatible_json_fallback(raw: str):
+    """Test that written JSON that the YAML loader treats differently is rejected."""
+    assert not is_yaml_compatible_json(raw)
+
+
+def test_yaml_compatible_json_no_parse():
+    """Test that written JSON is only parsed again if it may contain constants or escaped quotes."""
+    mdl = A(a="x" * 1000)
+    with patch("pydantic_yaml._internals.json_subset.json.loads", side_effect=AssertionError):
+        assert to_yaml_str(mdl, emit_json=True) == mdl.model_dump_json() + "\n"
+    assert is_yaml_compatible_json('{"a": "Infinity", "b": "\\"NaN\\""}')
+    assert not is_yaml_compatible_json('{"a": NaN}')
+
+
+def test_json_subset_parse():
+    """Test that parsing gives the same results and errors, with or without the fast path."""
+    assert parse_yaml_raw_as(A, '{"a": "x"}') == parse_yaml_raw_as(A, "a: x")
+    assert parse_yaml_raw_as(list[A], b'[{"a": "x"}]\n') == [A(a="x")]
+    with pytest.raises(DuplicateKeyError):
+        parse_yaml_raw_as(A, '{"a": "x", "a": "y"}')
+
+
+def test_json_subset_detection_in_place():
+    """Test that non-JSON inputs are rejected without decoding or copying them."""
+    assert load_json_subset(b" \r\n[1]\n ") == load_json_subset(" \r\n[1]\n ") == [1]
+    raw = b"a: [1, 2]\n" * 100_000
+    text = raw.decode()
+    tracemalloc.start()
+    try:
+        assert load_json_subset(raw) is NOT_JSON
+        assert load_json_subset(text) is NOT_JSON
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < 10_000
+
+
+def test_json_subset_opt_out():
+    """Test that the fast path can be turned off."""
+    for kwargs in (dict(), dict(json_fast_path=False)):
+        with record_phases() as events:
+            assert parse_yaml_raw_as(A, '{"a": "x"}', **kwargs) == A(a="x")
+        with record_phases() as codec_events:
+            assert YamlCodec(A, **kwargs).load('{"a": "x"}') == A(a="x")
+        details = {ev.detail for ev in events + codec_events if ev.phase == "parse"}
+        assert details == ({"json"} if not kwargs else {"pure"})
@@ -0,0 +1,101 @@
+"""Tests for loading only the subtree at a key path."""
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from pydantic_yaml import parse_yaml_file_as, parse_yaml_raw_as
+from pydantic_yaml._internals.engines import HAS_LIBYAML, pooled_reader
+from pydantic_yaml._internals.events import lookup_key_path, split_key_path
+from pydantic_yaml.examples.base_models import A
+
+needs_libyaml = pytest.mark.skipif(not HAS_LIBYAML, reason="ruamel.yaml.clib is not installed.")
+engines = ["pure", pytest.param("c", marks=needs_libyaml)]
+
+doc = """
+defaults: &defaults
+  retries: 3
+  tags: &tags [a, b]
+services:
+  db:
+    <<: *defaults
+    port: 5432
+  api:
+    <<: [*defaults, {timeout: 5}]
+    port: 8080
+    tags: *tags
+    hosts:
+      - a: h1
+      - &h2 {a: h2}
+      - *h2
+  "a.b": {a: x}
+  1: one
+other: [1, 2, {deep: {er: true}}]
+"""
+
+
+@pytest.mark.parametrize("engine", engines)
+@pytest.mark.parametrize(
+    "key_path",
+    [
+        "services.api",
+        "services.api.hosts.2",
+        "services.api.tags",
+        "services.api.timeout",
+        "services.db.retries",
+        "services.1",
+        ["services", "a.b"],
+        ("other", 2, "deep"),
+        "",
+    ],
+)
+def test_key_path_matches_full_load(key_path: Any, engine: str):
+    """Test that the subtree is the same as when loading the whole document."""
+    with pooled_reader("safe", engine=engine) as reader:  # type: ignore[arg-type]
+        full = reader.load(doc)
+    expected = lookup_key_path(full, split_key_path(key_path))
+    assert parse_yaml_raw_as(Any, doc, key_path=key_path, engine=engine) == expected  # type: ignore
+
+
+@pytest.mark.parametrize("engine", engines)
+@pytest.mark.parametrize(
+    ["key_path", "at"],
+    [
+        ("services.nope", "'nope'"),
+        ("other.5", "5"),
+        ("services.api.port.x", "'x'"),
+        ("services.db.timeout", "'timeout'"),
+        ("other.x", "'x'"),
+    ],
+)
+def test_key_path_not_found(key_path: str, at: str, engine: str):
+    """Test errors for paths that don't exist, which name the full path."""
+    with pytest.raises(KeyError, match=rf"not found \(at {at}\)") as exc_info:
+        parse_yaml_raw_as(Any, doc, key_path=key_path, engine=engine)  # type: ignore
+    assert str(split_key_path(key_path)) in str(exc_info.value)
+
+
+def test_key_path_skips_rest():
+    """Test that the document isn't read after the subtree, and other branches aren't validated."""
+    raw = "first: {a: x}\nsecond: {a: [unclosed\n"
+    assert parse_yaml_raw_as(A, raw, key_path="first") == A(a="x")
+    with pytest.raises(Exception):
+        parse_yaml_raw_as(A, raw, key_path="second")
+
+
+def test_key_path_json_and_file(tmp_path: Path):
+    """Test key paths with JSON input and files."""
+    assert parse_yaml_raw_as(A, '{"x": [{"a": "y"}]}', key_path="x.0") == A(a="y")
+    fn = tmp_path / "doc.yaml"
+    fn.write_text(doc)
+    for memory_map in (False, True):
+        mdl = parse_yaml_file_as(A, fn, key_path="services.api.hosts.1", memory_map=memory_map)
+        assert mdl == A(a="h2")
+
+
+def test_split_key_path():
+    """Test splitting dotted key paths."""
+    assert split_key_path("a.0.b") == ["a", 0, "b"]
+    assert split_key_path(["a.0", "1"]) == ["a.0", "1"]
+    assert split_key_path("") == []
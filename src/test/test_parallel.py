@@ -0,0 +1,148 @@
+"""Tests for parsing one multi-document file in parallel."""
+
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Any
+
+import pytest
+from pydantic import ValidationError
+from ruamel.yaml import YAMLError
+
+from pydantic_yaml import DocumentError, parse_yaml_stream_as, parse_yaml_stream_parallel_as
+from pydantic_yaml._internals.engines import HAS_LIBYAML
+from pydantic_yaml._internals.parallel import document_ranges
+from pydantic_yaml.examples.base_models import A
+
+needs_libyaml = pytest.mark.skipif(not HAS_LIBYAML, reason="ruamel.yaml.clib is not installed.")
+engines = ["pure", pytest.param("c", marks=needs_libyaml)]
+
+# Document markers inside scalars, comments and flow collections, which aren't boundaries
+tricky_docs = """a: |
+  block
+  ---
+  ...
+---
+a: >-
+    folded
+    --- still folded
+--- |
+  ---
+  top-level block
+---
+a: "double
+  --- quoted"
+---
+a: 'single
+  ---
+  quoted'
+---
+# ---
+a: plain
+  --- continued
+...
+---
+a: [x,
+  ---, y]
+---
+a: ---x
+"""
+
+
+class _NoExecutor(Executor):
+    """Executor that fails if anything is submitted."""
+
+    def submit(self, *args: Any, **kwargs: Any) -> Any:
+        raise AssertionError("the file was split")
+
+
+@pytest.fixture
+def events(tmp_path: Path) -> Path:
+    """File with many documents, some of them tricky, and some invalid."""
+    fn = tmp_path / "events.yaml"
+    docs = [f"a: v{i}\n" if i % 7 else "b: 1\n" for i in range(200)]
+    fn.write_text(tricky_docs + "---\n" + "---\n".join(docs))
+    return fn
+
+
+@pytest.mark.parametrize("engine", engines)
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_parallel_same_as_serial(events: Path, executor: Any, engine: Any):
+    """Test that the models and errors are the same as when parsing serially."""
+    expected_errors: list[DocumentError] = []
+    expected = list(
+        parse_yaml_stream_as(Any, events, on_error="skip", errors=expected_errors, engine=engine)
+    )
+    assert expected[1] == {"a": "folded --- still folded"}
+    for chunk_size in (1, 100, 1000):
+        errors: list[DocumentError] = []
+        got = parse_yaml_stream_parallel_as(
+            Any,
+            events,
+            executor=executor,
+            max_workers=2,
+            chunk_size=chunk_size,
+            on_error="skip",
+            errors=errors,
+            engine=engine,
+        )
+        assert list(got) == expected
+        assert [err.document_index for err in errors] == [err.document_index for err in expected_errors]
+    models = parse_yaml_stream_parallel_as(A, str(events), max_workers=2, chunk_size=50, on_error="skip")
+    assert list(models) == list(parse_yaml_stream_as(A, events, on_error="skip"))
+
+
+def test_document_ranges():
+    """Test that ranges are split before document markers in the first column only."""
+    data = tricky_docs.encode()
+    ranges = list(document_ranges(data, 1))
+    assert [start for start, _ in ranges[1:]] == [end for _, end in ranges[:-1]]
+    assert ranges[-1][1] == len(data)
+    assert len(ranges) == len(list(parse_yaml_stream_as(Any, data))) == 8
+    assert all(data[start:end].startswith(b"---") for start, end in ranges[1:])
+    assert list(document_ranges(data, len(data))) == [(0, len(data))]
+    assert list(document_ranges(b"", 1)) == []
+
+
+def test_parallel_errors(events: Path):
+    """Test that errors are raised after the models before them, at the right line."""
+    it = parse_yaml_stream_parallel_as(A, events, executor="thread", chunk_size=1)
+    models = []
+    with pytest.raises(ValidationError):
+        for model in it:
+            models.append(model)
+    assert models == [A(a="block\n---\n...\n"), A(a="folded --- still folded")]
+
+    broken = events.with_name("broken.yaml")
+    broken.write_text("a: x\n---\na: y\n---\na: [\n")
+    with pytest.raises(YAMLError) as serial_info:
+        list(parse_yaml_stream_as(A, broken))
+    with pytest.raises(YAMLError) as info:
+        list(parse_yaml_stream_parallel_as(A, broken, executor="thread", chunk_size=1))
+    assert str(info.value) == str(serial_info.value)
+
+
+@pytest.mark.parametrize(
+    ["raw", "encoding"],
+    [
+        ("%YAML 1.1\n---\na: yes\n---\na: yes\n", "utf-8"),
+        ("a: x\n---\na: y\n", "utf-16"),
+        ("a: x\n", "utf-8"),
+        ("", "utf-8"),
+    ],
+)
+def test_parallel_fallback(tmp_path: Path, raw: str, encoding: str):
+    """Test that files that can't be split safely (or needn't be) are parsed serially."""
+    fn = tmp_path / "docs.yaml"
+    fn.write_text(raw, encoding=encoding)
+    expected = list(parse_yaml_stream_as(Any, fn))
+    assert list(parse_yaml_stream_parallel_as(Any, fn, executor=_NoExecutor(), chunk_size=1)) == expected
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [dict(executor="fibers"), dict(on_error="ignore"), dict(chunk_size=0)],
+)
+def test_parallel_invalid_options(events: Path, kwargs: dict[str, Any]):
+    """Test that invalid options are rejected early."""
+    with pytest.raises(ValueError):
+        parse_yaml_stream_parallel_as(A, events, **kwargs)
@@ -0,0 +1,160 @@
+"""Tests for schema-aware resolution of plain scalars."""
+
+from typing import Any, Literal
+
+import pytest
+from pydantic import BaseModel, Field, ValidationError, field_validator
+from ruamel.yaml.error import YAMLError
+
+from pydantic_yaml import YamlCodec, parse_yaml_raw_as
+from pydantic_yaml._internals.engines import HAS_LIBYAML
+from pydantic_yaml._internals.resolver import scalar_schema
+
+needs_libyaml = pytest.mark.skipif(not HAS_LIBYAML, reason="ruamel.yaml.clib is not installed.")
+engines = ["pure", pytest.param("c", marks=needs_libyaml)]
+
+
+class Release(BaseModel):
+    """Release with string fields that look like other types."""
+
+    version: str
+    country: str
+    date: str | None = None
+    codename: str | None = "x"
+    build: int = 0
+    channel: Literal["stable", "1.0"] = "stable"
+    labels: dict[str, str] = {}
+    tags: list[str] = []
+    any_value: Any = None
+    counted: str | int = ""
+    raw: str = Field("", alias="raw-value")
+
+
+class Checked(BaseModel):
+    """Model with a "before" validator, which gets the value resolved as usual."""
+
+    number: str
+
+    @field_validator("number", mode="before")
+    @classmethod
+    def _to_str(cls, v: Any) -> str:
+        """Check that the value was resolved as an int."""
+        assert isinstance(v, int)
+        return str(v)
+
+
+doc = """%YAML 1.1
+---
+version: 1.10
+country: NO
+date: 2001-12-14
+codename: ~
+build: 0x1F
+channel: 1.0
+labels: {on: off, 1: 2, null: yes}
+tags: [yes, 012, .inf]
+any_value: 0x1F
+counted: 12
+raw-value: null
+"""
+
+
+@pytest.mark.parametrize("engine", engines)
+def test_schema_aware_strings(engine: str):
+    """Test that plain scalars typed as `str` keep their text."""
+    with pytest.raises((ValidationError, YAMLError)):  # or a duplicate key (`True` and `1`)
+        parse_yaml_raw_as(Release, doc, engine=engine)  # type: ignore[arg-type]
+    res = parse_yaml_raw_as(Release, doc, engine=engine, schema_aware=True)  # type: ignore[arg-type]
+    assert res == Release.model_validate(
+        {
+            "version": "1.10",
+            "country": "NO",
+            "date": "2001-12-14",
+            "codename": None,
+            "build": 31,
+            "channel": "1.0",
+            "labels": {"on": "off", "1": "2", "null": "yes"},
+            "tags": ["yes", "012", ".inf"],
+            "any_value": 31,
+            "counted": 12,
+            "raw-value": "null",
+        }
+    )
+
+
+@pytest.mark.parametrize("engine", engines)
+def test_schema_aware_same_result(engine: str):
+    """Test that unambiguous documents, merge keys and aliases load the same way."""
+    raw = """
+base: &base {version: '2', country: DE, tags: &tags [a, b]}
+releases:
+  - <<: *base
+    build: 3
+  - version: '3'
+    country: FR
+    tags: *tags
+    labels: {<<: {a: b}, c: d}
+"""
+    model_type = dict[str, Any]
+    plain = parse_yaml_raw_as(model_type, raw, engine=engine)  # type: ignore[arg-type]
+    aware = parse_yaml_raw_as(model_type, raw, engine=engine, schema_aware=True)  # type: ignore
+    assert aware == plain
+    for key_path in ("releases", "releases.1"):
+        tp = list[Release] if key_path == "releases" else Release
+        kwargs: dict[str, Any] = dict(engine=engine, key_path=key_path)
+        expected = parse_yaml_raw_as(tp, raw, **kwargs)
+        assert parse_yaml_raw_as(tp, raw, schema_aware=True, **kwargs) == expected
+
+
+def test_schema_aware_validators():
+    """Test that fields with "before" validators are resolved as usual."""
+    assert parse_yaml_raw_as(Checked, "number: 12", schema_aware=True).number == "12"
+
+
+def test_schema_aware_key_path():
+    """Test that keys on the path are matched by type, and the subtree is schema-aware."""
+    raw = "1: {version: 1.10, country: NO}\n'1': {version: '2', country: DE}\n"
+    res = parse_yaml_raw_as(Release, raw, key_path=[1], schema_aware=True)
+    assert (res.version, res.country) == ("1.10", "NO")
+    assert YamlCodec(Release, key_path=[1], schema_aware=True).load(raw) == res
+
+
+class _Pinned(BaseModel):
+    """Model with a version string."""
+
+    name: str
+    version: str
+    n: int = 0
+
+
+@pytest.mark.parametrize("engine", engines)
+def test_schema_aware_key_path_anchors(engine: str):
+    """Test that anchored nodes outside of the key path are resolved where they are used."""
+    raw = """
+defaults: &d {name: a, version: 1.0}
+other: &v 1.10
+item: {<<: *d, n: 2}
+items:
+  - {<<: [*d], version: 2.0}
+  - {name: *v, version: *v, n: 3}
+"""
+    kwargs: dict[str, Any] = dict(engine=engine, schema_aware=True)
+    expected = _Pinned(name="a", version="1.0", n=2)
+    assert parse_yaml_raw_as(_Pinned, raw, key_path="item", **kwargs) == expected
+    assert parse_yaml_raw_as(str, raw, key_path="item.version", **kwargs) == "1.0"
+    assert parse_yaml_raw_as(list[_Pinned], raw, key_path="items", **kwargs) == [
+        _Pinned(name="a", version="2.0"),
+        _Pinned(name="1.10", version="1.10", n=3),
+    ]
+    assert parse_yaml_raw_as(float, raw, key_path="other", **kwargs) == 1.1
+    with pytest.raises(ValidationError):  # resolved as usual without `schema_aware`
+        parse_yaml_raw_as(_Pinned, raw, key_path="item", engine=engine)  # type: ignore[arg-type]
+
+
+def test_scalar_schema():
+    """Test which types skip resolution."""
+    assert scalar_schema(Any) is None
+    assert scalar_schema(int | str) is None
+    assert scalar_schema(list[int]) is None
+    assert scalar_schema(list[str]) is not None
+    assert scalar_schema(Release) is scalar_schema(Release)  # cached
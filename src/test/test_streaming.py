@@ -0,0 +1,211 @@
+"""Tests for multi-document streams."""
+
+import tracemalloc
+from io import BytesIO, StringIO
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+from ruamel.yaml import YAMLError
+
+from pydantic_yaml import (
+    DocumentError,
+    parse_yaml_items_as,
+    parse_yaml_raw_as,
+    parse_yaml_stream_as,
+    to_yaml_str,
+    to_yaml_stream,
+)
+from pydantic_yaml._internals.engines import HAS_LIBYAML
+from pydantic_yaml.examples.base_models import A, HasEnums
+from pydantic_yaml.examples.common import MyIntEnum, MyStrEnum
+
+raw_docs = "a: x\n---\na: y\n---\nb: 1\n---\na: z\n"
+
+
+@pytest.mark.parametrize(
+    "source",
+    [raw_docs, raw_docs.encode(), StringIO(raw_docs), BytesIO(raw_docs.encode())],
+)
+def test_stream_sources(source):
+    """Test parsing from various sources."""
+    got = list(parse_yaml_stream_as(A, source, on_error="skip"))
+    assert got == [A(a="x"), A(a="y"), A(a="z")]
+
+
+def test_stream_file(tmp_path: Path):
+    """Test parsing a file lazily."""
+    fn = tmp_path / "docs.yaml"
+    fn.write_text(raw_docs)
+    it = parse_yaml_stream_as(A, fn, on_error="skip")
+    assert next(it) == A(a="x")
+    assert list(it) == [A(a="y"), A(a="z")]
+
+
+def test_stream_errors():
+    """Test raising, skipping and collecting errors."""
+    it = parse_yaml_stream_as(A, raw_docs)
+    assert next(it) == A(a="x")
+    assert next(it) == A(a="y")
+    with pytest.raises(ValidationError):
+        next(it)
+
+    errors: list[DocumentError] = []
+    got = list(parse_yaml_stream_as(A, raw_docs, on_error="skip", errors=errors))
+    assert len(got) == 3
+    assert [e.document_index for e in errors] == [2]
+    assert isinstance(errors[0].error, ValidationError)
+
+    with pytest.raises(ValueError):
+        parse_yaml_stream_as(A, raw_docs, on_error="ignore")  # type: ignore
+
+
+def test_stream_is_lazy():
+    """Test that documents are parsed only as they are consumed."""
+    # The last document is invalid YAML, but we never get to it
+    src = StringIO("a: x\n---\na: y\n---\na: [unclosed\n")
+    it = parse_yaml_stream_as(A, src)
+    assert next(it) == A(a="x")
+    assert next(it) == A(a="y")
+    it.close()
+
+
+needs_libyaml = pytest.mark.skipif(not HAS_LIBYAML, reason="ruamel.yaml.clib is not installed.")
+raw_items = "- a: x\n- &y {a: y}\n- *y\n"
+
+
+@pytest.mark.parametrize("engine", ["pure", pytest.param("c", marks=needs_libyaml)])
+@pytest.mark.parametrize("make_source", [str, str.encode, StringIO])
+def test_items(make_source, engine):
+    """Test parsing items of a top-level sequence, with aliases to earlier items."""
+    got = list(parse_yaml_items_as(A, make_source(raw_items), engine=engine))
+    assert got == parse_yaml_raw_as(list[A], raw_items) == [A(a="x"), A(a="y"), A(a="y")]
+
+
+def test_items_file(tmp_path: Path):
+    """Test parsing items of a file lazily."""
+    fn = tmp_path / "items.yaml"
+    fn.write_text(raw_items + "- a: [unclosed\n")
+    it = parse_yaml_items_as(A, fn)
+    assert next(it) == A(a="x")
+    it.close()  # type: ignore[attr-defined]
+
+
+@pytest.mark.parametrize(
+    ["raw", "expected"],
+    [("", []), ("[]", []), ("--- []\n...\n", []), ("!!seq [{a: x}]", [A(a="x")])],
+)
+def test_items_edge_cases(raw: str, expected: list[A]):
+    """Test empty and explicitly tagged sequences."""
+    assert list(parse_yaml_items_as(A, raw)) == expected
+
+
+@pytest.mark.parametrize("raw", ["a: x\n", "- a: x\n---\n- a: y\n", "- a: 1\n"])
+def test_items_errors(raw: str):
+    """Test errors for documents that aren't a single sequence of valid items."""
+    with pytest.raises((ValueError, YAMLError)):
+        list(parse_yaml_items_as(A, raw))
+
+
+def test_items_memory():
+    """Test that items aren't kept in memory while iterating."""
+    n_items = 2000
+    src = BytesIO(b"".join(b"- a: item-%d\n" % i for i in range(n_items)))
+    tracemalloc.start()
+    try:
+        assert sum(1 for _ in parse_yaml_items_as(A, src)) == n_items
+        _, peak_items = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        src.seek(0)
+        assert len(parse_yaml_raw_as(list[A], src)) == n_items
+        _, peak_full = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak_items < peak_full / 10
+
+
+class _CountingStream(StringIO):
+    """Stream that counts flushes."""
+
+    n_flushes = 0
+
+    def flush(self):
+        """Flush, counting calls."""
+        self.n_flushes += 1
+        super().flush()
+
+
+def test_write_stream_roundtrip(tmp_path: Path):
+    """Test writing models from a generator and reading them back."""
+    fn = tmp_path / "out.yaml"
+    to_yaml_stream(fn, (A(a=str(i)) for i in range(5)))
+    assert fn.read_text().count("---") == 4
+    assert list(parse_yaml_stream_as(A, fn)) == [A(a=str(i)) for i in range(5)]
+
+
+def test_write_stream_flushes():
+    """Test that output is flushed after each document."""
+    stream = _CountingStream()
+    to_yaml_stream(stream, [A(a="x"), A(a="y"), A(a="z")])
+    assert stream.getvalue() == "a: x\n---\na: y\n---\na: z\n"
+    assert stream.n_flushes >= 3
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        dict(),
+        dict(indent=4),
+        dict(default_flow_style=True),
+        dict(add_comments=True),
+        dict(exclude={"opts"}),
+    ],
+)
+def test_write_stream_options(kwargs: dict):
+    """Test that formatting options are the same as for single documents."""
+    mdl = HasEnums(opts=MyStrEnum.option1, vals=[MyIntEnum.v1, MyIntEnum.v2])
+    stream = StringIO()
+    to_yaml_stream(stream, [mdl, mdl], **kwargs)
+    single = to_yaml_str(mdl, **kwargs)
+    assert stream.getvalue().startswith(single)
+    assert stream.getvalue().count(single.strip()) == 2
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "utf-16"])
+def test_write_stream_encoding(tmp_path: Path, encoding: str):
+    """Test that streams are written with the given encoding, to files and binary streams."""
+    models = [A(a="naïve"), A(a="日本")]
+    fn = tmp_path / "out.yaml"
+    to_yaml_stream(fn, models, encoding=encoding)
+    expected = "a: naïve\n---\na: 日本\n"
+    assert fn.read_bytes() == expected.encode(encoding)
+    stream = BytesIO()
+    to_yaml_stream(stream, models, encoding=encoding)
+    assert stream.getvalue() == expected.encode(encoding)
+    assert list(parse_yaml_stream_as(A, fn)) == models
+
+
+def test_write_stream_json_and_anchors():
+    """Test writing documents as JSON, or with anchors (which don't span documents)."""
+    stream = StringIO()
+    to_yaml_stream(stream, [A(a="x"), A(a="y")], emit_json=True)
+    assert stream.getvalue() == '{"a":"x"}\n---\n{"a":"y"}\n'
+    assert list(parse_yaml_stream_as(A, stream.getvalue())) == [A(a="x"), A(a="y")]
+
+    docs = [{"x": [1, 2, 3], "y": [1, 2, 3]}, {"z": [1, 2, 3]}]
+    stream = StringIO()
+    to_yaml_stream(stream, docs, model_type=dict[str, list[int]], use_anchors=True)
+    assert stream.getvalue() == "x: &id001\n- 1\n- 2\n- 3\ny: *id001\n---\nz:\n- 1\n- 2\n- 3\n"
+    assert list(parse_yaml_stream_as(dict[str, list[int]], stream.getvalue())) == docs
+    with pytest.raises(ValueError):
+        to_yaml_stream(StringIO(), [A(a="x")], emit_json=True, add_comments=True)
+    with pytest.raises(ValueError):
+        to_yaml_stream(StringIO(), [A(a="x")], use_anchors=True, add_comments=True)
+
+
+def test_write_stream_bad_input():
+    """Test that non-models are rejected."""
+    with pytest.raises(TypeError):
+        to_yaml_stream(StringIO(), [A(a="x"), {"a": "y"}])  # type: ignore
+    with pytest.raises(TypeError):
+        to_yaml_stream(StringIO(), [A(a="x"), {"a": "y"}], emit_json=True)  # type: ignore